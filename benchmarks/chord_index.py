@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark ChordIndex bulk builds, saving, loading and nearest-neighbour queries.
+
+The corpus is random, reproducible chords of 3 to 7 pitches drawn from an
+11-limit scale of overtones and undertones, in random octaves, each distinct
+under transposition and octave equivalence. Query latency is the mean of
+nearest(chord, n=10) over QUERIES random chords, printed against the
+TARGET_MS the index is meant to reach. Recall is the share of its results
+scoring at least as high as the tenth best chord found by scoring every chord
+in the index, which is also timed.
+
+Run from the project root:
+    python3 benchmarks/chord_index.py
+    python3 benchmarks/chord_index.py --sizes 100000 1000000
+"""
+from __future__ import annotations
+import argparse
+import fractions
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jitools import ChordIndex
+from jitools.chord_index import _features, fingerprint
+
+QUERIES = 100
+TARGET_MS = 1.0
+SCALE = sorted({fractions.Fraction(h, 16) for h in range(16, 48)} | {fractions.Fraction(32, h) for h in range(17, 32)})
+
+
+def random_chords(count: int, seed: int) -> list[list[fractions.Fraction]]:
+    rng = random.Random(seed)
+    chords, fingerprints = [], set()
+    while len(chords) < count:
+        chord = [x * 2 ** rng.randint(0, 1) for x in rng.sample(SCALE, rng.randint(3, 7))]
+        key = fingerprint(chord)
+        if key not in fingerprints:
+            fingerprints.add(key)
+            chords.append(chord)
+    return chords
+
+
+def exhaustive(index: ChordIndex, chord: list[fractions.Fraction], n: int = 10) -> list[float]:
+    """Return the n best similarities to chord, scoring every chord in the index."""
+    vector = _features(fingerprint(chord), index.weights)
+    query = {index._token_ids[t]: w for t, w in vector.items() if t in index._token_ids}
+    return sorted((index._score(query, c) for c in range(len(index))), reverse = True)[:n]
+
+
+def run(size: int, workers: int) -> None:
+    chords = random_chords(size, seed = 0)
+    start = time.perf_counter()
+    index = ChordIndex(chords, workers = workers)
+    build = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "chords.idx")
+        start = time.perf_counter()
+        index.save(path)
+        save = time.perf_counter() - start
+        start = time.perf_counter()
+        ChordIndex.load(path)
+        load = time.perf_counter() - start
+    print(f"{size:>8} chords: build {build:7.2f} s, save {save:5.2f} s, load {load:5.2f} s")
+    queries = random_chords(QUERIES, seed = 1)
+    start = time.perf_counter()
+    results = [index.nearest(q) for q in queries]
+    latency = (time.perf_counter() - start) / QUERIES * 1000
+    start = time.perf_counter()
+    expected = [exhaustive(index, q) for q in queries]
+    exhaustive_latency = (time.perf_counter() - start) / QUERIES * 1000
+    found = sum(m.similarity >= e[-1] - 1e-9 for r, e in zip(results, expected) for m in r)
+    print(f"    nearest   : {latency:7.3f} ms per query ({'meets' if latency <= TARGET_MS else 'misses'} "
+          f"the {TARGET_MS:g} ms target), recall {found / (10 * QUERIES):.2f}")
+    print(f"    exhaustive: {exhaustive_latency:7.3f} ms per query")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ChordIndex builds and similarity queries.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.workers)
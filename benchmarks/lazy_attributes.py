@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark cheap queries on large PitchCollections against full eager analysis.
+
+"lazy" constructs a collection and reads only ratios and hd_sum, so the
+interval index, resultant tones, least common partial and harmonic
+intersection are never computed. "eager" constructs the same collection and
+reads every attribute the constructor used to compute up front. The shape
+cache is disabled so every run analyzes its collection from scratch.
+
+Run from the project root:
+    python3 benchmarks/lazy_attributes.py
+    python3 benchmarks/lazy_attributes.py --sizes 100 500 1000
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jitools import PitchCollection, set_shape_cache_size
+from resultant_tones import random_collection
+
+EAGER_ATTRIBUTES = (
+    "intervals", "tuneable_pitch_pairs", "difference_tones", "tuneable_difference_tone_pitch_pairs",
+    "summation_tones", "tuneable_summation_tone_pitch_pairs", "pc_plus_resultant_tones_as_harmonics",
+    "inversion_harmonics", "periodicity_pitch", "least_common_partial", "least_common_partial_freq",
+    "harmonic_intersection",
+)
+
+
+def run(size: int) -> None:
+    pc = random_collection(size)
+    start = time.perf_counter()
+    collection = PitchCollection(pc)
+    collection.ratios, collection.hd_sum
+    lazy = time.perf_counter() - start
+    start = time.perf_counter()
+    collection = PitchCollection(pc)
+    for name in EAGER_ATTRIBUTES:
+        getattr(collection, name)
+    eager = time.perf_counter() - start
+    print(f"{size:>6} pitches: lazy {lazy:7.3f}s, eager {eager:7.3f}s ({eager / lazy:5.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark lazy PitchCollection attributes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 250, 500])
+    args = parser.parse_args()
+    set_shape_cache_size(0)
+    PitchCollection([(1, 1), (3, 2)])  # warm up the pitch and prime caches
+    for size in args.sizes:
+        run(size)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark harmonics, least common partial and common unit computed in monzo
+space against the big-integer lcm/gcd they replace.
+
+Each collection is a random, reproducible set of distinct pitches, each the
+product of four primes up to 97 raised to exponents in ±MAX_EXPONENT, so the
+harmonics run to hundreds of digits. The "integer" column times the previous
+approach: reduce(math.lcm) over the denominators, Fraction multiplication,
+math.lcm over the harmonics and reduce(math.gcd) over them. The "monzo" column
+times the PitchCollection methods, which take element-wise minima and maxima
+of the monzos and convert to an integer once.
+
+Run from the project root:
+    python3 benchmarks/monzo_lcm.py
+    python3 benchmarks/monzo_lcm.py --sizes 100 1000 --max-exponent 6
+"""
+from __future__ import annotations
+import argparse
+import fractions
+import math
+import os
+import random
+import sys
+import time
+from functools import reduce
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jitools import PitchCollection
+from jitools.utilities_music import monzo_primes, multiples_of_common_unit
+
+NUM_PRIMES = 25
+PRIMES_PER_PITCH = 4
+REPEATS = 5
+
+
+def wide_prime_collection(size: int, max_exponent: int, seed: int = 0) -> list[fractions.Fraction]:
+    rng = random.Random(seed)
+    primes = monzo_primes(NUM_PRIMES)
+    ratios = set()
+    while len(ratios) < size:
+        ratio = fractions.Fraction(1)
+        for p in rng.sample(primes, PRIMES_PER_PITCH):
+            ratio *= fractions.Fraction(p) ** rng.randint(-max_exponent, max_exponent)
+        ratios.add(ratio)
+    return sorted(ratios)
+
+
+def integer_analysis(ratios: list[fractions.Fraction]) -> tuple:
+    denominator = reduce(math.lcm, (x.denominator for x in ratios))
+    harmonics = [int(x * denominator) for x in ratios]
+    return harmonics, math.lcm(*harmonics), reduce(math.gcd, harmonics)
+
+
+def monzo_analysis(collection: PitchCollection) -> tuple:
+    ratios, monzos = collection._columns[1], collection._columns[2]
+    return (collection._harmonics_of_pitches(ratios, monzos),
+            collection._least_common_partial(),
+            multiples_of_common_unit(ratios, monzos))
+
+
+def best_time(function, *args) -> float:
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(size: int, max_exponent: int) -> None:
+    collection = PitchCollection(wide_prime_collection(size, max_exponent))
+    harmonics, least_common_partial, _ = integer_analysis(collection.ratios)
+    assert (harmonics, least_common_partial) == monzo_analysis(collection)[:2]
+    integer = best_time(integer_analysis, collection.ratios)
+    monzo = best_time(monzo_analysis, collection)
+    print(f"{size:>6} pitches ({len(str(least_common_partial)):,}-digit least common partial): "
+          f"integer {integer * 1000:8.2f} ms, monzo {monzo * 1000:8.2f} ms ({integer / monzo:5.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark monzo-space lcm and gcd.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--max-exponent", type=int, default=12)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.max_exponent)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark PitchCollection.interval_matrix() and hd_matrix() against building a
+Pitch for every ordered pair of pitches.
+
+Each collection is a random, reproducible set of distinct 7-limit pitches. The
+"pitch" column times the per-pair approach: one Pitch(p = interval) per entry,
+reading its monzo, cents and harmonic distance. It is only run for sizes up to
+BASELINE_MAX_SIZE, since it grows with the square of the size.
+
+Run from the project root:
+    python3 benchmarks/pairwise_matrices.py
+    python3 benchmarks/pairwise_matrices.py --sizes 100 1000 3000
+"""
+from __future__ import annotations
+import argparse
+import fractions
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jitools import Pitch, PitchCollection
+
+BASELINE_MAX_SIZE = 300
+
+
+def random_7_limit_collection(size: int, seed: int = 0) -> list[fractions.Fraction]:
+    rng = random.Random(seed)
+    ratios = set()
+    while len(ratios) < size:
+        ratios.add(fractions.Fraction(2) ** rng.randint(-6, 6) * fractions.Fraction(3) ** rng.randint(-6, 6)
+                   * fractions.Fraction(5) ** rng.randint(-3, 3) * fractions.Fraction(7) ** rng.randint(-2, 2))
+    return sorted(ratios)
+
+
+def pitch_matrices(ratios: list[fractions.Fraction]) -> None:
+    for a in ratios:
+        for b in ratios:
+            interval = Pitch(p = b / a)
+            interval.monzo, interval.distance_in_cents_from_reference, interval.harmonic_distance
+
+
+def run(size: int) -> None:
+    collection = PitchCollection(random_7_limit_collection(size))
+    start = time.perf_counter()
+    collection.interval_matrix()
+    intervals = time.perf_counter() - start
+    start = time.perf_counter()
+    collection.hd_matrix()
+    hd = time.perf_counter() - start
+    line = f"{size:>6} pitches: interval_matrix {intervals:7.3f} s, hd_matrix {hd:7.3f} s"
+    if size <= BASELINE_MAX_SIZE:
+        start = time.perf_counter()
+        pitch_matrices(collection.ratios)
+        baseline = time.perf_counter() - start
+        line += f", pitch {baseline:7.3f} s ({baseline / (intervals + hd):6.1f}x)"
+    print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pairwise interval and harmonic distance matrices.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000, 2000])
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size)
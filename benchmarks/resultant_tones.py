@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark PitchCollection interval and resultant-tone analysis on large collections.
+
+Each collection is a random, reproducible set of distinct ratios drawn from the
+first harmonics over a handful of 3-, 5- and 7-limit denominators. The timings
+cover construction and reading the interval, difference tone and summation tone
+attributes; the non-tuneable pitch pair lists, which pair every pitch with every
+non-tuneable tone, are not read.
+
+Run from the project root:
+    python3 benchmarks/resultant_tones.py
+    python3 benchmarks/resultant_tones.py --sizes 100 500 1000
+"""
+from __future__ import annotations
+import argparse
+import fractions
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jitools import PitchCollection
+
+DENOMINATORS = [1, 2, 3, 4, 5, 7, 8, 9, 16, 32, 64]
+MAX_HARMONIC = 128
+
+
+def random_collection(size: int, seed: int = 0) -> list[fractions.Fraction]:
+    rng = random.Random(seed)
+    ratios = set()
+    while len(ratios) < size:
+        ratios.add(fractions.Fraction(rng.randint(1, MAX_HARMONIC), rng.choice(DENOMINATORS)))
+    return sorted(ratios)
+
+
+def run(size: int) -> None:
+    pc = random_collection(size)
+    start = time.perf_counter()
+    collection = PitchCollection(pc)
+    constructed = time.perf_counter()
+    collection.intervals
+    collection.tuneable_pitch_pairs
+    collection.tuneable_difference_tone_pitch_pairs
+    collection.non_tuneable_difference_tones
+    collection.tuneable_summation_tone_pitch_pairs
+    collection.non_tuneable_summation_tones
+    collection.pc_plus_resultant_tones
+    analyzed = time.perf_counter()
+    print(f"{size:>6} pitches: construct {constructed - start:7.3f}s, "
+          f"resultant tones {analyzed - constructed:7.3f}s, total {analyzed - start:7.3f}s "
+          f"({len(collection.difference_tones):,} difference tones, "
+          f"{len(collection.summation_tones):,} summation tones)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PitchCollection resultant-tone analysis.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 250, 500])
+    args = parser.parse_args()
+    PitchCollection([(1, 1), (3, 2)])  # warm up the pitch and prime caches
+    for size in args.sizes:
+        run(size)
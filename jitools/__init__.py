@@ -6,5 +6,14 @@ except PackageNotFoundError:
 
 from .constants import SABAT_SCHWEINITZ_TUNEABLE_INTERVALS
 from .pitch import Pitch
-from .pitch_collection import PitchCollection
-from .lookup_table_generator import generate_enharmonic_lookup_table
\ No newline at end of file
+from .pitch_collection import PitchCollection, shape_cache_info, clear_shape_cache, set_shape_cache_size
+from .lookup_table_generator import generate_enharmonic_lookup_table, merge_lookup_tables
+from .batch_analysis import analyze_collections
+from .tuneable_interval_set import TuneableIntervalSet
+from .combination_tones import CombinationTone
+from .subset_search import search_subsets, SubsetResult
+from .transposition_index import TranspositionIndex
+from .chord_index import ChordIndex
+from .tuning_graph import TuningGraph
+from .tuning_routes import tuning_routes, TuningRoute
+from .tuneable_closure import tuneable_closure
@@ -0,0 +1,106 @@
+from __future__ import annotations
+import multiprocessing
+from collections import deque
+from collections.abc import Iterable, Iterator
+from functools import cache
+from .pitch_collection import PitchCollection
+from .utilities_general import chunks
+
+DEFAULT_FIELDS = ("ratios", "intervals", "tuneable_intervals", "hd_sum", "harmonic_intersection")
+DEFAULT_CHUNK_SIZE = 256
+
+
+@cache
+def available_fields() -> frozenset[str]:
+    """Return the names of the PitchCollection attributes analyze_collections() can report."""
+    probe = PitchCollection([(1, 1), (3, 2)])
+    return frozenset(name for name in dir(probe)
+                     if not name.startswith("_") and not callable(getattr(probe, name)))
+
+
+def _analyze_chunk(args: tuple) -> list[tuple]:
+    """Analyze one chunk of chords, returning a tuple of the requested field values per chord."""
+    chunk, fields, options = args
+    records = []
+    for pc in chunk:
+        collection = PitchCollection(pc = list(pc), **options)
+        records.append(tuple(getattr(collection, name) for name in fields))
+    return records
+
+
+def _map_chunks(chunks: Iterator[list], fields: tuple[str, ...], options: dict, workers: int) -> Iterator[list[tuple]]:
+    """Yield the records of each chunk in input order.
+
+    At most 2 * workers chunks are read ahead of the consumer, so memory stays
+    bounded however long the input is.
+    """
+    if workers == 1:
+        for chunk in chunks:
+            yield _analyze_chunk((chunk, fields, options))
+        return
+    with multiprocessing.Pool(processes=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(_analyze_chunk, ((chunk, fields, options),)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def analyze_collections(
+        collections: Iterable[list],
+        workers: int | None = None,
+        fields: Iterable[str] = DEFAULT_FIELDS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        rp: str = "A4",
+        rf: float = 440.0,
+        ti: list[tuple[int, int]] | None = None,
+        precision: int = 5) -> Iterator[tuple]:
+    """Analyze many pitch collections, yielding one record per collection in input order.
+
+    Parameters
+    ----------
+    collections : iterable of lists
+        The chords to analyze, each a pc list as accepted by PitchCollection.
+        Any iterable works, including a generator; it is read lazily, chunk by
+        chunk.
+    workers : int or None
+        Number of worker processes. Defaults to cpu_count - 1. Pass workers=1
+        to disable multiprocessing entirely, which is useful in Jupyter notebooks,
+        frozen/embedded environments, or anywhere subprocess spawning is unreliable.
+    fields : iterable of str
+        The PitchCollection attributes to report (default DEFAULT_FIELDS). Only
+        these are read from each collection, so lazily computed analysis that
+        is not requested, such as resultant tones, is never computed or sent
+        back from the workers. available_fields() lists the valid names.
+    chunk_size : int
+        Number of chords sent to a worker at a time (default 256).
+    rp, rf, ti, precision
+        Passed to every PitchCollection; see PitchCollection.
+
+    Returns
+    -------
+    An iterator of tuples of the requested field values, in the order given
+    by fields. Chords are only read and analyzed as the iterator is consumed.
+
+    Raises
+    ------
+    ValueError
+        If a field is not a PitchCollection attribute or workers or chunk_size
+        is less than 1. A chord that is not a valid PitchCollection raises its
+        error from the iterator when its chunk is reached.
+    """
+    fields = tuple(fields)
+    unknown = [name for name in fields if name not in available_fields()]
+    if unknown:
+        raise ValueError(f"unknown fields {unknown!r}; see available_fields()")
+    if workers is None:
+        workers = max(1, multiprocessing.cpu_count() - 1)
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    options = {"rp": rp, "rf": rf, "ti": ti, "precision": precision}
+    records = _map_chunks(chunks(collections, chunk_size), fields, options, workers)
+    return (record for chunk_records in records for record in chunk_records)
@@ -0,0 +1,367 @@
+from __future__ import annotations
+import fractions
+import heapq
+import json
+import math
+import multiprocessing
+import operator
+import os
+import sys
+from array import array
+from collections import namedtuple
+from collections.abc import Iterable
+from itertools import compress, repeat
+from .pitch import LONG_LIST_OF_PRIMES
+from .pitch_collection import PitchCollection
+from .utilities_general import chunks
+from .utilities_music import as_fraction, odd_part
+
+ChordMatch = namedtuple("ChordMatch", ["similarity", "id", "ratios"])
+ChordMatch.__doc__ = """A chord found by ChordIndex.nearest(): its similarity to the query, from 0 to 1, its id and ratios."""
+
+# Feature families and their default weights in the similarity.
+FEATURES = ("interval_classes", "harmonics", "primes", "hd_profile")
+DEFAULT_WEIGHTS = {name: 1.0 for name in FEATURES}
+DEFAULT_CHUNK_SIZE = 1024
+_FORMAT_VERSION = 1
+# Inverted index entries read before the first rescoring, and chords rescored
+# then per match asked for.
+_SEED_POSTINGS = 5000
+_RESCORED_PER_MATCH = 5
+# Similarity kept between the bound of the features nearest() skips and the
+# similarity to beat: a wider margin reads more entries but rescores fewer chords.
+_SKIP_MARGIN = 0.08
+# Slack for rounding when comparing a bound with an exact similarity.
+_ROUNDING = 1e-9
+
+
+def fingerprint(chord: PitchCollection | Iterable[tuple[int, int] | fractions.Fraction]) -> tuple[int, ...]:
+    """Return the chord's canonical form under transposition and octave equivalence.
+
+    This is the chord's pitch classes as its normalized harmonic series: the
+    smallest odd harmonic numbers, ascending, whose ratios are the chord's up
+    to octaves. A major triad in any voicing and transposition is (1, 3, 5).
+
+    Args:
+        chord: A PitchCollection, or pitches as (numerator, denominator)
+            tuples or Fractions.
+    """
+    ratios = chord.ratios if isinstance(chord, PitchCollection) else [as_fraction(x) for x in chord]
+    if not ratios:
+        raise ValueError("chord must not be empty")
+    if any(x <= 0 for x in ratios):
+        raise ValueError("chord pitches must be positive")
+    classes = {fractions.Fraction(odd_part(x.numerator), odd_part(x.denominator)) for x in ratios}
+    denominator = math.lcm(*(x.denominator for x in classes))
+    harmonics = [x.numerator * (denominator // x.denominator) for x in classes]
+    divisor = math.gcd(*harmonics)
+    return tuple(sorted(h // divisor for h in harmonics))
+
+
+def _features(harmonics: tuple[int, ...], weights: dict[str, float]) -> dict[tuple[int, ...], float]:
+    """Return the chord's feature vector as {token: weight}, with unit length.
+
+    Tokens are (0, n, d) for each interval class n/d between two harmonics,
+    counted, (1, h) for each harmonic, (2, p) for each odd prime and (3, b)
+    for each interval whose harmonic distance log2(n * d) lies in [b, b + 1),
+    counted. Each family is scaled to length sqrt(weight) before the whole
+    vector is normalized, so the dot product of two vectors weighs each
+    family's cosine similarity by its weight.
+    """
+    families = [{}, {(1, h): 1 for h in harmonics}, {}, {}]
+    intervals, hd_bins = families[0], families[3]
+    for i, b in enumerate(harmonics):
+        for a in harmonics[:i]:
+            divisor = math.gcd(a, b)
+            n, d = b // divisor, a // divisor
+            intervals[(0, n, d)] = intervals.get((0, n, d), 0) + 1
+            token = (3, int(math.log2(n) + math.log2(d)))
+            hd_bins[token] = hd_bins.get(token, 0) + 1
+    for h in harmonics:
+        for p, _ in LONG_LIST_OF_PRIMES.factors(h):
+            families[2][(2, p)] = 1
+    vector = {}
+    for name, family in zip(FEATURES, families):
+        if family and weights[name]:
+            scale = math.sqrt(weights[name] / sum(x * x for x in family.values()))
+            vector.update((token, x * scale) for token, x in family.items())
+    norm = math.sqrt(sum(x * x for x in vector.values())) or 1.0
+    return {token: x / norm for token, x in vector.items()}
+
+
+def _analyze_chunk(args: tuple) -> list[tuple[list[fractions.Fraction], tuple[int, ...], dict]]:
+    """Return the ratios, fingerprint and feature vector of each chord in a chunk."""
+    chunk, weights = args
+    records = []
+    for chord in chunk:
+        ratios = [as_fraction(x) for x in chord]
+        harmonics = fingerprint(ratios)
+        records.append((ratios, harmonics, _features(harmonics, weights)))
+    return records
+
+
+class ChordIndex():
+    """A deduplicated, searchable corpus of chords.
+
+    Chords are deduplicated by fingerprint(), so each transposition and
+    octave-equivalence class is stored once, as the first voicing added.
+    Each is described by a sparse feature vector over its interval classes,
+    normalized harmonic series, constituent primes and harmonic distance
+    profile, and the similarity of two chords is the cosine of their vectors.
+    The vectors are stored twice: row by row for exact scoring, and as an
+    inverted index from each feature to the chords having it, with the
+    largest weight of each feature and norm of each family, which bound what
+    the features nearest() leaves unread could add to a chord's similarity.
+    """
+
+    def __init__(
+            self,
+            chords: Iterable = (),
+            weights: dict[str, float] | None = None,
+            workers: int = 1) -> None:
+        """
+        Args:
+            chords: Chords to add, each a PitchCollection or a list of
+                pitches as (numerator, denominator) tuples or Fractions.
+            weights: Weight of each of FEATURES in the similarity, from
+                DEFAULT_WEIGHTS for any not given.
+            workers: Number of processes computing features for chords.
+                Defaults to 1.
+        """
+        weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        unknown = sorted(set(weights) - set(FEATURES))
+        if unknown:
+            raise ValueError(f"unknown features {unknown!r}; choose from {FEATURES}")
+        if any(x < 0 for x in weights.values()) or not any(weights.values()):
+            raise ValueError("feature weights must not be negative, and at least one must be positive")
+        self.weights: dict[str, float] = weights
+        self.chords: list[tuple[fractions.Fraction, ...]] = []
+        self._ids_by_fingerprint: dict[tuple[int, ...], int] = {}
+        self._tokens: list[tuple[int, ...]] = []
+        self._token_ids: dict[tuple[int, ...], int] = {}
+        self._postings: list[array] = []
+        self._posting_weights: list[array] = []
+        self._max_weights = array("d")
+        self._family_norms: list[float] = [0.0] * len(FEATURES)
+        self._row_offsets = array("q", [0])
+        self._row_tokens = array("i")
+        self._row_weights = array("d")
+        if chords:
+            self.add_many(chords, workers)
+
+    def __len__(self) -> int:
+        return len(self.chords)
+
+    def __contains__(self, chord) -> bool:
+        return fingerprint(chord) in self._ids_by_fingerprint
+
+    def __repr__(self) -> str:
+        return f"ChordIndex({len(self)} chords, {len(self._tokens)} features)"
+
+    def find(self, chord: PitchCollection | Iterable[tuple[int, int] | fractions.Fraction]) -> int | None:
+        """Return the id of the chord's transposition and octave-equivalence class, or None if it is absent."""
+        return self._ids_by_fingerprint.get(fingerprint(chord))
+
+    def add(self, chord: PitchCollection | Iterable[tuple[int, int] | fractions.Fraction]) -> int:
+        """Add a chord, returning its id; a chord already present keeps its id and voicing."""
+        return self.add_many([chord])[0]
+
+    def add_many(self, chords: Iterable, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[int]:
+        """Add chords in bulk, returning their ids in order.
+
+        Args:
+            chords: As for ChordIndex(). Any iterable works; it is read chunk
+                by chunk.
+            workers: Number of processes computing features. Defaults to 1.
+            chunk_size: Number of chords sent to a worker at a time.
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        args = (([x.ratios if isinstance(x, PitchCollection) else x for x in chunk], self.weights)
+                for chunk in chunks(chords, chunk_size))
+        ids = []
+        if workers == 1:
+            for chunk_args in args:
+                ids.extend(self._insert(_analyze_chunk(chunk_args)))
+            return ids
+        with multiprocessing.Pool(processes = workers) as pool:
+            for records in pool.imap(_analyze_chunk, args):
+                ids.extend(self._insert(records))
+        return ids
+
+    def _insert(self, records: list[tuple]) -> list[int]:
+        ids = []
+        for ratios, harmonics, vector in records:
+            chord_id = self._ids_by_fingerprint.get(harmonics)
+            if chord_id is None:
+                chord_id = self._ids_by_fingerprint[harmonics] = len(self.chords)
+                self.chords.append(tuple(ratios))
+                squares = [0.0] * len(FEATURES)
+                for token, weight in sorted(vector.items()):
+                    token_id = self._token_ids.get(token)
+                    if token_id is None:
+                        token_id = self._token_ids[token] = len(self._tokens)
+                        self._tokens.append(token)
+                        self._postings.append(array("i"))
+                        self._posting_weights.append(array("d"))
+                        self._max_weights.append(0.0)
+                    self._postings[token_id].append(chord_id)
+                    self._posting_weights[token_id].append(weight)
+                    self._max_weights[token_id] = max(self._max_weights[token_id], weight)
+                    self._row_tokens.append(token_id)
+                    self._row_weights.append(weight)
+                    squares[token[0]] += weight * weight
+                self._row_offsets.append(len(self._row_tokens))
+                self._family_norms = [max(norm, math.sqrt(x)) for norm, x in zip(self._family_norms, squares)]
+            ids.append(chord_id)
+        return ids
+
+    def similarity(self, a: int, b: int) -> float:
+        """Return the similarity of the chords with ids a and b."""
+        return self._score(dict(self._row(a)), b)
+
+    def _row(self, chord_id: int) -> zip:
+        start, end = self._row_offsets[chord_id], self._row_offsets[chord_id + 1]
+        return zip(self._row_tokens[start:end], self._row_weights[start:end])
+
+    def _score(self, query: dict[int, float], chord_id: int) -> float:
+        return sum(query.get(token_id, 0.0) * weight for token_id, weight in self._row(chord_id))
+
+    def _accumulate(self, partial: dict[int, float], token_id: int, weight: float) -> None:
+        """Add weight times each chord's weight for the feature token_id to the chord's partial similarity."""
+        for chord_id, x in zip(self._postings[token_id], self._posting_weights[token_id]):
+            partial[chord_id] = partial.get(chord_id, 0.0) + weight * x
+
+    def _bound(self, query: dict[int, float], token_ids: list[int]) -> float:
+        """Return the most similarity any chord in the index can gain from the query's features token_ids.
+
+        Within each family this is the lesser of the sum of each feature's
+        query weight times its largest stored weight and, by Cauchy-Schwarz,
+        the query's norm over those features times the family's largest norm.
+        """
+        sums, squares = [0.0] * len(FEATURES), [0.0] * len(FEATURES)
+        for token_id in token_ids:
+            family = self._tokens[token_id][0]
+            sums[family] += query[token_id] * self._max_weights[token_id]
+            squares[family] += query[token_id] ** 2
+        return sum(min(x, math.sqrt(y) * norm) for x, y, norm in zip(sums, squares, self._family_norms))
+
+    def nearest(
+            self,
+            chord: PitchCollection | Iterable[tuple[int, int] | fractions.Fraction],
+            n: int = 10) -> list[ChordMatch]:
+        """Return the n chords most similar to chord, most similar first and then by id.
+
+        The search is exact, and stops early in the manner of MaxScore. The
+        query's rarest features are read from the inverted index first, and
+        the chords scoring best on them rescored, giving a similarity the n
+        best must reach. The most common of the other features are then left
+        unread for as long as the most any chord could gain from them stays
+        below it, by the largest weight of each feature and norm of each
+        family, and the rest are read. Only the chords whose partial
+        similarity plus that bound can still reach the n-th best are rescored
+        from their stored rows. Chords sharing no feature with the query are
+        never returned.
+
+        Args:
+            chord: A PitchCollection, or pitches as (numerator, denominator)
+                tuples or Fractions. It need not be in the index.
+            n: Number of chords returned. Defaults to 10.
+        """
+        if n < 1:
+            raise ValueError(f"n must be at least 1, got {n}")
+        vector = _features(fingerprint(chord), self.weights)
+        query = {self._token_ids[t]: w for t, w in vector.items() if t in self._token_ids}
+        token_ids = sorted(query, key = lambda t: len(self._postings[t]))
+        partial = {}
+        seeded = read = 0
+        for token_id in token_ids:
+            if seeded and read + len(self._postings[token_id]) > _SEED_POSTINGS:
+                break
+            self._accumulate(partial, token_id, query[token_id])
+            read += len(self._postings[token_id])
+            seeded += 1
+        rescored = set(heapq.nlargest(_RESCORED_PER_MATCH * n, partial, key = partial.get))
+        # The n best so far as a min-heap of (similarity, -id), so the worst is first
+        best = heapq.nlargest(n, ((self._score(query, c), -c) for c in rescored))
+        heapq.heapify(best)
+        skipped = []
+        if len(best) == n:
+            for token_id in reversed(token_ids[seeded:]):
+                if self._bound(query, skipped + [token_id]) < best[0][0] - _SKIP_MARGIN:
+                    skipped.append(token_id)
+        for token_id in token_ids[seeded:]:
+            if token_id not in skipped:
+                self._accumulate(partial, token_id, query[token_id])
+        rest = self._bound(query, skipped)
+        floor = best[0][0] - rest - _ROUNDING if len(best) == n else -math.inf
+        for chord_id in compress(partial, map(operator.ge, partial.values(), repeat(floor))):
+            if chord_id in rescored or len(best) == n and partial[chord_id] + rest < best[0][0] - _ROUNDING:
+                continue
+            entry = (self._score(query, chord_id), -chord_id)
+            if len(best) < n:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+        return [ChordMatch(min(score, 1.0), -c, self.chords[-c]) for score, c in sorted(best, reverse = True)]
+
+    def save(self, path: str) -> None:
+        """Write the index to path atomically: a JSON header line, then its arrays as raw bytes."""
+        posting_offsets = array("q", [0])
+        for postings in self._postings:
+            posting_offsets.append(posting_offsets[-1] + len(postings))
+        arrays = {
+            "row_offsets": self._row_offsets,
+            "row_tokens": self._row_tokens,
+            "row_weights": self._row_weights,
+            "posting_offsets": posting_offsets,
+            "postings": array("i", (i for postings in self._postings for i in postings)),
+            "posting_weights": array("d", (x for weights in self._posting_weights for x in weights)),
+        }
+        header = {
+            "version": _FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "weights": self.weights,
+            "family_norms": self._family_norms,
+            "chords": [" ".join(str(x) for x in ratios) for ratios in self.chords],
+            "fingerprints": list(self._ids_by_fingerprint),
+            "tokens": self._tokens,
+            "arrays": {name: [a.typecode, len(a)] for name, a in arrays.items()},
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header, separators = (",", ":")).encode() + b"\n")
+            for a in arrays.values():
+                a.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> ChordIndex:
+        """Return the index saved at path by save()."""
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != _FORMAT_VERSION:
+                raise ValueError(f"{path!r} is not a ChordIndex file of version {_FORMAT_VERSION}")
+            arrays = {}
+            for name, (typecode, length) in header["arrays"].items():
+                arrays[name] = array(typecode)
+                arrays[name].fromfile(f, length)
+                if header["byteorder"] != sys.byteorder:
+                    arrays[name].byteswap()
+        index = cls(weights = header["weights"])
+        index.chords = [tuple(fractions.Fraction(x) for x in ratios.split()) for ratios in header["chords"]]
+        index._ids_by_fingerprint = {tuple(h): i for i, h in enumerate(header["fingerprints"])}
+        index._tokens = [tuple(t) for t in header["tokens"]]
+        index._token_ids = {t: i for i, t in enumerate(index._tokens)}
+        index._row_offsets = arrays["row_offsets"]
+        index._row_tokens = arrays["row_tokens"]
+        index._row_weights = arrays["row_weights"]
+        offsets = arrays["posting_offsets"]
+        index._postings = [arrays["postings"][offsets[i]:offsets[i + 1]] for i in range(len(index._tokens))]
+        index._posting_weights = [arrays["posting_weights"][offsets[i]:offsets[i + 1]]
+                                  for i in range(len(index._tokens))]
+        index._max_weights = array("d", map(max, index._posting_weights))
+        index._family_norms = header["family_norms"]
+        return index
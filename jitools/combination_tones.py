@@ -0,0 +1,128 @@
+from __future__ import annotations
+import math
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+CombinationTone = namedtuple("CombinationTone", ["ratio", "freq", "order", "terms", "tuneable_with"])
+CombinationTone.__doc__ = """A combination tone of a PitchCollection.
+
+ratio is the tone relative to the reference pitch and freq its frequency in
+Hz. terms is the lowest-order way found to produce it, as ((m, a), (n, b)),
+the tone m * a + n * b of sources a and b, which are pitches or, after the
+first generation, combination tones. order is the sum of the absolute
+coefficients in terms of the original pitches. tuneable_with lists the
+pitches p for which p / ratio is an allowed tuneable interval.
+"""
+
+
+def combination_tones(
+        harmonics: list[int],
+        max_order: int = 3,
+        max_coefficient: int | None = None,
+        generations: int | None = 1,
+        low: int = 1,
+        high: int | float = math.inf) -> dict[int, tuple[int, tuple]]:
+    """Return the combination tones of integer harmonics as {tone: (order, terms)}.
+
+    Every pair of sources a > b, first the harmonics themselves, yields the
+    tones m * a + n * b and |m * a - n * b| for coefficients m, n >= 1. A
+    source has order 1 if it is a harmonic, and a tone has order m * order(a)
+    + n * order(b), so a tone of order k is a sum of k original frequencies
+    with signs. Each further generation combines the tones that were found,
+    or reached at a lower order, in the previous one with every source, so
+    no pair is visited twice. Tones outside [low, high] are dropped at once
+    and never seed later generations.
+
+    Args:
+        harmonics: Distinct positive integers.
+        max_order: Largest order of a tone. Defaults to 3, e.g. 2a - b.
+        max_coefficient: Largest coefficient m or n applied to one source.
+            Defaults to None, bounded by max_order alone.
+        generations: Number of generations. None iterates until no tone is
+            found or lowered in order. Defaults to 1.
+        low, high: Range of tones kept. Defaults to every positive tone.
+
+    Returns:
+        {tone: (order, ((m, a), (n, b)))}, with n negative for a difference tone.
+    """
+    if max_order < 2:
+        raise ValueError(f"max_order must be at least 2, got {max_order}")
+    if max_coefficient is None:
+        max_coefficient = max_order - 1
+    if max_coefficient < 1:
+        raise ValueError(f"max_coefficient must be at least 1, got {max_coefficient}")
+    if generations is not None and generations < 1:
+        raise ValueError(f"generations must be at least 1 or None, got {generations}")
+    # tone: (order, m, a, n, b, kind), kind 0 for m * a + n * b, 1 for m * a - n * b, 2 for n * b - m * a.
+    tones = {}
+    orders = {h: 1 for h in harmonics}
+    frontier = set(harmonics)
+    generation = 0
+    while frontier and (generations is None or generation < generations):
+        generation += 1
+        old_by_order, frontier_by_order, known_by_order = {}, {}, {}
+        for source, order in orders.items():
+            by_order = frontier_by_order if source in frontier else old_by_order
+            by_order.setdefault(order, []).append(source)
+        for sources in (*old_by_order.values(), *frontier_by_order.values()):
+            sources.sort()
+        for tone, record in tones.items():
+            known_by_order.setdefault(record[0], []).append(tone)
+        # Orders are visited in ascending order, so the first way found to reach a
+        # tone is its lowest; higher holds the known tones a lower order may still reach.
+        higher = set(tones)
+        changed = set()
+        for order in range(2, max_order + 1):
+            higher.difference_update(known_by_order.get(order, ()))
+            for order_a, frontier_sources in frontier_by_order.items():
+                for order_b in range(1, order - order_a + 1):
+                    frontier_partners = frontier_by_order.get(order_b, [])
+                    old_partners = old_by_order.get(order_b, [])
+                    for m in range(1, min(max_coefficient, (order - order_b) // order_a) + 1):
+                        n, remainder = divmod(order - m * order_a, order_b)
+                        if remainder or not 1 <= n <= max_coefficient:
+                            continue
+                        for a in frontier_sources:
+                            ma = m * a
+                            # Pairs of two frontier sources are visited once, from the larger.
+                            for partners in (frontier_partners[:bisect_left(frontier_partners, a)], old_partners):
+                                for kind, candidates in enumerate(_candidates(ma, n, partners, low, high)):
+                                    found = set(candidates).difference(tones)
+                                    found.update(higher.intersection(candidates))
+                                    for tone in found:
+                                        tones[tone] = (order, m, a, n, candidates[tone], kind)
+                                    higher -= found
+                                    changed |= found
+        frontier = {tone for tone in changed if orders.get(tone, max_order + 1) > tones[tone][0]}
+        for tone in frontier:
+            orders[tone] = tones[tone][0]
+    terms = {0: lambda m, a, n, b: ((m, a), (n, b)),
+             1: lambda m, a, n, b: ((m, a), (-n, b)),
+             2: lambda m, a, n, b: ((n, b), (-m, a))}
+    return {tone: (order, terms[kind](m, a, n, b)) for tone, (order, m, a, n, b, kind) in tones.items()}
+
+
+def _candidates(ma: int, n: int, partners: list[int], low: int, high: int | float) -> tuple[dict[int, int], ...]:
+    """Return {tone: b} for the tones ma + n * b, ma - n * b and n * b - ma in [low, high].
+
+    partners is sorted, so the b giving tones in range are found by bisection
+    on exact integer bounds.
+    """
+    def between(lo: int | float, hi: int | float) -> list[int]:
+        lo = lo if math.isinf(lo) else -(-lo // n)
+        hi = hi if math.isinf(hi) else hi // n
+        return partners[bisect_left(partners, lo):bisect_right(partners, hi)]
+
+    return ({ma + n * b: b for b in between(low - ma, high - ma)},
+            {ma - n * b: b for b in between(ma - high, ma - low)},
+            {n * b - ma: b for b in between(low + ma, high + ma)})
+
+
+def tuneable_partners(harmonics: list[int], tuneable_keys: frozenset[tuple[int, int]]) -> dict[int, list[int]]:
+    """Return {tone: harmonics h for which h / tone is one of tuneable_keys}, a reduced (n, d) pair."""
+    partners = {}
+    for h in sorted(harmonics):
+        for n, d in tuneable_keys:
+            if h * d % n == 0:
+                partners.setdefault(h * d // n, []).append(h)
+    return partners
@@ -1,13 +1,24 @@
 from __future__ import annotations
+import ast
 import csv
+import hashlib
+import json
 import math
 import multiprocessing
 import os
 import time
+from collections.abc import Iterator
 from itertools import combinations
 
 
 HI_PRIMES = [11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+# Perfect-fifth offset of each HI_PRIMES accidental, as in Pitch._notation.
+HI_PRIME_FIFTHS = [-1, 3, 7, -3, 6, -2, 0, 2, 4, -1, 6]
+# Perfect-fifth offset of A4, the reference pitch used when building candidates.
+REFERENCE_FIFTHS = 1
+
+CHECKPOINT_CHUNK_SIZE = 16
+MANIFEST_FILENAME = "manifest.json"
 
 
 def _seven_chars(exp7: int) -> int:
@@ -15,6 +26,21 @@ def _seven_chars(exp7: int) -> int:
     return a // 2 + a % 2
 
 
+def _max_num_symbols(exp7: int, hi: list[tuple[int, int]], exp5: int, exp3: int) -> int:
+    """Return an upper bound on Pitch.num_symbols for a candidate without constructing it.
+
+    The template contributes its own accidentals, the 3/5-limit sign adds at most
+    one more, and fifths beyond a double sharp or flat add extra 3-limit signs.
+    """
+    net_3 = REFERENCE_FIFTHS + exp3 + 4 * exp5 - 2 * exp7 + sum(HI_PRIME_FIFTHS[i] * e for i, e in hi)
+    num_symbols = _seven_chars(exp7) + sum(abs(e) for _, e in hi) + 1
+    excess = abs(net_3) - 17
+    if excess > 0:
+        num_excess_signs = math.ceil(excess / 7)
+        num_symbols += num_excess_signs // 2 + num_excess_signs % 2
+    return num_symbols
+
+
 def _hi_combos(max_chars: int) -> list[list[tuple[int, int]]]:
     n = len(HI_PRIMES)
     result: list[list[tuple[int, int]]] = [[]]
@@ -57,12 +83,21 @@ def build_templates(max_chars: int) -> list[tuple[int, list[tuple[int, int]]]]:
 def _process_chunk(args: tuple) -> list[tuple[list[int], float]]:
     from jitools import Pitch
 
-    template_chunk, prime5_range, prime3_range, max_symbols = args
-    seen: dict[int, tuple[list[int], float]] = {}
+    template_chunk, prime5_range, prime3_range, max_symbols, base_bounds = args
+    seen: dict[tuple[int, ...], tuple[list[int], float]] = {}
 
     for exp7, hi in template_chunk:
         for exp5 in prime5_range:
             for exp3 in prime3_range:
+                # When extending a base table, skip candidates it already decided:
+                # those inside its exponent box that could not have been rejected
+                # for exceeding its symbol limit.
+                if base_bounds is not None:
+                    base_symbols, base_prime_3, base_prime_5 = base_bounds
+                    if abs(exp3) <= base_prime_3 and abs(exp5) <= base_prime_5 and (
+                            base_symbols >= max_symbols
+                            or _max_num_symbols(exp7, hi, exp5, exp3) <= base_symbols):
+                        continue
                 monzo = [0] * 15
                 monzo[1] = exp3
                 monzo[2] = exp5
@@ -77,20 +112,199 @@ def _process_chunk(args: tuple) -> list[tuple[list[int], float]]:
                     continue
 
                 pc = p.distance_in_cents_from_reference % 1200.0
-                key = round(pc * 1_000_000)
+                key = tuple(p.normalized_monzo)
                 if key not in seen:
                     seen[key] = (list(p.normalized_monzo), pc)
 
     return list(seen.values())
 
 
+def _process_indexed_chunk(args: tuple) -> tuple[int, list[tuple[list[int], float]]]:
+    index, chunk_args = args
+    return index, _process_chunk(chunk_args)
+
+
+def _map_chunks(
+        indexed_args: list[tuple[int, tuple]],
+        workers: int) -> Iterator[tuple[int, list[tuple[list[int], float]]]]:
+    """Yield (index, rows) for each chunk as it completes."""
+    if workers == 1:
+        for index, arg in indexed_args:
+            yield index, _process_chunk(arg)
+        return
+    with multiprocessing.Pool(processes=workers) as pool:
+        yield from pool.imap_unordered(_process_indexed_chunk, indexed_args)
+
+
+def _sha256_of_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_rows(path: str, rows: list[tuple[list[int], float]]) -> None:
+    """Write (monzo, pc) rows to path atomically, so an interrupted write never leaves a partial file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        for monzo, pc in rows:
+            writer.writerow([str(monzo), pc])
+    os.replace(tmp_path, path)
+
+
+def _read_rows(path: str) -> list[tuple[list[int], float]]:
+    with open(path, newline="") as f:
+        return [(ast.literal_eval(row[0]), float(row[1])) for row in csv.reader(f)]
+
+
+def _merge_rows(
+        row_lists: list[list[tuple[list[int], float]]],
+        duplicates: list | None = None) -> list[tuple[list[int], float]]:
+    """Deduplicate rows on their exact normalized monzo and return them in canonical order.
+
+    Every candidate is a distinct monzo, and a row's pitch class is computed
+    from its normalized monzo alone, so rows sharing a normalized monzo are
+    identical: they only arise when chunks or partial tables overlap. The
+    first is kept, and the result does not depend on the order in which they
+    arrive. Rows are sorted by pitch class, then monzo. If duplicates is
+    given, a (kept_row, dropped_row) pair is appended to it for every dropped
+    row.
+    """
+    merged: dict[tuple[int, ...], tuple[list[int], float]] = {}
+    for rows in row_lists:
+        for monzo, pc in rows:
+            key = tuple(monzo)
+            if key not in merged:
+                merged[key] = (monzo, pc)
+            elif duplicates is not None:
+                duplicates.append((merged[key], (monzo, pc)))
+    return sorted(merged.values(), key=lambda x: (x[1], x[0]))
+
+
+def find_collisions(
+        table: list[tuple[list[int], float]],
+        resolution: float = 1e-6) -> list[tuple[tuple[list[int], float], tuple[list[int], float]]]:
+    """Return pairs of distinct table entries whose pitch classes lie within resolution cents.
+
+    These are the entries that a rounded cents key (such as round(pc * 1_000_000),
+    used by earlier versions) would have collapsed into one. table must be
+    sorted by pitch class, as returned by generate_enharmonic_lookup_table().
+    Pitch classes wrap at the octave, so the last entry is also compared with
+    the first, one octave up; such a pair is reported last, as (last, first).
+    """
+    collisions = []
+    for a, b in zip(table, table[1:]):
+        if b[1] - a[1] < resolution or round(a[1] / resolution) == round(b[1] / resolution):
+            collisions.append((a, b))
+    if len(table) > 2 or (len(table) == 2 and not collisions):
+        first, last = table[0], table[-1]
+        if first[1] + 1200.0 - last[1] < resolution:
+            collisions.append((last, first))
+    return collisions
+
+
+def _write_audit(
+        path: str,
+        results: list[tuple[list[int], float]],
+        duplicates: list) -> None:
+    """Write a CSV report of near-coincident pitch classes and dropped duplicate rows.
+
+    For "duplicate" rows, the first monzo and pitch class are those of the kept
+    row and the "other" columns those of the dropped row.
+    """
+    with open(os.path.expanduser(path), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["kind", "monzo", "pitch class (cents)", "other monzo", "other pitch class (cents)"])
+        for (monzo_a, pc_a), (monzo_b, pc_b) in find_collisions(results):
+            writer.writerow(["near collision", str(monzo_a), pc_a, str(monzo_b), pc_b])
+        for (kept_monzo, kept_pc), (dropped_monzo, dropped_pc) in sorted(duplicates, key=lambda x: (x[0][1], x[0][0])):
+            writer.writerow(["duplicate", str(kept_monzo), kept_pc, str(dropped_monzo), dropped_pc])
+
+
+def shard_bounds(num_items: int, shard: tuple[int, int]) -> tuple[int, int]:
+    """Return the [start, stop) slice of num_items belonging to shard (index, count).
+
+    Shards are contiguous and cover the items in order, so concatenating
+    shards 0..count-1 reproduces the unsharded sequence.
+    """
+    index, count = shard
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"shard must be (index, count) with 0 <= index < count, got {shard!r}")
+    return num_items * index // count, num_items * (index + 1) // count
+
+
+def _write_manifest(work_dir: str, manifest: dict) -> None:
+    path = os.path.join(work_dir, MANIFEST_FILENAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _load_checkpoint(work_dir: str, parameters: dict) -> dict:
+    """Return the manifest for work_dir, creating a fresh one if none exists.
+
+    Completed chunks whose file is missing or no longer matches its recorded
+    hash are dropped from the manifest so that they are recomputed.
+    """
+    path = os.path.join(work_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return {"parameters": parameters, "chunks": {}}
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("parameters") != parameters:
+        raise ValueError(
+            f"work_dir {work_dir!r} holds a checkpoint for different generation parameters "
+            f"({manifest.get('parameters')!r}); use an empty directory or the original parameters")
+    verified = {}
+    for index, digest in manifest.get("chunks", {}).items():
+        chunk_path = os.path.join(work_dir, f"chunk_{int(index):05d}.csv")
+        if os.path.exists(chunk_path) and _sha256_of_file(chunk_path) == digest:
+            verified[index] = digest
+    manifest["chunks"] = verified
+    return manifest
+
+
+def _run_checkpointed(
+        args: list[tuple],
+        work_dir: str,
+        parameters: dict,
+        workers: int,
+        verbose: bool) -> list[list[tuple[list[int], float]]]:
+    """Process chunk args, persisting each finished chunk to work_dir and skipping verified ones."""
+    os.makedirs(work_dir, exist_ok=True)
+    manifest = _load_checkpoint(work_dir, parameters)
+    pending = [(i, arg) for i, arg in enumerate(args) if str(i) not in manifest["chunks"]]
+
+    if verbose and len(pending) < len(args):
+        print(f"  resuming: {len(args) - len(pending):,} of {len(args):,} chunks already complete")
+
+    def record(index: int, rows: list[tuple[list[int], float]]) -> None:
+        chunk_path = os.path.join(work_dir, f"chunk_{index:05d}.csv")
+        _write_rows(chunk_path, rows)
+        manifest["chunks"][str(index)] = _sha256_of_file(chunk_path)
+        _write_manifest(work_dir, manifest)
+
+    for index, rows in _map_chunks(pending, workers):
+        record(index, rows)
+
+    return [_read_rows(os.path.join(work_dir, f"chunk_{i:05d}.csv")) for i in range(len(args))]
+
+
 def generate_enharmonic_lookup_table(
         max_symbols: int = 3,
         max_prime_3: int = 70,
         max_prime_5: int = 4,
         output_path: str = "jitools_lookup_table.csv",
         workers: int | None = None,
-        verbose: bool = True) -> list[tuple[list[int], float]]:
+        verbose: bool = True,
+        work_dir: str | None = None,
+        shard: tuple[int, int] | None = None,
+        base_table: str | list | None = None,
+        base_params: dict | None = None,
+        audit_path: str | None = None) -> list[tuple[list[int], float]]:
     """Generate a table of JI intervals with valid HEJI2 notation.
 
     Parameters
@@ -110,6 +324,41 @@ def generate_enharmonic_lookup_table(
         frozen/embedded environments, or anywhere subprocess spawning is unreliable.
     verbose : bool
         Print progress to stdout (default True).
+    work_dir : str or None
+        Directory in which to checkpoint completed template chunks (default None,
+        no checkpointing). Each chunk is written there as soon as it finishes,
+        alongside a manifest recording the generation parameters and a SHA-256
+        hash of every chunk file. Calling again with the same parameters and
+        work_dir resumes an interrupted run: verified chunks are reused, missing
+        or corrupted ones are recomputed, and the resulting table is
+        byte-identical to an uninterrupted run. Raises ValueError if work_dir
+        holds a checkpoint made with different parameters.
+    shard : (int, int) or None
+        Process only shard (index, count) of the template list, with
+        0 <= index < count (default None, the whole list). Each shard is a
+        deterministic contiguous slice, so the tables written by shards
+        0..count-1, run on any number of machines, can be combined with
+        merge_lookup_tables() into the same table an unsharded run produces.
+    base_table : str, list or None
+        An existing table to extend, as either a CSV path (str) or the list
+        returned by a previous call (default None, generate from scratch).
+        Must be given together with base_params.
+    base_params : dict or None
+        The "max_symbols", "max_prime_3" and "max_prime_5" that base_table was
+        generated with. None of them may exceed the new bounds. Only the delta
+        region of the search is computed (the new prime-3/prime-5 exponent
+        shells for existing templates, the full range for templates that a
+        larger max_symbols adds, and any existing candidates that only the
+        larger symbol limit admits) and merged into base_table, giving the
+        same table as a full regeneration.
+    audit_path : str or None
+        Path to write a CSV audit report (default None, no report). It lists
+        every pair of distinct entries whose pitch classes lie within a
+        micro-cent of each other, and any duplicate rows dropped by dedupe.
+
+    Entries are deduplicated on their exact normalized monzo, which fixes the
+    whole row, and ordered by pitch class, then monzo, so the table is
+    byte-identical for any number of workers.
 
     Returns
     -------
@@ -117,46 +366,132 @@ def generate_enharmonic_lookup_table(
     """
     if workers is None:
         workers = max(1, multiprocessing.cpu_count() - 1)
+    if (base_table is None) != (base_params is None):
+        raise ValueError("base_table and base_params must be given together")
+    base_bounds = None
+    if base_params is not None:
+        base_bounds = (base_params["max_symbols"], base_params["max_prime_3"], base_params["max_prime_5"])
+        if any(old > new for old, new in zip(base_bounds, (max_symbols, max_prime_3, max_prime_5))):
+            raise ValueError(
+                f"cannot extend a table generated with {base_params!r} to smaller bounds "
+                f"(max_symbols={max_symbols}, max_prime_3={max_prime_3}, max_prime_5={max_prime_5})")
 
     prime3_range = list(range(-max_prime_3, max_prime_3 + 1))
     prime5_range = list(range(-max_prime_5, max_prime_5 + 1))
 
     templates = build_templates(max_chars=max_symbols - 1)
+    if shard is not None:
+        start, stop = shard_bounds(len(templates), shard)
+        templates = templates[start:stop]
     total = len(templates) * len(prime5_range) * len(prime3_range)
 
-    if verbose:
-        print(f"  {len(templates):,} templates, {total:,} candidates, {workers} workers")
+    # Templates the base table was built from only need their delta region
+    # searched; templates added by a larger max_symbols need a full search.
+    if base_bounds is None:
+        template_groups = [(templates, None)]
+    else:
+        base_templates = {(exp7, tuple(hi)) for exp7, hi in build_templates(max_chars=base_bounds[0] - 1)}
+        template_groups = [
+            ([t for t in templates if (t[0], tuple(t[1])) in base_templates], base_bounds),
+            ([t for t in templates if (t[0], tuple(t[1])) not in base_templates], None),
+        ]
 
-    chunk_size = max(1, math.ceil(len(templates) / workers))
-    chunks = [templates[i:i + chunk_size]
-              for i in range(0, len(templates), chunk_size)]
-    args = [(chunk, prime5_range, prime3_range, max_symbols) for chunk in chunks]
+    if verbose:
+        shard_info = "" if shard is None else f" (shard {shard[0]}/{shard[1]})"
+        base_info = "" if base_bounds is None else f", extending {len(template_groups[0][0]):,} base templates"
+        print(f"  {len(templates):,} templates, {total:,} candidates, {workers} workers{shard_info}{base_info}")
+
+    # Checkpointed runs use a fixed chunk size so that chunk boundaries, and
+    # therefore the manifest, do not depend on the number of workers.
+    if work_dir is None:
+        chunk_size = max(1, math.ceil(len(templates) / workers))
+    else:
+        chunk_size = CHECKPOINT_CHUNK_SIZE
+    args = [(group[i:i + chunk_size], prime5_range, prime3_range, max_symbols, bounds)
+            for group, bounds in template_groups
+            for i in range(0, len(group), chunk_size)]
 
     t0 = time.time()
-    if workers == 1:
-        chunk_results = [_process_chunk(arg) for arg in args]
+    if work_dir is not None:
+        parameters = {
+            "max_symbols": max_symbols,
+            "max_prime_3": max_prime_3,
+            "max_prime_5": max_prime_5,
+            "chunk_size": chunk_size,
+            "shard": None if shard is None else list(shard),
+            "base_params": None if base_bounds is None else list(base_bounds),
+            "templates_sha256": hashlib.sha256(repr(templates).encode()).hexdigest(),
+        }
+        chunk_results = _run_checkpointed(
+            args, os.path.expanduser(work_dir), parameters, workers, verbose)
     else:
-        with multiprocessing.Pool(processes=workers) as pool:
-            chunk_results = pool.map(_process_chunk, args)
+        chunk_results = [[] for _ in args]
+        for index, rows in _map_chunks(list(enumerate(args)), workers):
+            chunk_results[index] = rows
 
-    merged: dict[int, tuple[list[int], float]] = {}
-    for chunk in chunk_results:
-        for monzo, pc in chunk:
-            key = round(pc * 1_000_000)
-            if key not in merged:
-                merged[key] = (monzo, pc)
-
-    results = sorted(merged.values(), key=lambda x: x[1])
+    if base_table is not None:
+        if isinstance(base_table, str):
+            base_table = _read_rows(os.path.expanduser(base_table))
+        chunk_results = [base_table] + chunk_results
+    duplicates: list = []
+    results = _merge_rows(chunk_results, duplicates)
 
     if verbose:
         print(f"  {len(results):,} entries in {time.time() - t0:.1f}s")
 
     path_to_write = os.path.expanduser(output_path)
-    with open(path_to_write, "w", newline="") as f:
-        writer = csv.writer(f)
-        for monzo, pc in results:
-            writer.writerow([str(monzo), pc])
+    _write_rows(path_to_write, results)
+    if verbose:
+        print(f"  table written to {path_to_write}")
+    if audit_path is not None:
+        _write_audit(audit_path, results, duplicates)
+        if verbose:
+            print(f"  audit report written to {os.path.expanduser(audit_path)}")
+
+    return results
+
+
+def merge_lookup_tables(
+        partial_tables: list[str | list],
+        output_path: str = "jitools_lookup_table.csv",
+        verbose: bool = True,
+        audit_path: str | None = None) -> list[tuple[list[int], float]]:
+    """Combine partial tables from sharded runs into a single lookup table.
+
+    Parameters
+    ----------
+    partial_tables : list
+        The partial tables, in any order, each given as either a CSV path (str)
+        or the list returned by generate_enharmonic_lookup_table().
+    output_path : str
+        Path to write the merged CSV (default "jitools_lookup_table.csv" in the
+        current working directory).
+    verbose : bool
+        Print progress to stdout (default True).
+    audit_path : str or None
+        Path to write a CSV audit report of near-coincident pitch classes and
+        dropped duplicate rows (default None, no report).
+
+    Returns
+    -------
+    list of (monzo, pitch_class_height_in_cents) pairs, deduplicated and ordered
+    exactly as generate_enharmonic_lookup_table() does.
+    """
+    row_lists = [
+        _read_rows(os.path.expanduser(table)) if isinstance(table, str) else table
+        for table in partial_tables
+    ]
+    duplicates: list = []
+    results = _merge_rows(row_lists, duplicates)
+
+    path_to_write = os.path.expanduser(output_path)
+    _write_rows(path_to_write, results)
     if verbose:
+        print(f"  {len(results):,} entries merged from {len(row_lists)} partial tables")
         print(f"  table written to {path_to_write}")
+    if audit_path is not None:
+        _write_audit(audit_path, results, duplicates)
+        if verbose:
+            print(f"  audit report written to {os.path.expanduser(audit_path)}")
 
     return results
@@ -26,10 +26,7 @@ class Pitch():
             rf: Frequency of the reference pitch in Hz. Defaults to 440.0.
             precision: Decimal places used for floating-point display. Defaults to 5.
         """
-        if not isinstance(rf, (int, float)) or rf <= 0:
-            raise ValueError(f"rf must be a positive number, got {rf!r}")
-        if not isinstance(precision, int) or precision < 0:
-            raise ValueError(f"precision must be a non-negative integer, got {precision!r}")
+        self._set_reference(rp, rf, precision)
         if isinstance(p, tuple):
             if len(p) != 2:
                 raise ValueError(f"p as a tuple must have exactly 2 elements, got {len(p)}: {p!r}")
@@ -50,47 +47,19 @@ class Pitch():
                 f"p must be a (numerator, denominator) tuple, a Fraction, or a monzo list of integers, "
                 f"got {type(p).__name__!r}"
             )
-        self.reference_pitch = rp
-        self.reference_freq = rf
-        self.precision = precision
         self._vector_primes = DEFAULT_MONZO_PRIMES
-        self.rk_and_fo = self._parse_reference_pitch()
-        if self.rk_and_fo is None:
-            raise ValueError(
-                f"rp {rp!r} is not a recognized pitch name. "
-                "Use a letter name and octave number, e.g. 'A4', 'C4', 'Bb3', 'F#2'."
-            )
-        self.reference_keynum = self.rk_and_fo[0]
-        self._fund_offset = self.rk_and_fo[1]
         if isinstance(p, fractions.Fraction):
             self.ratio = p
             self.monzo = self._monzo_from_ratio()
         elif isinstance(p, list):
             self.monzo = self._trim_monzo(p)
+            self._vector_primes = self._lengthen_vector_primes(self.monzo, self._vector_primes)
             self.ratio = self._ratio_from_monzo()
         elif isinstance(p, tuple):
             self.ratio = utilities_general.tuple_to_fraction(p)
             self.monzo = self._monzo_from_ratio()
-        self.constituent_primes = self._constituent_primes()
-        self.freq = self._freq()
-        self.keynum = self._keynum()
-        self.keynum_class = self.keynum % 12
-        self.distance_in_cents_from_reference = self._distance_in_cents_from_reference()
-        self.notation = self._notation()
-        self.accidental_string = self.notation[0]
-        self.letter_name = self.notation[1]
-        self.letter_name_and_octave_and_cents = self._letter_name_and_octave_and_cents()
-        self.complement = self._complement()
-        self.normalized_ratio = self._normalized_ratio(self.ratio)
-        self.normalized_monzo = self._normalized_monzo(self.monzo)
-        self.normalized_complement = self._normalized_ratio(self.complement)
-        if self.accidental_string != "undefined":
-            self.num_symbols = len(self.accidental_string)
-        else:
-            self.num_symbols = "undefined"
-        self.harmonic_distance = self._harmonic_distance(self.monzo)
-        self.normalized_harmonic_distance = self._harmonic_distance(self.normalized_monzo)
-        self.pitch_info = self._pitch_info()
+        self._analyze_ratio()
+        self._analyze_placement()
 
     def create_strings_for_print_and_txt(self, variety: str = "basic") -> list[str]:
         """Return formatted pitch information as a list of strings.
@@ -294,21 +263,35 @@ class Pitch():
                 print(x)
 
     def transpose(self, interval: tuple[int, int] | fractions.Fraction) -> None:
-        """Multiply this pitch's ratio by the given interval ratio."""
-        new_ratio = self.ratio * Pitch(p = interval).ratio
-        self.update(p = new_ratio)
+        """Multiply this pitch's ratio by the given interval ratio.
+
+        The new monzo is the sum of the two monzos, so only the interval is
+        factored rather than the transposed ratio.
+        """
+        interval_pitch = Pitch(p = interval)
+        self.monzo = utilities_music.add_monzos(self.monzo, interval_pitch.monzo)
+        self._vector_primes = self._lengthen_vector_primes(self.monzo, DEFAULT_MONZO_PRIMES)
+        self.ratio = self.ratio * interval_pitch.ratio
+        self._analyze_ratio()
+        self._analyze_placement()
 
     def update(self, p: tuple[int, int] | list[int] | fractions.Fraction | None = None, rp: str | None = None, rf: float | None = None, precision: int | None = None) -> None:
-        """Re-initialize with updated parameters, preserving any omitted values."""
-        if p is None:
-            p = self.monzo
+        """Re-initialize with updated parameters, preserving any omitted values.
+
+        When p is omitted only the reference-dependent attributes (frequency,
+        key number, notation and 12-ED2 spelling) are recomputed.
+        """
         if rp is None:
             rp = self.reference_pitch
         if rf is None:
             rf = self.reference_freq
         if precision is None:
             precision = self.precision
-        self.__init__(p = p, rp = rp, rf = rf, precision = precision)
+        if p is None:
+            self._set_reference(rp, rf, precision)
+            self._analyze_placement()
+        else:
+            self.__init__(p = p, rp = rp, rf = rf, precision = precision)
 
     def write_enharmonics_info_to_csv(
         self,
@@ -433,6 +416,32 @@ class Pitch():
             sort_by=sort_by, num_qualified_candidates=len(enharmonics_info))
         return enharmonics_info, header_strings
 
+    def _analyze_placement(self) -> None:
+        """Set the attributes that depend on the reference pitch, frequency or precision."""
+        self.freq = self._freq()
+        self.keynum = self._keynum()
+        self.keynum_class = self.keynum % 12
+        self.distance_in_cents_from_reference = self._distance_in_cents_from_reference()
+        self.notation = self._notation()
+        self.accidental_string = self.notation[0]
+        self.letter_name = self.notation[1]
+        self.letter_name_and_octave_and_cents = self._letter_name_and_octave_and_cents()
+        if self.accidental_string != "undefined":
+            self.num_symbols = len(self.accidental_string)
+        else:
+            self.num_symbols = "undefined"
+        self.pitch_info = self._pitch_info()
+
+    def _analyze_ratio(self) -> None:
+        """Set the attributes that depend only on self.ratio and self.monzo."""
+        self.constituent_primes = self._constituent_primes()
+        self.complement = self._complement()
+        self.normalized_ratio = self._normalized_ratio(self.ratio)
+        self.normalized_monzo = self._normalized_monzo(self.monzo)
+        self.normalized_complement = self._normalized_ratio(self.complement)
+        self.harmonic_distance = self._harmonic_distance(self.monzo)
+        self.normalized_harmonic_distance = self._harmonic_distance(self.normalized_monzo)
+
     def _complement(self) -> fractions.Fraction:
         """Return 2 / self.ratio (the octave complement)."""
         complement = 2 / self.ratio
@@ -774,6 +783,24 @@ class Pitch():
                 output = [keynum, fund_offset]
         return output
 
+    def _set_reference(self, rp: str, rf: float, precision: int) -> None:
+        """Validate and store the reference pitch, reference frequency and precision."""
+        if not isinstance(rf, (int, float)) or rf <= 0:
+            raise ValueError(f"rf must be a positive number, got {rf!r}")
+        if not isinstance(precision, int) or precision < 0:
+            raise ValueError(f"precision must be a non-negative integer, got {precision!r}")
+        self.reference_pitch = rp
+        self.reference_freq = rf
+        self.precision = precision
+        self.rk_and_fo = self._parse_reference_pitch()
+        if self.rk_and_fo is None:
+            raise ValueError(
+                f"rp {rp!r} is not a recognized pitch name. "
+                "Use a letter name and octave number, e.g. 'A4', 'C4', 'Bb3', 'F#2'."
+            )
+        self.reference_keynum = self.rk_and_fo[0]
+        self._fund_offset = self.rk_and_fo[1]
+
     def _trim_monzo(self, monzo: list[int]) -> list[int]:
         """Remove trailing zero exponents from monzo."""
         index_of_highest_nonzero_exponent = 0
@@ -1,11 +1,338 @@
 from __future__ import annotations
+import bisect
 import csv
 import fractions
+import gc
+import heapq
 import math
+import operator
 import os
-from functools import reduce
-from itertools import combinations, product
-from . import pitch, utilities_general, utilities_music, constants
+from array import array
+from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import cached_property, reduce
+from itertools import combinations, product, repeat
+from . import pitch, utilities_general, utilities_music, constants, combination_tones
+from .tuneable_interval_set import TuneableIntervalSet
+from .tuning_graph import TuningGraph
+
+
+class _ResultantToneIndex():
+    """One family of resultant tones (difference or summation) kept up to date pitch by pitch.
+
+    Pitches and tones are integer harmonic numbers over a common denominator
+    held by the owning collection, so combining two pitches is an integer
+    addition or subtraction and a tuneability test is a set lookup on a
+    reduced (numerator, denominator) pair. For every tone the index records
+    how many pitch pairs produce it and which pitches form a tuneable interval
+    with it, so adding or removing a pitch only touches that pitch's pairs.
+    """
+
+    def __init__(self, combine, tuneable_intervals: list[tuple[int, int]]) -> None:
+        self._combine = combine
+        self._tuneable_intervals = tuneable_intervals
+        self._tuneable_set = set(tuneable_intervals)
+        self.pair_counts: dict[int, int] = {}
+        self.tuneable_partners: dict[int, set[int]] = {}
+
+    def build(
+            self,
+            harmonics: list[int],
+            pair_counts: dict[int, int] | None = None,
+            tuneable_partners: dict[int, set[int]] | None = None) -> None:
+        """Index all pairs of pitches from scratch.
+
+        pair_counts, if given, are the already counted tones of all pairs, and
+        tuneable_partners, if given, the already found partners of those tones.
+        """
+        if pair_counts is None:
+            pair_counts = {}
+            for a, b in combinations(sorted(harmonics, reverse=True), 2):
+                tone = self._combine(a, b)
+                pair_counts[tone] = pair_counts.get(tone, 0) + 1
+        self.pair_counts = pair_counts
+        if tuneable_partners is None:
+            tuneable_partners = {}
+            for tone, h in zip(*self.partner_columns(harmonics)):
+                tuneable_partners.setdefault(tone, set()).add(h)
+        self.tuneable_partners = tuneable_partners
+
+    def add_pitch(self, x: int, others: list[int]) -> None:
+        """Index the pairs that x forms with others, the pitches already in the collection."""
+        new_tones = []
+        for p in others:
+            tone = self._combine(max(x, p), min(x, p))
+            count = self.pair_counts.get(tone, 0)
+            self.pair_counts[tone] = count + 1
+            if count == 0:
+                new_tones.append(tone)
+        self._add_partner(x)
+        # A new tone can be tuneable against any pitch, not only the ones that produced it.
+        for tone in new_tones:
+            partners = {p for p in others if self._is_tuneable(p, tone)}
+            if partners:
+                self.tuneable_partners.setdefault(tone, set()).update(partners)
+
+    def remove_pitch(self, x: int, others: list[int]) -> None:
+        """Drop the pairs that x formed with others, the pitches remaining in the collection."""
+        for p in others:
+            tone = self._combine(max(x, p), min(x, p))
+            self.pair_counts[tone] -= 1
+            if self.pair_counts[tone] == 0:
+                del self.pair_counts[tone]
+                self.tuneable_partners.pop(tone, None)
+        for tone in self._partner_tones(x):
+            partners = self.tuneable_partners.get(tone)
+            if partners is not None:
+                partners.discard(x)
+                if not partners:
+                    del self.tuneable_partners[tone]
+
+    def copy(self) -> _ResultantToneIndex:
+        """Return an independent copy, so a shared index can be updated by one collection only."""
+        other = _ResultantToneIndex(self._combine, self._tuneable_intervals)
+        other.pair_counts = dict(self.pair_counts)
+        other.tuneable_partners = {t: set(partners) for t, partners in self.tuneable_partners.items()}
+        return other
+
+    def rescale(self, numerator: int, denominator: int = 1) -> None:
+        """Multiply every harmonic number by numerator / denominator after the common denominator changed."""
+        self.pair_counts = {t * numerator // denominator: c for t, c in self.pair_counts.items()}
+        self.tuneable_partners = {
+            t * numerator // denominator: {p * numerator // denominator for p in partners}
+            for t, partners in self.tuneable_partners.items()}
+
+    def tone_splits(self) -> list[list[int]]:
+        """Return [tones, tuneable_tones, non_tuneable_tones], each in ascending order."""
+        tones = sorted(self.pair_counts)
+        tuneable_tones = [t for t in tones if t in self.tuneable_partners]
+        non_tuneable_tones = [t for t in tones if t not in self.tuneable_partners]
+        return [tones, tuneable_tones, non_tuneable_tones]
+
+    def partner_columns(self, harmonics: list[int]) -> tuple[list[int], list[int]]:
+        """Return (tones, pitches): each of harmonics paired with every indexed tone it is tuneable against."""
+        tones, pitches = [], []
+        for h in harmonics:
+            for tone in self._partner_tones(h):
+                if tone in self.pair_counts:
+                    tones.append(tone)
+                    pitches.append(h)
+        return tones, pitches
+
+    def _is_tuneable(self, p: int, tone: int) -> bool:
+        g = math.gcd(p, tone)
+        return (p // g, tone // g) in self._tuneable_set
+
+    def _partner_tones(self, x: int) -> list[int]:
+        """Return every integer tone t for which x / t is an allowed tuneable interval."""
+        return [x * d // n for n, d in self._tuneable_intervals if x * d % n == 0]
+
+    def _add_partner(self, x: int) -> None:
+        """Record x against every indexed tone t for which x / t is tuneable."""
+        for tone in self._partner_tones(x):
+            if tone in self.pair_counts:
+                self.tuneable_partners.setdefault(tone, set()).add(x)
+
+
+def _sorted_by_value(ratios) -> list[tuple[int, int]]:
+    """Sort distinct reduced (numerator, denominator) pairs by value.
+
+    Sorting on float quotients is much faster than comparing Fractions; the
+    order is then checked exactly with integer cross-multiplication, falling
+    back to an exact sort if rounding ever merged or swapped neighbours.
+    """
+    ordered = sorted(ratios, key=lambda r: r[0] / r[1])
+    if all(a[0] * b[1] < b[0] * a[1] for a, b in zip(ordered, ordered[1:])):
+        return ordered
+    return sorted(ratios, key=lambda r: fractions.Fraction(*r))
+
+
+ShapeCacheInfo = namedtuple("ShapeCacheInfo", ["hits", "misses", "maxsize", "currsize", "hit_rate"])
+
+
+class _ShapeCache():
+    """A bounded, least-recently-used store of transposition-invariant analysis.
+
+    A collection's interval index, resultant tone indexes and harmonic
+    intersection depend only on its shape: its pitches divided by their
+    greatest common divisor (a rational number), which every transposition
+    shares. Entries are keyed on those canonical harmonic numbers and the
+    allowed tuneable intervals, and hold the indexes in units of that divisor,
+    so any transposition of a cached shape reuses them unchanged.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key: tuple) -> tuple | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: tuple, entry: tuple) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last = False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> ShapeCacheInfo:
+        lookups = self.hits + self.misses
+        return ShapeCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries),
+                              self.hits / lookups if lookups else 0.0)
+
+
+# Collections with more pitches than this are analyzed without the shape cache:
+# their shapes rarely repeat and their entries would dominate its memory.
+_SHAPE_CACHE_MAX_PITCHES = 64
+_shape_cache = _ShapeCache(maxsize = 256)
+
+
+def shape_cache_info() -> ShapeCacheInfo:
+    """Return hits, misses, maxsize, currsize and hit_rate of the shared shape cache.
+
+    A PitchCollection with at most 64 pitches looks up its
+    transposition-normalized shape the first time its intervals, resultant
+    tones or harmonic intersection are read; a hit reuses the analysis of an
+    earlier collection with the same shape.
+    """
+    return _shape_cache.info()
+
+
+def clear_shape_cache() -> None:
+    """Empty the shared shape cache and reset its hit and miss counters."""
+    _shape_cache.clear()
+
+
+def set_shape_cache_size(maxsize: int) -> None:
+    """Bound the shared shape cache to maxsize shapes; 0 disables caching.
+
+    Raises:
+        ValueError: if maxsize is negative.
+    """
+    if not isinstance(maxsize, int) or maxsize < 0:
+        raise ValueError(f"maxsize must be a non-negative integer, got {maxsize!r}")
+    _shape_cache.maxsize = maxsize
+    while len(_shape_cache._entries) > maxsize:
+        _shape_cache._entries.popitem(last = False)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector, restoring its previous state on exit.
+
+    Building the interval index allocates a tuple and often a set per pitch
+    pair, none of which can form a cycle, and left running the collector
+    rescans all of them every few hundred thousand allocations: on 1346
+    pitches that doubles the time of the build.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _add_to_groups(groups: defaultdict, keys, values) -> None:
+    """Add each of values to the set in groups under its key, without a Python-level loop."""
+    deque(map(set.add, map(groups.__getitem__, keys), values), maxlen = 0)
+
+
+def _index_pairs(descending: list[int], tuneable_intervals: list[tuple[int, int]]) -> tuple[tuple, tuple, tuple]:
+    """Index the pairs (descending[i], descending[j]), i < j.
+
+    Returns (intervals, differences, summations): intervals are the
+    (numerator, denominator, upper, lower) columns of the pairs, and each
+    resultant tone family is its (tones, counts, partner_tones,
+    partner_pitches) columns, where each partner pitch forms a tuneable
+    interval with one of the tones. Each row of the pair triangle is
+    processed by mapping over it, without a Python-level loop per pair.
+    """
+    numerators, denominators, uppers, lowers = [], [], [], []
+    difference_counts, summation_counts = Counter(), Counter()
+    for i, a in enumerate(descending):
+        row = descending[i + 1:]
+        divisors = list(map(math.gcd, repeat(a, len(row)), row))
+        numerators += map(operator.floordiv, repeat(a), divisors)
+        denominators += map(operator.floordiv, row, divisors)
+        uppers += repeat(a, len(row))
+        lowers += row
+        difference_counts.update(map(operator.sub, repeat(a), row))
+        summation_counts.update(map(operator.add, repeat(a), row))
+    results = [(numerators, denominators, uppers, lowers)]
+    for combine, counts in ((operator.sub, difference_counts), (operator.add, summation_counts)):
+        index = _ResultantToneIndex(combine, tuneable_intervals)
+        index.pair_counts = counts
+        results.append((counts.keys(), counts.values(), *index.partner_columns(descending)))
+    return tuple(results)
+
+
+IntervalMatrix = namedtuple("IntervalMatrix", ["primes", "monzos", "cents"])
+
+# hd_matrix() sums the distance tables of several primes into one while their
+# exponents take at most this many distinct combinations.
+_HD_GROUP_MAX_COMBINATIONS = 64
+
+
+def _int_typecode(span: int) -> str:
+    """Return the smallest signed array typecode that holds every integer in [-span, span]."""
+    for typecode in "bhiq":
+        if span < 2 ** (8 * array(typecode).itemsize - 1):
+            return typecode
+    raise OverflowError(f"exponent differences up to {span} do not fit in 64 bits")
+
+
+def _monzo_columns(monzos: list[list[int]], primes: list[int]) -> list[list[int]]:
+    """Return, for each of primes, its exponent in each of monzos."""
+    monzo_primes = utilities_music.monzo_primes(max(len(m) for m in monzos))
+    indexes = [monzo_primes.index(p) for p in primes]
+    return [[m[i] if i < len(m) else 0 for m in monzos] for i in indexes]
+
+
+def _hd_tables(monzos: list[list[int]], primes: list[int]) -> list[tuple[list, dict]]:
+    """Return tables whose rows, summed, give the harmonic distances from each pitch to every pitch.
+
+    Each table is (keys, rows): keys[i] selects the row for pitch i, and row[j]
+    is the part of the harmonic distance between pitches i and j contributed
+    by some of the primes. A prime's distances take one row per distinct
+    exponent, and primes are merged into one table while their exponents take
+    few combinations, so each harmonic distance is a sum of a few terms.
+    """
+    columns = sorted(((len(set(column)), math.log2(p), column)
+                      for p, column in zip(primes, _monzo_columns(monzos, primes))
+                      if min(column) != max(column)), key = operator.itemgetter(0))
+    tables = []
+    keys = rows = None
+    for _, weight, column in columns:
+        prime_rows = {e: [weight * abs(x - e) for x in column] for e in set(column)}
+        if keys is not None:
+            ids = {}
+            merged_keys = [ids.setdefault(key, len(ids)) for key in zip(keys, column)]
+            if len(ids) <= _HD_GROUP_MAX_COMBINATIONS:
+                rows = {i: list(map(operator.add, rows[key], prime_rows[e])) for (key, e), i in ids.items()}
+                keys = merged_keys
+                continue
+            tables.append((keys, rows))
+        keys, rows = column, prime_rows
+    if keys is not None:
+        tables.append((keys, rows))
+    return tables
 
 
 class PitchCollection():
@@ -16,7 +343,7 @@ class PitchCollection():
         pc: list[tuple[int, int] | fractions.Fraction] = [(1, 1), (2, 1)],
         rp: str = "A4",
         rf: float = 440.0,
-        ti: list[tuple[int, int]] | None = None,
+        ti: list[tuple[int, int]] | TuneableIntervalSet | None = None,
         precision: int = 5,
         _allow_single_pitch: bool = False) -> None:
         """
@@ -24,8 +351,9 @@ class PitchCollection():
             pc: List of pitches as (numerator, denominator) tuples or Fractions.
             rp: Letter-name of the reference pitch (1/1), e.g. "A4" or "C4". Defaults to "A4".
             rf: Frequency of the reference pitch in Hz. Defaults to 440.0.
-            ti: Tuneable intervals as a list of (numerator, denominator) tuples.
-                Defaults to the Sabat-Schweinitz tuneable interval list.
+            ti: Tuneable intervals as a list of (numerator, denominator) tuples
+                or a TuneableIntervalSet. Defaults to the Sabat-Schweinitz
+                tuneable interval list.
             precision: Decimal places used for floating-point display. Defaults to 5.
         """
         if not isinstance(pc, list):
@@ -43,65 +371,404 @@ class PitchCollection():
         self.reference_pitch = rp
         self.reference_freq = rf
         self.precision = precision
+        if isinstance(ti, TuneableIntervalSet):
+            self.tuneable_interval_set = ti
+            ti = [(x.numerator, x.denominator) for x in ti.intervals]
+        else:
+            self.tuneable_interval_set = TuneableIntervalSet.shared(ti)
         self.allowed_tuneable_intervals_as_tuples = ti
-        self.allowed_tuneable_intervals = utilities_general.tuples_to_fractions(self.allowed_tuneable_intervals_as_tuples)
-        self._tuneable_set = set(self.allowed_tuneable_intervals)
-        self.info_by_pitch = self._info_by_pitch(self.pc_raw)
-        if isinstance(self.info_by_pitch, list):
-            self.sort_by(sort_by="ratios")
-            intervals_and_resultant_tones = self._intervals_and_resultant_tones()
-            self.intervals = intervals_and_resultant_tones[0]
-            self.tuneable_intervals = intervals_and_resultant_tones[1][0]
-            self.tuneable_pitch_pairs = intervals_and_resultant_tones[1][1]
-            self.non_tuneable_intervals = intervals_and_resultant_tones[1][2]
-            self.non_tuneable_pitch_pairs = intervals_and_resultant_tones[1][3]
-            self.difference_tones = intervals_and_resultant_tones[2]
-            self.tuneable_difference_tones = intervals_and_resultant_tones[3][0]
-            self.tuneable_difference_tone_pitch_pairs = intervals_and_resultant_tones[3][1]
-            self.non_tuneable_difference_tones = intervals_and_resultant_tones[3][2]
-            self.non_tuneable_difference_tone_pitch_pairs = intervals_and_resultant_tones[3][3]
-            self.summation_tones = intervals_and_resultant_tones[4]
-            self.tuneable_summation_tones = intervals_and_resultant_tones[5][0]
-            self.tuneable_summation_tone_pitch_pairs = intervals_and_resultant_tones[5][1]
-            self.non_tuneable_summation_tones = intervals_and_resultant_tones[5][2]
-            self.non_tuneable_summation_tone_pitch_pairs = intervals_and_resultant_tones[5][3]
-            self.pc_plus_resultant_tones = self._pc_plus_resultant_tones()
-            self.pc_plus_resultant_tones_as_harmonics = self._harmonics(self.pc_plus_resultant_tones)
-
-            self.inversion = self._inversion()
-            self.inversion_harmonics = self._harmonics(self.inversion)
-            self.intervals_sequential = self._intervals_sequential()
-                
-            self.avg_ratio = sum(self.ratios) / len(self.ratios)
-            self.avg_freq = sum(self.freqs) / len(self.freqs)
-            self.avg_keynum = utilities_music.cpsmidi(self.avg_freq, self.reference_freq, self.reference_keynum)
-            self.minimum_ratio = min(self.ratios)
-            self.minimum_freq = min(self.freqs)
-            self.minimum_keynum = min(self.keynums)
-            self.maximum_ratio = max(self.ratios)
-            self.maximum_freq = max(self.freqs)
-            self.maximum_keynum = max(self.keynums)
-            self.ratio_span = self.maximum_ratio / self.minimum_ratio
-            self.freq_span = self.maximum_freq - self.minimum_freq
-            self.keynum_span = self.maximum_keynum - self.minimum_keynum
-            self.cents_span = self.keynum_span * 100
-                
-            self.harmonics = self._harmonics(self.ratios)
-            self.periodicity_pitch = self._periodicity_pitch()
-            self.least_common_partial = self._least_common_partial()[0]
-            self.least_common_partial_freq = self._least_common_partial()[1]
-            self.constituent_primes = sorted(list(dict.fromkeys([p for lop in self.constituent_primes_by_pitch for p in lop])))
-            self.hd_sum = self._hd_sum()
-            self.hd_avg = self.hd_sum / len(self.pc_raw)
-            self.harmonic_intersection = self._harmonic_intersection()
-            self.harmonic_disjunction = (
-                None if self.harmonic_intersection is None
-                else 1 - self.harmonic_intersection
-            )
+        self._tuneable_keys = self.tuneable_interval_set.keys
+        self._allow_single_pitch = _allow_single_pitch
+        self.__dict__.pop("allowed_tuneable_intervals", None)
+        self._invalidate_derived_attributes()
+        # The interval index and the shape cache entry are looked up on first use.
+        self._index_unit = None
+        self._shape = None
+        self._columns = self._pitch_columns(self.pc_raw)
+        self._order = list(range(len(self.pc_raw)))
+        self.sort_by(sort_by="ratios")
+        self._update_statistics()
+
+    # Tuneable intervals as Fractions, built on first access.
+    allowed_tuneable_intervals = cached_property(lambda self: list(self.tuneable_interval_set.intervals))
+
+    # Per-pitch data is stored once, column by column, in the order pitches were
+    # added: numeric columns as array("d"), the rest as lists. Each entry is a
+    # (name, typecode) pair, in info_by_pitch order; the typecode is None for
+    # columns stored as lists.
+    _PITCH_COLUMNS = (
+        ("harmonic", None),
+        ("ratio", None),
+        ("monzo", None),
+        ("freq", "d"),
+        ("keynum", "d"),
+        ("keynum_class", "d"),
+        ("distance_from_reference", "d"),
+        ("constituent_primes", None),
+        ("notation", None),
+        ("letter_name_and_octave_and_cents", None),
+        ("normalized_ratio", None),
+        ("normalized_monzo", None),
+        ("num_symbols", None),
+        ("harmonic_distance", "d"),
+        ("normalized_harmonic_distance", "d"),
+    )
+
+    # Attributes read through the current sort order (self._order) on first
+    # access, and discarded whenever the order or the pitches change.
+    _ORDERED_ATTRIBUTES = (
+        "info_by_pitch", "ratios", "monzos", "freqs", "keynums", "keynum_classes",
+        "distances_from_reference", "constituent_primes_by_pitch", "notations",
+        "letter_names_and_octave_and_cents", "normalized_ratios", "normalized_monzos",
+        "nums_symbols", "harmonic_distances", "normalized_harmonic_distances",
+        "inversion", "inversion_harmonics", "intervals_sequential",
+    )
+
+    info_by_pitch = cached_property(
+        lambda self: [list(row) for row in zip(*(self._ordered_column(i) for i in range(len(self._columns))))])
+    ratios = cached_property(lambda self: self._ordered_column(1))
+    monzos = cached_property(lambda self: self._ordered_column(2))
+    freqs = cached_property(lambda self: self._ordered_column(3))
+    keynums = cached_property(lambda self: self._ordered_column(4))
+    keynum_classes = cached_property(lambda self: self._ordered_column(5))
+    distances_from_reference = cached_property(lambda self: self._ordered_column(6))
+    constituent_primes_by_pitch = cached_property(lambda self: self._ordered_column(7))
+    notations = cached_property(lambda self: self._ordered_column(8))
+    letter_names_and_octave_and_cents = cached_property(lambda self: self._ordered_column(9))
+    normalized_ratios = cached_property(lambda self: list(dict.fromkeys(sorted(self._columns[10]))))
+    normalized_monzos = cached_property(lambda self: self._ordered_column(11))
+    nums_symbols = cached_property(lambda self: self._ordered_column(12))
+    harmonic_distances = cached_property(lambda self: self._ordered_column(13))
+    normalized_harmonic_distances = cached_property(lambda self: self._ordered_column(14))
+    inversion = cached_property(lambda self: self._inversion())
+    inversion_harmonics = cached_property(lambda self: self._harmonics(self.inversion))
+    intervals_sequential = cached_property(lambda self: self._intervals_sequential())
+
+    # Attributes derived from the interval index or the harmonics on first
+    # access, and discarded whenever the collection changes.
+    _DERIVED_ATTRIBUTES = (
+        "harmonics", "harmonic_intersection", "harmonic_disjunction",
+        "periodicity_pitch", "least_common_partial", "least_common_partial_freq",
+        "_interval_splits", "_difference_tone_splits", "_summation_tone_splits",
+        "_pc_plus_resultant_tone_harmonics",
+        "intervals", "tuneable_intervals", "tuneable_pitch_pairs",
+        "non_tuneable_intervals", "non_tuneable_pitch_pairs",
+        "difference_tones", "tuneable_difference_tones", "tuneable_difference_tone_pitch_pairs",
+        "non_tuneable_difference_tones", "non_tuneable_difference_tone_pitch_pairs",
+        "summation_tones", "tuneable_summation_tones", "tuneable_summation_tone_pitch_pairs",
+        "non_tuneable_summation_tones", "non_tuneable_summation_tone_pitch_pairs",
+        "pc_plus_resultant_tones", "pc_plus_resultant_tones_as_harmonics",
+        "tuning_graph",
+    )
+
+    # Derived attributes that also change with the reference pitch or frequency.
+    _REFERENCE_ATTRIBUTES = ("periodicity_pitch", "least_common_partial_freq")
+
+    @cached_property
+    def harmonic_intersection(self) -> fractions.Fraction:
+        """The share of partials of the periodicity pitch that coincide with a
+        partial of at least one pitch of the collection.
+
+        This is the inclusion-exclusion sum over all subsets of harmonics of
+        (-1)^(k+1) / lcm(subset), evaluated exactly by utilities_music.uncovered_density()
+        without enumerating the subsets. It only depends on the collection's
+        shape, so it is kept in the shape cache entry.
+        """
+        entry = self._shape_entry()
+        if "harmonic_intersection" not in entry:
+            entry["harmonic_intersection"] = 1 - utilities_music.uncovered_density(entry["harmonics"], self.constituent_primes)
+        return entry["harmonic_intersection"]
+
+    harmonic_disjunction = cached_property(lambda self: 1 - self.harmonic_intersection)
+    # In ascending order, whatever the current sort order.
+    harmonics = cached_property(lambda self: sorted(self._columns[0]))
+    periodicity_pitch = cached_property(lambda self: self._periodicity_pitch())
+    least_common_partial = cached_property(lambda self: self._least_common_partial())
+    least_common_partial_freq = cached_property(lambda self: self._least_common_partial_freq())
+
+    @cached_property
+    def _interval_splits(self) -> list[list]:
+        """Return [intervals, tuneable, tuneable_pairs, non_tuneable, non_tuneable_pairs]."""
+        intervals, tuneable_intervals, tuneable_pitch_pairs = [], [], []
+        non_tuneable_intervals, non_tuneable_pitch_pairs = [], []
+        for interval, pairs, tuneable in self._interval_groups():
+            intervals.append(interval)
+            if tuneable:
+                tuneable_intervals.append(interval)
+                tuneable_pitch_pairs.append(pairs)
+            else:
+                non_tuneable_intervals.append(interval)
+                non_tuneable_pitch_pairs.append(pairs)
+        return [intervals, tuneable_intervals, tuneable_pitch_pairs,
+                non_tuneable_intervals, non_tuneable_pitch_pairs]
+
+    _difference_tone_splits = cached_property(lambda self: self._resultant_tone_splits("difference"))
+    _summation_tone_splits = cached_property(lambda self: self._resultant_tone_splits("summation"))
+
+    @cached_property
+    def _pc_plus_resultant_tone_harmonics(self) -> list[int]:
+        """Return the pitches and all resultant tones as multiples of the index unit."""
+        self._ensure_interval_index()
+        composite = set(self._pitch_by_harmonic())
+        composite.update(self._difference_tone_index.pair_counts)
+        composite.update(self._summation_tone_index.pair_counts)
+        return sorted(composite)
+
+    intervals = cached_property(lambda self: self._interval_splits[0])
+    tuneable_intervals = cached_property(lambda self: self._interval_splits[1])
+    tuneable_pitch_pairs = cached_property(lambda self: self._interval_splits[2])
+    non_tuneable_intervals = cached_property(lambda self: self._interval_splits[3])
+    non_tuneable_pitch_pairs = cached_property(lambda self: self._interval_splits[4])
+    difference_tones = cached_property(lambda self: self._difference_tone_splits[0])
+    tuneable_difference_tones = cached_property(lambda self: self._difference_tone_splits[1])
+    tuneable_difference_tone_pitch_pairs = cached_property(lambda self: self._difference_tone_splits[2])
+    non_tuneable_difference_tones = cached_property(lambda self: self._difference_tone_splits[3])
+    non_tuneable_difference_tone_pitch_pairs = cached_property(
+        lambda self: [pairs for _, pairs, _ in self._tone_groups("difference", tuneable = False)])
+    summation_tones = cached_property(lambda self: self._summation_tone_splits[0])
+    tuneable_summation_tones = cached_property(lambda self: self._summation_tone_splits[1])
+    tuneable_summation_tone_pitch_pairs = cached_property(lambda self: self._summation_tone_splits[2])
+    non_tuneable_summation_tones = cached_property(lambda self: self._summation_tone_splits[3])
+    non_tuneable_summation_tone_pitch_pairs = cached_property(
+        lambda self: [pairs for _, pairs, _ in self._tone_groups("summation", tuneable = False)])
+    pc_plus_resultant_tones = cached_property(
+        lambda self: [self._from_index_harmonic(h) for h in self._pc_plus_resultant_tone_harmonics])
+    pc_plus_resultant_tones_as_harmonics = cached_property(
+        lambda self: self._reduced_harmonics(self._pc_plus_resultant_tone_harmonics))
+
+    @cached_property
+    def tuning_graph(self) -> TuningGraph:
+        """The pitches joined wherever two form a tuneable interval; see TuningGraph.
+
+        Edges are read from the interval index, so no interval is recomputed.
+        The reference, 1/1, is added as a node when it is not a pitch.
+        """
+        self._ensure_interval_index()
+        pitch_by_harmonic = self._pitch_by_harmonic()
+        ratios = [pitch_by_harmonic[h] for h in sorted(pitch_by_harmonic)]
+        one = fractions.Fraction(1)
+        reference_is_pitch = one in pitch_by_harmonic.values()
+        if not reference_is_pitch:
+            bisect.insort(ratios, one)
+        node = {x: i for i, x in enumerate(ratios)}
+        node_by_harmonic = {h: node[x] for h, x in pitch_by_harmonic.items()}
+        edges = [(node_by_harmonic[b], node_by_harmonic[a], key)
+                 for key, pairs in self._pairs_by_interval.items() if key in self._tuneable_keys
+                 for a, b in pairs]
+        if not reference_is_pitch:
+            for x in pitch_by_harmonic.values():
+                interval = x if x > 1 else 1 / x
+                key = (interval.numerator, interval.denominator)
+                if key in self._tuneable_keys:
+                    edges.append((min(node[one], node[x]), max(node[one], node[x]), key))
+        return TuningGraph(ratios, edges, reference_is_pitch)
 
     def __repr__(self) -> str:
         return f"PitchCollection([{', '.join(str(r) for r in self.ratios)}])"
 
+    def add_pitch(self, p: tuple[int, int] | fractions.Fraction) -> None:
+        """Add one pitch and update all attributes without re-analyzing the collection.
+
+        Only the new pitch's intervals and resultant tones against the existing
+        pitches are indexed, so intervals, tuneable splits, resultant tones,
+        harmonics and statistics are updated in time linear in the collection
+        size. The result matches a fresh construction (after the same sort_by).
+
+        Args:
+            p: The pitch to add, as a (numerator, denominator) tuple or a Fraction.
+
+        Raises:
+            ValueError: if the pitch is already in the collection.
+        """
+        row = self._pitch_row(p)
+        ratio = row[0]
+        if ratio in self.ratios:
+            raise ValueError(f"{ratio} is already in the collection")
+        others = list(self.ratios)
+        self.pc_raw.append(p)
+        for column, value in zip(self._columns, [None] + row):
+            column.append(value)
+        self._order.append(len(self._order))
+        if self._index_unit is not None:
+            self._index_pitch(ratio, others)
+        self._shape = None
+        self._refresh_harmonics()
+        # Pitches that tie on the sort key keep ratio order, as in a fresh build.
+        self._order.sort(key=self._columns[1].__getitem__)
+        self.sort_by(sort_by=self._sort_key)
+        self._update_statistics()
+        self._invalidate_derived_attributes()
+
+    def remove_pitch(self, p: tuple[int, int] | fractions.Fraction) -> None:
+        """Remove one pitch and update all attributes without re-analyzing the collection.
+
+        The counterpart of add_pitch(): only the removed pitch's intervals and
+        resultant tones are un-indexed.
+
+        Args:
+            p: The pitch to remove, as a (numerator, denominator) tuple or a Fraction.
+
+        Raises:
+            ValueError: if the pitch is not in the collection, or if removing it
+                would leave fewer than 2 pitches.
+        """
+        ratio = utilities_general.tuple_to_fraction(p) if isinstance(p, tuple) else fractions.Fraction(p)
+        if ratio not in self.ratios:
+            raise ValueError(f"{ratio} is not in the collection")
+        if not self._allow_single_pitch and len(self.ratios) <= 2:
+            raise ValueError("a PitchCollection must contain at least 2 pitches")
+        row_index = self._columns[1].index(ratio)
+        for column in self._columns:
+            del column[row_index]
+        self._order = [i - (i > row_index) for i in self._order if i != row_index]
+        self.pc_raw = [x for x in self.pc_raw
+                       if (utilities_general.tuple_to_fraction(x) if isinstance(x, tuple) else x) != ratio]
+        others = [x for x in self.ratios if x != ratio]
+        if self._index_unit is not None:
+            self._unindex_pitch(ratio, others)
+        self._shape = None
+        self._refresh_harmonics()
+        # Pitches that tie on the sort key keep ratio order, as in a fresh build.
+        self._order.sort(key=self._columns[1].__getitem__)
+        self.sort_by(sort_by=self._sort_key)
+        self._update_statistics()
+        self._invalidate_derived_attributes()
+
+    def combination_tones(
+            self,
+            max_order: int = 3,
+            max_coefficient: int | None = None,
+            generations: int | None = 1,
+            floor: float | None = 20.0,
+            ceiling: float | None = 20000.0) -> list[combination_tones.CombinationTone]:
+        """Return the combination tones of the collection, such as 2f1 - f2 and 3f1 - 2f2, by ascending ratio.
+
+        The tones m * f1 + n * f2 and |m * f1 - n * f2| of every pair of
+        pitches are found on their integer harmonic numbers and deduplicated,
+        keeping the lowest order that produces each. Later generations combine
+        the tones with the pitches and with each other. With max_order=2 and a
+        single generation these are the difference and summation tones.
+
+        Args:
+            max_order: Largest sum of absolute coefficients, in terms of the
+                original pitches. Defaults to 3.
+            max_coefficient: Largest coefficient applied to one pitch or tone.
+                Defaults to None, bounded by max_order alone.
+            generations: Number of times to combine the tones found so far
+                with every pitch and tone. None repeats until nothing new is
+                found. Defaults to 1.
+            floor, ceiling: Tones below floor or above ceiling Hz are pruned
+                as they are found, and so never seed later generations.
+                None means no bound. Default to 20 Hz and 20 kHz.
+
+        Returns:
+            A list of CombinationTone(ratio, freq, order, terms, tuneable_with).
+        """
+        unit = utilities_music.common_unit(self._columns[2])
+        harmonics = utilities_music.multiples_of_common_unit(self._columns[1], self._columns[2])
+        step = unit * fractions.Fraction(self.reference_freq)
+        low = 1 if floor is None else max(1, math.ceil(fractions.Fraction(floor) / step))
+        high = math.inf if ceiling is None else math.floor(fractions.Fraction(ceiling) / step)
+        tones = combination_tones.combination_tones(
+            harmonics, max_order = max_order, max_coefficient = max_coefficient,
+            generations = generations, low = low, high = high)
+        partners = combination_tones.tuneable_partners(harmonics, self._tuneable_keys)
+        ratios = {}
+
+        def as_ratio(h: int) -> fractions.Fraction:
+            if h not in ratios:
+                ratios[h] = h * unit
+            return ratios[h]
+
+        return [combination_tones.CombinationTone(
+                    as_ratio(t),
+                    float(t * step),
+                    order,
+                    ((m, as_ratio(a)), (n, as_ratio(b))),
+                    [as_ratio(h) for h in partners.get(t, [])])
+                for t, (order, ((m, a), (n, b))) in sorted(tones.items())]
+
+    def hd_matrix(self) -> list[array]:
+        """Return the Tenney harmonic distance of the interval between every two pitches.
+
+        Entry [i][j] is the harmonic distance between pitches i and j in the
+        current sort order, the sum of |exponent| * log2(prime) over the
+        difference of their monzos. The matrix is a list of array("d") rows.
+        """
+        n = len(self.pc_raw)
+        tables = _hd_tables(self.monzos, self.constituent_primes)
+        if not tables:
+            return [array("d", bytes(8 * n)) for _ in range(n)]
+        matrix = []
+        for i in range(n):
+            parts = iter([rows[keys[i]] for keys, rows in tables])
+            row = next(parts)
+            for part in parts:
+                row = map(operator.add, row, part)
+            matrix.append(array("d", row))
+        return matrix
+
+    def interval_matrix(self) -> IntervalMatrix:
+        """Return the interval from every pitch to every other, as monzos and in cents.
+
+        Entry [i][j] of each matrix is the interval from pitch i up to pitch j
+        in the current sort order. monzos holds one matrix of exponent
+        differences per prime in primes, the collection's constituent primes,
+        as rows of the smallest signed integer array type that fits them.
+        cents is a matrix of array("d") rows.
+        """
+        primes = list(self.constituent_primes)
+        columns = _monzo_columns(self.monzos, primes)
+        monzos = []
+        for column in columns:
+            typecode = _int_typecode(max(column) - min(column))
+            rows = {e: array(typecode, [x - e for x in column]) for e in set(column)}
+            monzos.append([rows[e][:] for e in column])
+        weights = [1200 * math.log2(p) for p in primes]
+        cents = [math.fsum(w * e for w, e in zip(weights, exponents)) for exponents in zip(*columns)]
+        return IntervalMatrix(primes, monzos, [array("d", [c - ci for c in cents]) for ci in cents])
+
+    def iter_intervals(self, tuneable: bool | None = None) -> Iterator[tuple[fractions.Fraction, tuple, bool]]:
+        """Yield (interval, (upper, lower), tuneable) for every pair of pitches.
+
+        Records come by ascending interval, and by ascending pitch pair within
+        an interval, the order of intervals and tuneable_pitch_pairs /
+        non_tuneable_pitch_pairs. They are generated as they are read, without
+        building the interval index: memory grows with the number of pitches
+        and the pairs of a single interval, not with the number of pairs.
+
+        Args:
+            tuneable: If True or False, yield only the pairs whose interval is
+                or is not tuneable. Defaults to None, every pair.
+        """
+        for interval, pairs, is_tuneable in self._streamed_interval_groups(tuneable):
+            for pair in pairs:
+                yield interval, pair, is_tuneable
+
+    def iter_difference_tones(self, tuneable: bool | None = None) -> Iterator[tuple[fractions.Fraction, tuple, bool]]:
+        """Yield (tone, (pitch, tone), tuneable) for every difference tone, by ascending tone.
+
+        A tuneable tone is yielded with each pitch it forms a tuneable interval
+        with, as in tuneable_difference_tone_pitch_pairs; a non-tuneable tone
+        with every pitch, as in non_tuneable_difference_tone_pitch_pairs. The
+        tones are generated as they are read, without building the difference
+        tone index: memory grows with the number of pitches and the pairs of a
+        single tone, not with the number of distinct tones.
+
+        Args:
+            tuneable: If True or False, yield only the tuneable or non-tuneable
+                tones. Defaults to None, every tone.
+        """
+        for tone, pairs, is_tuneable in self._streamed_tone_groups(operator.sub, tuneable):
+            for pair in pairs:
+                yield tone, pair, is_tuneable
+
+    def iter_summation_tones(self, tuneable: bool | None = None) -> Iterator[tuple[fractions.Fraction, tuple, bool]]:
+        """Yield (tone, (pitch, tone), tuneable) for every summation tone; see iter_difference_tones()."""
+        for tone, pairs, is_tuneable in self._streamed_tone_groups(operator.add, tuneable):
+            for pair in pairs:
+                yield tone, pair, is_tuneable
+
     def print_info(self, variety: str = "basic") -> None:
         """Print a formatted report of collection attributes.
 
@@ -113,8 +780,11 @@ class PitchCollection():
         for x in strings_to_print:
             print(x)
 
+    # Column sorted on for each sort_by key. Harmonic numbers share a common
+    # denominator, so they order pitches exactly like their ratios but compare
+    # as plain integers.
     _SORT_BY_INDEX = {
-        "ratios": 1,
+        "ratios": 0,
         "keynum classes": 5,
         "normalized ratios": 10,
         "harmonic distances": 13,
@@ -125,25 +795,57 @@ class PitchCollection():
         """Re-sort pitches by a named parameter and update all derived attributes."""
         if sort_by not in self._SORT_BY_INDEX:
             raise ValueError("cannot sort by this parameter")
-        self.info_by_pitch.sort(key=lambda x: x[self._SORT_BY_INDEX[sort_by]])
-        self._info_by_parameter()
-        self.inversion = self._inversion()
-        self.intervals_sequential = self._intervals_sequential()
+        self._sort_key = sort_by
+        self._order.sort(key=self._columns[self._SORT_BY_INDEX[sort_by]].__getitem__)
+        for name in self._ORDERED_ATTRIBUTES:
+            self.__dict__.pop(name, None)
 
     def transpose(self, interval: tuple[int, int] | fractions.Fraction) -> None:
-        """Transpose all pitches by the given interval ratio."""
-        transposition_ratio = pitch.Pitch(p = interval).ratio
-        transposed_pitches = [x * transposition_ratio for x in self.ratios]
-        self.update(pc = transposed_pitches)
+        """Transpose all pitches by the given interval ratio.
+
+        Intervals, tuneability splits, resultant tones (up to the same
+        transposition) and the harmonic intersection do not change, so the
+        interval index is kept and only its unit is transposed. Each pitch's monzo is
+        shifted by the interval's monzo, avoiding re-factoring. As with a
+        rebuild, the pitches are re-sorted by ratio.
+        """
+        interval_pitch = pitch.Pitch(p = interval)
+        transposition_ratio = interval_pitch.ratio
+        monzos = [utilities_music.add_monzos(m, interval_pitch.monzo) for m in self.monzos]
+        columns = self._pitch_columns(monzos)
+        self.pc_raw = [x * transposition_ratio for x in self.ratios]
+        self._columns = columns
+        self._order = list(range(len(self.pc_raw)))
+        if self._index_unit is not None:
+            self._index_unit *= transposition_ratio
+        self.sort_by(sort_by = "ratios")
+        self._update_statistics()
+        self._invalidate_derived_attributes()
 
     def update(
         self,
         pc: list | None = None,
         rp: str | None = None,
         rf: float | None = None,
-        ti: list | None = None,
+        ti: list | TuneableIntervalSet | None = None,
         precision: int | None = None) -> None:
-        """Re-initialize with updated parameters, preserving any omitted values."""
+        """Re-initialize with updated parameters, preserving any omitted values.
+
+        When only rp, rf and/or precision change, the ratio-derived analysis
+        (intervals, resultant tones, harmonic intersection) is kept and only
+        the reference-dependent per-pitch data and statistics are recomputed.
+        """
+        if pc is None and ti is None:
+            columns = self._pitch_columns(self._columns[2], rp = rp, rf = rf, precision = precision)
+            self.reference_pitch = self.reference_pitch if rp is None else rp
+            self.reference_freq = self.reference_freq if rf is None else rf
+            self.precision = self.precision if precision is None else precision
+            self._columns = columns
+            self.sort_by(sort_by = "ratios")
+            self._update_statistics()
+            for name in self._REFERENCE_ATTRIBUTES:
+                self.__dict__.pop(name, None)
+            return
         if rp is None:
             rp = self.reference_pitch
         if rf is None:
@@ -151,7 +853,7 @@ class PitchCollection():
         if pc is None:
             pc = self.pc_raw
         if ti is None:
-            ti = self.allowed_tuneable_intervals_as_tuples
+            ti = self.tuneable_interval_set
         if precision is None:
             precision = self.precision
         self.__init__(
@@ -277,18 +979,10 @@ class PitchCollection():
             "constituent primes: " + str(self.constituent_primes),
             "harmonic distance sum: " + str(round(self.hd_sum, self.precision)),
             "average harmonic distance: " + str(round(self.hd_avg, self.precision)),
-            "harmonic intersection: " + (
-                "N/A (more than 24 independent harmonics)"
-                if self.harmonic_intersection is None else
-                utilities_general.convert_data_to_readable_string(self.harmonic_intersection)
-                + " (" + str(round(float(self.harmonic_intersection), self.precision)) + ")"
-            ),
-            "harmonic disjunction: " + (
-                "N/A (more than 24 independent harmonics)"
-                if self.harmonic_disjunction is None else
-                utilities_general.convert_data_to_readable_string(self.harmonic_disjunction)
-                + " (" + str(round(float(self.harmonic_disjunction), self.precision)) + ")"
-            ),
+            "harmonic intersection: " + utilities_general.convert_data_to_readable_string(self.harmonic_intersection)
+                + " (" + str(round(float(self.harmonic_intersection), self.precision)) + ")",
+            "harmonic disjunction: " + utilities_general.convert_data_to_readable_string(self.harmonic_disjunction)
+                + " (" + str(round(float(self.harmonic_disjunction), self.precision)) + ")",
             ""]
 
         if variety == "normalized" or variety == "all":
@@ -361,36 +1055,6 @@ class PitchCollection():
             output = basic_info_strings + quantitative_info_strings[1:] + analytic_info_strings[1:] + normalized_info_strings[1:] + inversion_info_strings[1:] + resultant_tones_info_strings[1:] + reference_info_strings[1:]
         return output
 
-    def _harmonic_intersection(self) -> fractions.Fraction | None:
-        """Return the harmonic intersection via inclusion-exclusion over the harmonic series.
-
-        Applies an antichain filter first: if harmonic h_j is a multiple of h_i,
-        its contribution is subsumed by h_i and it can be removed without changing
-        the result. Returns None if the effective harmonic count after filtering
-        exceeds 24, since 2^n inclusion-exclusion would be impractical.
-        """
-        harmonics = list(set(self.harmonics))
-        harmonics = [int(h / reduce(math.gcd, harmonics)) for h in harmonics]
-        # Remove any h that is a strict multiple of another h in the list
-        harmonics = [h for h in harmonics
-                     if not any(h % other == 0 and h != other for other in harmonics)]
-        if len(harmonics) > 24:
-            return None
-        num, den = 0, 1
-        for i in range(1, len(harmonics) + 1):
-            sign = 1 if i % 2 != 0 else -1
-            for c in combinations(harmonics, i):
-                l = math.lcm(*c)
-                g = math.gcd(den, l)
-                new_den = den // g * l
-                num = num * (new_den // den) + sign * (new_den // l)
-                den = new_den
-                g2 = math.gcd(abs(num), den)
-                if g2 > 1:
-                    num //= g2
-                    den //= g2
-        return fractions.Fraction(num, den)
-
     def _harmonics(self, ratios: list[fractions.Fraction]) -> list[int]:
         """Return the integer harmonic series representation of the given ratios."""
         ratio_denominators = [x.denominator for x in ratios]
@@ -398,141 +1062,381 @@ class PitchCollection():
         harmonics = [int(x * ratio_multiplier) for x in ratios]
         return harmonics
 
+    def _harmonics_of_pitches(self, ratios: list[fractions.Fraction], monzos: list[list[int]]) -> list[int]:
+        """Return the integer harmonic series representation of the given pitches.
+
+        The common denominator is built once from the element-wise maximum of
+        the pitches' negated exponents rather than by a chain of big-integer
+        lcm calls, and each harmonic is then one exact integer division.
+        """
+        denominator = utilities_music.monzo_to_integer(
+            [max(-e, 0) for e in utilities_music.monzo_bounds(monzos)[0]])
+        return [x.numerator * (denominator // x.denominator) for x in ratios]
+
     def _harmonics_to_proportional_ratio_string(self, harmonics: list[int]) -> str:
         """Return harmonics formatted as 'a:b:c:...'."""
         return ":".join(str(h) for h in harmonics)
 
     def _hd_sum(self) -> float:
-        hd_sum = sum(self.harmonic_distances)
+        hd_sum = sum(self._column_by_ratio(13))
         return hd_sum
 
-    def _info_by_parameter(self) -> list[list]:
-        """Transpose self.info_by_pitch and populate all per-parameter attribute lists."""
-        info_by_parameter = utilities_general.flop(self.info_by_pitch)
-        self.ratios = info_by_parameter[1]
-        self.monzos = info_by_parameter[2]
-        self.freqs = info_by_parameter[3]
-        self.keynums = info_by_parameter[4]
-        self.keynum_classes = info_by_parameter[5]
-        self.distances_from_reference = info_by_parameter[6]
-        self.constituent_primes_by_pitch = info_by_parameter[7]
-        self.notations = info_by_parameter[8]
-        self.letter_names_and_octave_and_cents = info_by_parameter[9]
-        self.normalized_ratios = list(dict.fromkeys(sorted(info_by_parameter[10])))
-        self.normalized_monzos = info_by_parameter[11]
-        self.nums_symbols = info_by_parameter[12]
-        self.harmonic_distances = info_by_parameter[13]
-        self.normalized_harmonic_distances = info_by_parameter[14]
-        return info_by_parameter
-
-    def _info_by_pitch(self, pc: list) -> list[list]:
-        """Return a list of attribute vectors, one per pitch."""
-        ratios = []
-        pc_processed = []
-        output = []
-        for p in pc:
-            pci = pitch.Pitch(p = p,
-                rp = self.reference_pitch,
-                rf = self.reference_freq,
-                precision = self.precision)
-            if isinstance(pci.rk_and_fo, list):
-                ratios.append(pci.ratio)
-                pc_processed.append([pci.ratio, 
-                    pci.monzo, 
-                    pci.freq, 
-                    pci.keynum, 
-                    pci.keynum_class, 
-                    pci.distance_in_cents_from_reference,
-                    pci.constituent_primes, 
-                    pci.notation, 
-                    pci.letter_name_and_octave_and_cents, 
-                    pci.normalized_ratio, 
-                    pci.normalized_monzo, 
-                    pci.num_symbols, 
-                    pci.harmonic_distance, 
-                    pci.normalized_harmonic_distance])
-                self.reference_keynum = pci.reference_keynum
+    def _shape_entry(self) -> dict:
+        """Return the shape cache entry of the collection's current pitches.
+
+        The entry holds the pitches as sorted multiples of their greatest
+        common divisor, under "harmonics", and the analysis of that shape
+        computed so far by any collection, under "index" and
+        "harmonic_intersection". Collections of more than
+        _SHAPE_CACHE_MAX_PITCHES pitches get an entry of their own.
+        """
+        if self._shape is None:
+            harmonics = sorted(utilities_music.multiples_of_common_unit(self._columns[1], self._columns[2]))
+            cacheable = len(harmonics) <= _SHAPE_CACHE_MAX_PITCHES
+            key = (tuple(harmonics), self._tuneable_keys)
+            entry = _shape_cache.get(key) if cacheable else None
+            if entry is None:
+                entry = {"harmonics": harmonics, "shared": cacheable}
+                if cacheable:
+                    _shape_cache.put(key, entry)
+            self._shape = entry
+        return self._shape
+
+    def _ensure_interval_index(self) -> None:
+        if self._index_unit is None:
+            self._build_interval_index()
+
+    def _build_interval_index(self) -> None:
+        """Index every pitch pair by interval, difference tone and summation tone.
+
+        Pitches are indexed as integer multiples of the collection's index
+        unit, the largest ratio dividing them all, and intervals are keyed by
+        reduced (numerator, denominator) pairs, so no Fraction arithmetic is
+        needed until results are read. Those multiples are the same for every
+        transposition of the collection, so the index is kept in the shape
+        cache entry. The pair triangle is indexed by _index_pairs(), tuneable
+        partners included, and each pair is then filed under its interval.
+        """
+        self._index_unit = utilities_music.common_unit(self._columns[2])
+        entry = self._shape_entry()
+        if "index" not in entry:
+            harmonics = entry["harmonics"]
+            tuneable_intervals = sorted(self._tuneable_keys)
+            descending = harmonics[::-1]
+            pairs_by_interval = defaultdict(set)
+            difference_partners, summation_partners = defaultdict(set), defaultdict(set)
+            with _gc_paused():
+                intervals, differences, summations = _index_pairs(descending, tuneable_intervals)
+                numerators, denominators, uppers, lowers = intervals
+                _add_to_groups(pairs_by_interval, zip(numerators, denominators), zip(uppers, lowers))
+                for partners, (_, _, partner_tones, partner_pitches) in (
+                        (difference_partners, differences), (summation_partners, summations)):
+                    _add_to_groups(partners, partner_tones, partner_pitches)
+            difference_counts, summation_counts = dict(zip(*differences[:2])), dict(zip(*summations[:2]))
+            difference_tone_index = _ResultantToneIndex(operator.sub, tuneable_intervals)
+            difference_tone_index.build(harmonics, difference_counts, dict(difference_partners))
+            summation_tone_index = _ResultantToneIndex(operator.add, tuneable_intervals)
+            summation_tone_index.build(harmonics, summation_counts, dict(summation_partners))
+            pairs_by_interval = dict(pairs_by_interval)
+            entry["index"] = (pairs_by_interval, difference_tone_index, summation_tone_index)
+        self._pairs_by_interval, self._difference_tone_index, self._summation_tone_index = entry["index"]
+        # Cached indexes are shared with other collections until this one changes its pitches.
+        self._index_shared = entry["shared"]
+
+    def _own_index(self) -> None:
+        """Copy a shared interval index before it is updated in place."""
+        if self._index_shared:
+            self._pairs_by_interval = {key: set(pairs) for key, pairs in self._pairs_by_interval.items()}
+            self._difference_tone_index = self._difference_tone_index.copy()
+            self._summation_tone_index = self._summation_tone_index.copy()
+            self._index_shared = False
+
+    def _index_pitch(self, x: fractions.Fraction, others: list[fractions.Fraction]) -> None:
+        self._own_index()
+        unit = fractions.Fraction(math.gcd(self._index_unit.numerator, x.numerator),
+                                  math.lcm(self._index_unit.denominator, x.denominator))
+        if unit != self._index_unit:
+            self._rescale_index(unit)
+        hx = self._index_harmonic(x)
+        others = [self._index_harmonic(p) for p in others]
+        for hp in others:
+            key, pair = self._interval_key_and_pair(hx, hp)
+            self._pairs_by_interval.setdefault(key, set()).add(pair)
+        self._difference_tone_index.add_pitch(hx, others)
+        self._summation_tone_index.add_pitch(hx, others)
+
+    def _unindex_pitch(self, x: fractions.Fraction, others: list[fractions.Fraction]) -> None:
+        self._own_index()
+        hx = self._index_harmonic(x)
+        harmonics = [self._index_harmonic(p) for p in others]
+        for hp in harmonics:
+            key, pair = self._interval_key_and_pair(hx, hp)
+            self._pairs_by_interval[key].discard(pair)
+            if not self._pairs_by_interval[key]:
+                del self._pairs_by_interval[key]
+        self._difference_tone_index.remove_pitch(hx, harmonics)
+        self._summation_tone_index.remove_pitch(hx, harmonics)
+        unit = utilities_music.common_unit(self._columns[2])
+        if unit != self._index_unit:
+            self._rescale_index(unit)
+
+    @staticmethod
+    def _interval_key_and_pair(hx: int, hp: int) -> tuple:
+        """Return the reduced interval key of two index harmonics, and their (upper, lower) pair."""
+        g = math.gcd(hx, hp)
+        return ((hx // g, hp // g), (hx, hp)) if hx > hp else ((hp // g, hx // g), (hp, hx))
+
+    def _rescale_index(self, unit: fractions.Fraction) -> None:
+        """Re-express the interval and resultant tone indexes as multiples of a new unit."""
+        factor = self._index_unit / unit
+        n, d = factor.numerator, factor.denominator
+        for index in (self._difference_tone_index, self._summation_tone_index):
+            index.rescale(n, d)
+        self._pairs_by_interval = {key: {(a * n // d, b * n // d) for a, b in pairs}
+                                   for key, pairs in self._pairs_by_interval.items()}
+        self._index_unit = unit
+
+    def _index_harmonic(self, x: fractions.Fraction) -> int:
+        """Return x as a multiple of the index unit."""
+        unit = self._index_unit
+        return (x.numerator * unit.denominator) // (x.denominator * unit.numerator)
+
+    def _from_index_harmonic(self, h: int) -> fractions.Fraction:
+        return fractions.Fraction(h * self._index_unit.numerator, self._index_unit.denominator)
+
+    def _pitch_by_harmonic(self) -> dict[int, fractions.Fraction]:
+        return {self._index_harmonic(x): x for x in self.ratios}
+
+    def _resultant_tone_splits(self, family: str) -> list[list]:
+        """Return [tones, tuneable_tones, tuneable_pairs, non_tuneable_tones] as Fractions.
+
+        Tuneable pairs are (pitch, tone) tuples in ascending pitch order.
+        """
+        tones, tuneable_tones, tuneable_pairs, non_tuneable_tones = [], [], [], []
+        for tone, pairs, tuneable in self._tone_groups(family, pairs = False):
+            tones.append(tone)
+            if tuneable:
+                tuneable_tones.append(tone)
+                tuneable_pairs.append(pairs)
             else:
-                pc_processed = pci.rk_and_fo
-        harmonics = self._harmonics(ratios)
-        for h, p in zip(harmonics, pc_processed):
-            output.append([h] + p)
-        return output
+                non_tuneable_tones.append(tone)
+        return [tones, tuneable_tones, tuneable_pairs, non_tuneable_tones]
 
-    def _intervals_and_resultant_tones(self) -> list[list]:
-        """Return intervals, tuneable/non-tuneable splits, difference tones, and summation tones."""
-        pairs = sorted(dict.fromkeys(
-            tuple(sorted(x, reverse=True)) for x in combinations(self.ratios[::-1], 2)
-        ))
-
-        # Build interval→pairs index in one O(n²) pass instead of nested O(n⁴) loops
-        pairs_by_interval = {}
-        for pp in pairs:
-            r = pp[0] / pp[1]
-            if r not in pairs_by_interval:
-                pairs_by_interval[r] = []
-            pairs_by_interval[r].append(pp)
-
-        unique_intervals = sorted(pairs_by_interval)
-        tuneable_intervals, tuneable_pitch_pairs = [], []
-        non_tuneable_intervals, non_tuneable_pitch_pairs = [], []
-        for interval in unique_intervals:
-            if self._is_tuneable(interval):
-                tuneable_intervals.append(interval)
-                tuneable_pitch_pairs.append(pairs_by_interval[interval])
+    def _interval_groups(self, tuneable: bool | None = None) -> Iterator[tuple[fractions.Fraction, list[tuple], bool]]:
+        """Yield (interval, pitch pairs, tuneable) for each distinct interval, in ascending order.
+
+        Pitch pairs are (upper, lower) tuples. With tuneable given, only the
+        intervals whose tuneability matches are yielded.
+        """
+        self._ensure_interval_index()
+        pitch_by_harmonic = self._pitch_by_harmonic()
+        for key in _sorted_by_value(self._pairs_by_interval):
+            is_tuneable = key in self._tuneable_keys
+            if tuneable is not None and is_tuneable != tuneable:
+                continue
+            pairs = [(pitch_by_harmonic[a], pitch_by_harmonic[b]) for a, b in sorted(self._pairs_by_interval[key])]
+            yield fractions.Fraction(*key), pairs, is_tuneable
+
+    def _streamed_interval_groups(
+            self,
+            tuneable: bool | None = None) -> Iterator[tuple[fractions.Fraction, list[tuple], bool]]:
+        """Yield what _interval_groups() does, generating the pairs instead of reading the interval index.
+
+        Over the pitches in ascending order, the pairs with a given lower
+        pitch come in ascending interval order, so a heap holding the next
+        pair of each lower pitch merges all of them in ascending order with
+        one entry per pitch. Heap keys are the float quotients of the pitches'
+        harmonic numbers, which are correctly rounded and so never misorder
+        two intervals; the pairs whose quotients tie are grouped by their
+        exact, reduced interval.
+        """
+        ratios = sorted(self.ratios)
+        unit = utilities_music.common_unit(self._columns[2])
+        harmonics = [(x.numerator * unit.denominator) // (x.denominator * unit.numerator) for x in ratios]
+        heap = [(harmonics[i + 1] / harmonics[i], i, i + 1) for i in range(len(harmonics) - 1)]
+        heapq.heapify(heap)
+        while heap:
+            value = heap[0][0]
+            groups = {}
+            while heap and heap[0][0] == value:
+                _, i, j = heapq.heappop(heap)
+                if j + 1 < len(harmonics):
+                    heapq.heappush(heap, (harmonics[j + 1] / harmonics[i], i, j + 1))
+                g = math.gcd(harmonics[i], harmonics[j])
+                key = (harmonics[j] // g, harmonics[i] // g)
+                is_tuneable = key in self._tuneable_keys
+                if tuneable is None or is_tuneable == tuneable:
+                    # Ties pop by ascending lower pitch, the order of pairs within an interval.
+                    groups.setdefault(key, []).append((ratios[j], ratios[i]))
+            for key in (groups if len(groups) == 1 else _sorted_by_value(groups)):
+                yield fractions.Fraction(*key), groups[key], key in self._tuneable_keys
+
+    def _streamed_tone_groups(
+            self,
+            combine,
+            tuneable: bool | None = None) -> Iterator[tuple[fractions.Fraction, list[tuple], bool]]:
+        """Yield what _tone_groups() does for combine, operator.sub or operator.add, without the tone index.
+
+        As in _streamed_interval_groups(), a heap holding the next pair of
+        each lower pitch merges the tones of all pairs in ascending order,
+        here as exact integer harmonic numbers. The pitches a tone may be
+        tuneable against are found from each pitch by the allowed tuneable
+        intervals, so that table grows with the number of pitches times the
+        number of allowed intervals.
+        """
+        ratios = sorted(self.ratios)
+        unit = utilities_music.common_unit(self._columns[2])
+        harmonics = [(x.numerator * unit.denominator) // (x.denominator * unit.numerator) for x in ratios]
+        # Every tone t for which a pitch h makes h / t tuneable, as in _ResultantToneIndex._partner_tones().
+        partners = {}
+        for i, h in enumerate(harmonics):
+            for n, d in self._tuneable_keys:
+                if h * d % n == 0:
+                    partners.setdefault(h * d // n, []).append(i)
+        heap = [(combine(harmonics[i + 1], harmonics[i]), i, i + 1) for i in range(len(harmonics) - 1)]
+        heapq.heapify(heap)
+        while heap:
+            t = heap[0][0]
+            while heap and heap[0][0] == t:
+                _, i, j = heapq.heappop(heap)
+                if j + 1 < len(harmonics):
+                    heapq.heappush(heap, (combine(harmonics[j + 1], harmonics[i]), i, j + 1))
+            is_tuneable = t in partners
+            if tuneable is not None and is_tuneable != tuneable:
+                continue
+            tone = t * unit
+            if is_tuneable:
+                yield tone, [(ratios[i], tone) for i in partners[t]], True
             else:
-                non_tuneable_intervals.append(interval)
-                non_tuneable_pitch_pairs.append(pairs_by_interval[interval])
-
-        interval_splits = [tuneable_intervals, tuneable_pitch_pairs,
-                           non_tuneable_intervals, non_tuneable_pitch_pairs]
-
-        # Difference and summation tones — build tone→pairs index in one pass
-        resultant_results = []
-        for compute_tone in (lambda a, b: a - b, lambda a, b: a + b):
-            unique_tones = sorted(dict.fromkeys(
-                compute_tone(pp[0], pp[1]) for pp in pairs
-            ))
-
-            pairs_by_tone = {t: [] for t in unique_tones}
-            tuneable_tone_set = set()
-            for pitch_ratio in self.ratios:
-                for tone in unique_tones:
-                    pairs_by_tone[tone].append((pitch_ratio, tone))
-                    if self._is_tuneable(pitch_ratio / tone):
-                        tuneable_tone_set.add(tone)
-
-            tuneable_tones = sorted(tuneable_tone_set)
-            non_tuneable_tones = sorted(t for t in unique_tones if t not in tuneable_tone_set)
-
-            tuneable_pp = [
-                [pp for pp in pairs_by_tone[t] if self._is_tuneable(pp[0] / pp[1])]
-                for t in tuneable_tones
-            ]
-            non_tuneable_pp = [
-                [pp for pp in pairs_by_tone[t] if not self._is_tuneable(pp[0] / pp[1])]
-                for t in non_tuneable_tones
-            ]
-            resultant_results.append((unique_tones, tuneable_tones, tuneable_pp,
-                                      non_tuneable_tones, non_tuneable_pp))
-
-        diffs,  t_diffs,  t_diff_pp,  nt_diffs,  nt_diff_pp  = resultant_results[0]
-        sums,   t_sums,   t_sum_pp,   nt_sums,   nt_sum_pp   = resultant_results[1]
-
-        return [
-            unique_intervals,
-            interval_splits,
-            diffs,
-            [t_diffs, t_diff_pp, nt_diffs, nt_diff_pp],
-            sums,
-            [t_sums, t_sum_pp, nt_sums, nt_sum_pp],
-        ]
+                yield tone, [(p, tone) for p in ratios], False
+
+    def _tone_groups(
+            self,
+            family: str,
+            tuneable: bool | None = None,
+            pairs: bool = True) -> Iterator[tuple[fractions.Fraction, list[tuple] | None, bool]]:
+        """Yield (tone, pitch pairs, tuneable) for each distinct "difference" or "summation" tone, in ascending order.
+
+        Pitch pairs are (pitch, tone) tuples in ascending pitch order: a
+        tuneable tone is paired with the pitches it is tuneable against, and a
+        non-tuneable tone with every pitch. With pairs False, non-tuneable
+        tones get None instead, so that list is never built.
+        """
+        self._ensure_interval_index()
+        index = self._difference_tone_index if family == "difference" else self._summation_tone_index
+        pitch_by_harmonic = self._pitch_by_harmonic()
+        pitches = sorted(self.ratios)
+        for t in sorted(index.pair_counts):
+            is_tuneable = t in index.tuneable_partners
+            if tuneable is not None and is_tuneable != tuneable:
+                continue
+            tone = self._from_index_harmonic(t)
+            if is_tuneable:
+                yield tone, [(pitch_by_harmonic[h], tone) for h in sorted(index.tuneable_partners[t])], True
+            else:
+                yield tone, [(p, tone) for p in pitches] if pairs else None, False
+
+    def _reduced_harmonics(self, harmonics: list[int]) -> list[int]:
+        """Return multiples of the index unit as harmonic numbers of their lowest common fundamental."""
+        numerator, denominator = self._index_unit.numerator, self._index_unit.denominator
+        g = reduce(math.gcd, harmonics, denominator)
+        return [h // g * numerator for h in harmonics]
+
+    def _pitch_columns(
+        self,
+        pc: list,
+        rp: str | None = None,
+        rf: float | None = None,
+        precision: int | None = None) -> list[list | array]:
+        """Return the per-pitch attribute columns for pc, in the order given.
+
+        rp, rf and precision override the collection's current values.
+        """
+        rows = [[None] + self._pitch_row(p, rp = rp, rf = rf, precision = precision) for p in pc]
+        columns = [list(values) if typecode is None else array(typecode, values)
+                   for values, (_, typecode) in zip(zip(*rows), self._PITCH_COLUMNS)]
+        columns[0] = self._harmonics_of_pitches(columns[1], columns[2])
+        return columns
+
+    def _ordered_column(self, index: int) -> list:
+        """Return one per-pitch column as a list in the current sort order."""
+        return list(map(self._columns[index].__getitem__, self._order))
+
+    def _column_by_ratio(self, index: int) -> list:
+        """Return one per-pitch column as a list in ascending ratio order, whatever the sort order."""
+        column = self._columns[index]
+        return [column[i] for i in sorted(range(len(column)), key = self._columns[0].__getitem__)]
+
+    def _invalidate_derived_attributes(self) -> None:
+        for name in self._DERIVED_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+
+    def _pitch_row(
+        self,
+        p: tuple[int, int] | list[int] | fractions.Fraction,
+        rp: str | None = None,
+        rf: float | None = None,
+        precision: int | None = None) -> list:
+        """Return the attribute vector of a single pitch, without its harmonic number."""
+        pci = pitch.Pitch(p = p,
+            rp = self.reference_pitch if rp is None else rp,
+            rf = self.reference_freq if rf is None else rf,
+            precision = self.precision if precision is None else precision)
+        self.reference_keynum = pci.reference_keynum
+        return self._row_from_pitch(pci)
+
+    @staticmethod
+    def _row_from_pitch(pci: pitch.Pitch) -> list:
+        return [pci.ratio,
+            pci.monzo,
+            pci.freq,
+            pci.keynum,
+            pci.keynum_class,
+            pci.distance_in_cents_from_reference,
+            pci.constituent_primes,
+            pci.notation,
+            pci.letter_name_and_octave_and_cents,
+            pci.normalized_ratio,
+            pci.normalized_monzo,
+            pci.num_symbols,
+            pci.harmonic_distance,
+            pci.normalized_harmonic_distance]
+
+    def _refresh_harmonics(self) -> None:
+        """Recompute each pitch's harmonic number after the common denominator may have changed."""
+        self._columns[0] = self._harmonics_of_pitches(self._columns[1], self._columns[2])
 
     def _intervals_sequential(self) -> list[fractions.Fraction]:
         """Return the ascending interval between each consecutive pair of sorted pitches."""
         intervals_sequential = [ self.ratios[n] / self.ratios[n - 1] for n in range(1,len(self.ratios)) ]
         return intervals_sequential
 
+    def _update_statistics(self) -> None:
+        """Recompute the summary statistics from the per-pitch data.
+
+        The harmonic analysis (harmonics, periodicity pitch, least common
+        partial, harmonic intersection) is computed on first access instead.
+        Sums are taken in ratio order whatever the sort order, so they match a
+        fresh construction to the last bit.
+        """
+        self.avg_ratio = sum(self.ratios) / len(self.ratios)
+        self.avg_freq = sum(self._column_by_ratio(3)) / len(self.freqs)
+        self.avg_keynum = utilities_music.cpsmidi(self.avg_freq, self.reference_freq, self.reference_keynum)
+        self.minimum_ratio = min(self.ratios)
+        self.minimum_freq = min(self.freqs)
+        self.minimum_keynum = min(self.keynums)
+        self.maximum_ratio = max(self.ratios)
+        self.maximum_freq = max(self.freqs)
+        self.maximum_keynum = max(self.keynums)
+        self.ratio_span = self.maximum_ratio / self.minimum_ratio
+        self.freq_span = self.maximum_freq - self.minimum_freq
+        self.keynum_span = self.maximum_keynum - self.minimum_keynum
+        self.cents_span = self.keynum_span * 100
+
+        self.constituent_primes = sorted(list(dict.fromkeys([p for lop in self.constituent_primes_by_pitch for p in lop])))
+        self.hd_sum = self._hd_sum()
+        self.hd_avg = self.hd_sum / len(self.pc_raw)
+
     def _inversion(self) -> list[fractions.Fraction]:
         """Return the melodic inversion, transposed to start on the lowest pitch."""
         ratios = self.ratios
@@ -545,22 +1449,31 @@ class PitchCollection():
         transposed_inversion = [x * correction for x in inversion]
         return sorted(transposed_inversion)
 
-    def _is_tuneable(self, ratio: fractions.Fraction) -> bool:
-        return ratio in self._tuneable_set
-
-    def _least_common_partial(self) -> list[int | float]:
-        """Return [least_common_partial_integer, least_common_partial_freq_in_hz]."""
-        least_common_partial = math.lcm(*self.harmonics)
-        least_common_partial_freq = least_common_partial * self.periodicity_pitch
-        return [least_common_partial, least_common_partial_freq]
+    def _least_common_partial(self) -> int:
+        """Return the least common multiple of the harmonics.
 
-    def _pc_plus_resultant_tones(self) -> list[fractions.Fraction]:
-        composite_pc = list(dict.fromkeys(sorted(self.ratios + self.difference_tones + self.summation_tones)))
-        return composite_pc
+        Its monzo is the element-wise maximum of the pitches' monzos, shifted
+        like the harmonics by the common denominator.
+        """
+        lowest, highest = utilities_music.monzo_bounds(self._columns[2])
+        return utilities_music.monzo_to_integer([h + max(-l, 0) for l, h in zip(lowest, highest)])
 
     def _periodicity_pitch(self) -> float:
         """Return the fundamental frequency implied by the harmonic series of the collection."""
-        lowest_harmonic = min(self.harmonics)
+        lowest_harmonic = min(self._columns[0])
         lowest_freq = min(self.freqs)
-        periodicity_pitch = lowest_freq / lowest_harmonic
-        return periodicity_pitch
\ No newline at end of file
+        try:
+            periodicity_pitch = lowest_freq / lowest_harmonic
+        except OverflowError:
+            # lowest_harmonic is beyond the float range; divide exactly instead.
+            periodicity_pitch = lowest_freq * float(fractions.Fraction(1, lowest_harmonic))
+        return periodicity_pitch
+
+    def _least_common_partial_freq(self) -> float:
+        try:
+            return self.least_common_partial * self.periodicity_pitch
+        except OverflowError:
+            # The least common partial is beyond the float range, but its
+            # ratio to the lowest harmonic may not be.
+            ratio = fractions.Fraction(self.least_common_partial, min(self._columns[0]))
+            return min(self.freqs) * float(ratio)
\ No newline at end of file
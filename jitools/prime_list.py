@@ -35,7 +35,7 @@ class PrimeList():
             if p>x:
                 break
             while x%p==0:
-                x = x/p
+                x //= p
                 fact[p]=fact.get(p,0)+1
         if x>1:
             e = x if x!=n else int(math.sqrt(n))
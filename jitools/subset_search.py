@@ -0,0 +1,165 @@
+from __future__ import annotations
+import fractions
+import heapq
+import operator
+from collections import namedtuple
+from itertools import accumulate
+from .pitch_collection import PitchCollection
+from .utilities_music import multiples_of_common_unit, uncovered_density
+
+SubsetResult = namedtuple("SubsetResult", ["score", "ratios"])
+SubsetResult.__doc__ = """A subset found by search_subsets: its score and its ratios in ascending order."""
+
+# Each objective's PitchCollection-style score, and whether higher is better.
+OBJECTIVES = {
+    "tuneable_intervals": True,
+    "hd_sum": False,
+    "interval_hd_sum": False,
+    "harmonic_intersection": True,
+}
+DEFAULT_BEAM_WIDTH = 64
+
+
+def _pair_weights(collection: PitchCollection, objective: str) -> tuple[list[float], list[list[float]]]:
+    """Return per-pitch and pairwise weights whose sums, over a subset, are its score to maximize.
+
+    Pitches are in ascending order of ratio.
+    """
+    n = len(collection.ratios)
+    if objective == "hd_sum":
+        return [-hd for hd in collection.harmonic_distances], [[0.0] * n for _ in range(n)]
+    if objective == "interval_hd_sum":
+        return [0.0] * n, [[-hd for hd in row] for row in collection.hd_matrix()]
+    tuneable = collection.tuneable_interval_set
+    ratios = collection.ratios
+    return [0.0] * n, [[float(i != j and max(a, b) / min(a, b) in tuneable) for j, b in enumerate(ratios)]
+                       for i, a in enumerate(ratios)]
+
+
+def _branch_and_bound(unary: list[float], pairwise: list[list[float]], k: int, top: int) -> list[tuple[float, tuple]]:
+    """Return the top subsets of size k maximizing the sum of their unary and pairwise weights.
+
+    A depth-first search adds pitches in index order, keeping for every
+    candidate its gain, the weight it would add to the chosen pitches. A
+    branch is cut when even its r best candidates, each credited with its gain
+    and half its r - 1 largest pairwise weights, cannot beat the top-th best
+    subset found so far; no subset of r candidates can score more than that.
+    """
+    n = len(unary)
+    # half_best[c][t]: half the sum of the t largest pairwise weights of c.
+    half_best = [[0.0] + [x / 2 for x in accumulate(sorted((w for j, w in enumerate(row) if j != c), reverse = True))]
+                 for c, row in enumerate(pairwise)]
+    best = []  # min-heap of (score, subset)
+
+    def search(start: int, chosen: tuple, score: float, gain: list[float]) -> None:
+        r = k - len(chosen)
+        if r == 0:
+            if len(best) < top:
+                heapq.heappush(best, (score, chosen))
+            elif score > best[0][0]:
+                heapq.heapreplace(best, (score, chosen))
+            return
+        if len(best) == top:
+            potentials = [unary[c] + gain[c] + half_best[c][r - 1] for c in range(start, n)]
+            if score + sum(heapq.nlargest(r, potentials)) <= best[0][0]:
+                return
+        for c in range(start, n - r + 1):
+            search(c + 1, chosen + (c,), score + unary[c] + gain[c], list(map(operator.add, gain, pairwise[c])))
+
+    search(0, (), 0.0, [0.0] * n)
+    return sorted(best, key = lambda x: (-x[0], x[1]))
+
+
+def _beam_search(score, n: int, k: int, top: int, beam_width: int) -> list[tuple[float, tuple]]:
+    """Grow subsets one pitch at a time, keeping the beam_width best of each size by score()."""
+    beam = [()]
+    for _ in range(k):
+        grown = {tuple(sorted(subset + (c,))) for subset in beam for c in range(n) if c not in subset}
+        ranked = sorted(((score(subset), subset) for subset in grown), key = lambda x: (-x[0], x[1]))
+        beam = [subset for _, subset in ranked[:beam_width]]
+    return ranked[:top]
+
+
+def search_subsets(
+        collection: PitchCollection,
+        k: int,
+        objective: str = "tuneable_intervals",
+        top: int = 10,
+        beam_width: int | None = None) -> list[SubsetResult]:
+    """Return the top k-note subsets of collection for objective, best first.
+
+    The pairwise tuneability or harmonic distance matrix is computed once, and
+    subsets are scored incrementally as pitches are added rather than by
+    building a PitchCollection for each.
+
+    Parameters
+    ----------
+    collection : PitchCollection
+        The scale to choose from.
+    k : int
+        Number of pitches in each subset.
+    objective : str
+        What to optimize (default "tuneable_intervals"):
+        "tuneable_intervals" maximizes the number of pitch pairs forming a
+        tuneable interval; "hd_sum" minimizes the subset's hd_sum;
+        "interval_hd_sum" minimizes the summed harmonic distance of the
+        intervals between every two pitches; "harmonic_intersection"
+        maximizes the subset's harmonic_intersection.
+    top : int
+        Number of subsets returned (default 10).
+    beam_width : int or None
+        None searches exhaustively by branch and bound, which is exact for
+        every objective but "harmonic_intersection". A width runs a beam
+        search instead, which keeps that many best subsets of each size and
+        is faster but may miss the best subsets. "harmonic_intersection" is
+        not a sum over pitches and pairs, so it always uses a beam search, of
+        width DEFAULT_BEAM_WIDTH when None is given.
+
+    Returns
+    -------
+    A list of SubsetResult(score, ratios), ratios in ascending order, scores
+    as the objective's attribute would report them.
+
+    Raises
+    ------
+    ValueError
+        If objective is unknown, or k, top or beam_width is out of range.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"unknown objective {objective!r}; choose from {sorted(OBJECTIVES)}")
+    ratios = collection.ratios
+    if not 1 <= k <= len(ratios):
+        raise ValueError(f"k must be between 1 and {len(ratios)}, got {k}")
+    if top < 1:
+        raise ValueError(f"top must be at least 1, got {top}")
+    if beam_width is not None and beam_width < 1:
+        raise ValueError(f"beam_width must be at least 1, got {beam_width}")
+    maximize = OBJECTIVES[objective]
+    if objective == "harmonic_intersection":
+        monzos = collection.monzos
+        primes = collection.constituent_primes
+        # Subsets that are transpositions of each other share a shape and so an intersection.
+        by_shape = {}
+
+        def score(subset: tuple) -> fractions.Fraction:
+            shape = tuple(multiples_of_common_unit([ratios[i] for i in subset], [monzos[i] for i in subset]))
+            if shape not in by_shape:
+                by_shape[shape] = 1 - uncovered_density(list(shape), primes)
+            return by_shape[shape]
+
+        results = _beam_search(score, len(ratios), k, top, beam_width or DEFAULT_BEAM_WIDTH)
+    else:
+        unary, pairwise = _pair_weights(collection, objective)
+        if beam_width is None:
+            results = _branch_and_bound(unary, pairwise, k, top)
+        else:
+            def score(subset: tuple) -> float:
+                return (sum(unary[i] for i in subset)
+                        + sum(pairwise[i][j] for n, i in enumerate(subset) for j in subset[n + 1:]))
+
+            results = _beam_search(score, len(ratios), k, top, beam_width)
+        if objective == "tuneable_intervals":
+            results = [(round(score), subset) for score, subset in results]
+    # Minimized objectives were searched negated; their scores are sums of non-negative terms.
+    return [SubsetResult(score if maximize else abs(score), sorted(ratios[i] for i in subset))
+            for score, subset in results]
@@ -0,0 +1,163 @@
+from __future__ import annotations
+import fractions
+import math
+from collections.abc import Iterable
+from .utilities_music import as_fraction, octave_reduced, odd_part
+
+# Fingerprints are positions on a grid of this many steps per octave.
+_FINGERPRINT_STEPS = 1 << 32
+_MAX_CACHED_INTERVALS = 256
+
+
+class _Points():
+    """Pitches or pitch classes as exact (numerator, denominator) pairs, hashed by fingerprint.
+
+    A fingerprint is a point's log2 rounded to the grid, taken modulo the
+    octave for pitch classes. Transposing a point is then a float addition,
+    and the grid steps either side of the sum hold every point the result can
+    equal; those few are checked exactly by cross-multiplication.
+    """
+
+    def __init__(self, pairs: list[tuple[int, int]], octave_equivalent: bool) -> None:
+        self.numerators = [n for n, _ in pairs]
+        self.denominators = [d for _, d in pairs]
+        self.logs = [math.log2(n) - math.log2(d) for n, d in pairs]
+        self.modulus = _FINGERPRINT_STEPS if octave_equivalent else None
+        self.buckets: dict[int, list[int]] = {}
+        for i, log in enumerate(self.logs):
+            self.buckets.setdefault(self._fingerprint(round(log * _FINGERPRINT_STEPS)), []).append(i)
+
+    def _fingerprint(self, step: int) -> int:
+        return step % self.modulus if self.modulus else step
+
+    def transposed(self, i: int, numerator: int, denominator: int, log: float) -> int | None:
+        """Return the index of point i transposed by numerator / denominator, or None if it is absent."""
+        position = (self.logs[i] + log) * _FINGERPRINT_STEPS
+        a = self.numerators[i] * numerator
+        b = self.denominators[i] * denominator
+        for step in {math.floor(position), math.ceil(position)}:
+            for j in self.buckets.get(self._fingerprint(step), ()):
+                if a * self.denominators[j] == b * self.numerators[j]:
+                    return j
+        return None
+
+
+class TranspositionIndex():
+    """An index of a scale for finding every transposition of a chord within it.
+
+    Each pitch, and each pitch class for octave-equivalent queries, is hashed
+    by a fingerprint of its size, so testing whether a transposed pitch is in
+    the scale is a hash lookup instead of building a PitchCollection. The
+    pitches that have a given interval above them in the scale are cached per
+    interval, so once a chord's rarest interval has been looked up, queries
+    take time proportional to the number of pitches carrying it rather than
+    the size of the scale.
+    """
+
+    def __init__(self, scale: Iterable[tuple[int, int] | fractions.Fraction]) -> None:
+        """
+        Args:
+            scale: Pitches as (numerator, denominator) tuples or Fractions,
+                e.g. a PitchCollection's ratios. Duplicates are ignored.
+        """
+        self.ratios: tuple[fractions.Fraction, ...] = tuple(sorted({as_fraction(x) for x in scale}))
+        if self.ratios and self.ratios[0] <= 0:
+            raise ValueError("scale pitches must be positive")
+        self._points = {}
+        self._roots_by_interval = {}
+
+    def __len__(self) -> int:
+        return len(self.ratios)
+
+    def __repr__(self) -> str:
+        return f"TranspositionIndex({len(self)} pitches)"
+
+    def _points_for(self, octave_equivalent: bool) -> _Points:
+        if octave_equivalent not in self._points:
+            if octave_equivalent:
+                classes = sorted({octave_reduced(x) for x in self.ratios})
+                pairs = [(odd_part(x.numerator), odd_part(x.denominator)) for x in classes]
+            else:
+                pairs = [(x.numerator, x.denominator) for x in self.ratios]
+            self._points[octave_equivalent] = _Points(pairs, octave_equivalent)
+        return self._points[octave_equivalent]
+
+    def _roots(self, points: _Points, octave_equivalent: bool, interval: tuple[int, int, float]) -> list[int]:
+        """Return the points that have interval above them, from the cache when possible."""
+        key = (interval[0], interval[1], octave_equivalent)
+        if key not in self._roots_by_interval:
+            if len(self._roots_by_interval) >= _MAX_CACHED_INTERVALS:
+                del self._roots_by_interval[next(iter(self._roots_by_interval))]
+            self._roots_by_interval[key] = [
+                i for i in range(len(points.logs)) if points.transposed(i, *interval) is not None]
+        return self._roots_by_interval[key]
+
+    def _placements(
+            self,
+            chord: Iterable[tuple[int, int] | fractions.Fraction],
+            octave_equivalent: bool) -> tuple[list[fractions.Fraction], list[int]]:
+        """Return the chord as Fractions and the points its first pitch lands on in each placement."""
+        chord = [as_fraction(x) for x in chord]
+        if not chord:
+            raise ValueError("chord must not be empty")
+        if any(x <= 0 for x in chord):
+            raise ValueError("chord pitches must be positive")
+        points = self._points_for(octave_equivalent)
+        base = chord[0]
+        intervals = set()
+        for x in chord[1:]:
+            step = x / base
+            numerator, denominator = step.numerator, step.denominator
+            if octave_equivalent:
+                numerator, denominator = odd_part(numerator), odd_part(denominator)
+            if numerator != denominator:
+                intervals.add((numerator, denominator, math.log2(numerator) - math.log2(denominator)))
+        if not intervals:
+            return chord, list(range(len(points.logs)))
+        # Start from the interval with the fewest known roots, or else the most complex one,
+        # which is likely the rarest, and check the others against those roots only.
+        cached = [x for x in intervals if (x[0], x[1], octave_equivalent) in self._roots_by_interval]
+        if cached:
+            first = min(cached, key = lambda x: len(self._roots_by_interval[(x[0], x[1], octave_equivalent)]))
+        else:
+            first = max(intervals, key = lambda x: x[0] * x[1])
+        roots = self._roots(points, octave_equivalent, first)
+        intervals.discard(first)
+        for interval in intervals:
+            roots = [i for i in roots if points.transposed(i, *interval) is not None]
+        return chord, roots
+
+    def transpositions(
+            self,
+            chord: Iterable[tuple[int, int] | fractions.Fraction],
+            octave_equivalent: bool = False) -> list[fractions.Fraction]:
+        """Return every t such that the chord transposed by t lies within the scale, ascending.
+
+        Args:
+            chord: Pitches as (numerator, denominator) tuples or Fractions.
+            octave_equivalent: If True, the transposed chord need only match
+                the scale's pitch classes, and each t is octave-reduced to
+                [1, 2). Defaults to False.
+        """
+        chord, roots = self._placements(chord, octave_equivalent)
+        if not octave_equivalent:
+            return [self.ratios[i] / chord[0] for i in roots]
+        points = self._points_for(True)
+        return sorted(octave_reduced(fractions.Fraction(points.numerators[i], points.denominators[i]) / chord[0])
+                      for i in roots)
+
+    def occurrences(
+            self,
+            chord: Iterable[tuple[int, int] | fractions.Fraction],
+            octave_equivalent: bool = False) -> list[tuple[fractions.Fraction, ...]]:
+        """Return the scale pitches each transposition of chord occupies, in chord order.
+
+        Args:
+            chord, octave_equivalent: As for transpositions(). If
+                octave_equivalent is True, the pitches are octave-reduced
+                pitch classes.
+        """
+        chord = [as_fraction(x) for x in chord]
+        if not octave_equivalent:
+            return [tuple(t * x for x in chord) for t in self.transpositions(chord)]
+        return [tuple(octave_reduced(t * x) for x in chord) for t in self.transpositions(chord, True)]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+import fractions
+import math
+import operator
+from collections.abc import Iterator
+from .pitch import LONG_LIST_OF_PRIMES, Pitch
+from .tuneable_interval_set import TuneableIntervalSet
+from .utilities_music import as_fraction, monzo_primes
+
+
+def _factors(x: fractions.Fraction) -> dict[int, int]:
+    exponents = {}
+    for n, sign in ((x.numerator, 1), (x.denominator, -1)):
+        for p, e in LONG_LIST_OF_PRIMES.factors(n):
+            exponents[p] = exponents.get(p, 0) + sign * e
+    return exponents
+
+
+def tuneable_closure(
+        root: Pitch | tuple[int, int] | fractions.Fraction = (1, 1),
+        ti: list[tuple[int, int]] | TuneableIntervalSet | None = None,
+        max_steps: int | None = None,
+        max_hd: float | None = None,
+        cents_range: tuple[float, float] | None = None,
+        prime_limit: int | None = None,
+        as_monzos: bool = False) -> Iterator[fractions.Fraction] | Iterator[list[int]]:
+    """Yield every pitch that can be tuned from root by a chain of tuneable intervals, within bounds.
+
+    The closure is a breadth-first search of the just intonation lattice,
+    so pitches are yielded as they are found, root first, then those one
+    step away, and so on; within each step, in the order of the tuneable
+    intervals by harmonic distance. A chain only passes through pitches
+    within the hd and cents bounds, as a performer can only tune from
+    pitches they can play. Pitches seen are held as monzos packed into
+    single ints, so each step is one integer addition and repeats are found
+    by a set lookup. The output can be passed as list(...) to
+    PitchCollection, as Fractions or, with as_monzos, as monzos.
+
+    Args:
+        root: The pitch the chains start from, as a Pitch, a (numerator,
+            denominator) tuple or a Fraction. Defaults to 1/1.
+        ti: The tuneable intervals, as a list or a TuneableIntervalSet.
+            Defaults to the Sabat-Schweinitz tuneable interval list.
+        max_steps: Most intervals in a chain. None for no limit.
+        max_hd: Largest harmonic distance of a pitch from 1/1. None for no
+            limit. At least one of max_steps and max_hd must be given.
+        cents_range: (low, high) distance in cents of a pitch from 1/1,
+            inclusive. None for no limit.
+        prime_limit: Largest prime of the intervals used. None for no limit.
+        as_monzos: Yield monzos (lists of the exponents of 2, 3, 5, ...,
+            like Pitch.monzo) instead of Fractions, which skips building a
+            Fraction per pitch. Defaults to False.
+
+    Yields:
+        The pitches of the closure as Fractions or monzos, each once.
+    """
+    if max_steps is None and max_hd is None:
+        raise ValueError("the closure is infinite unless max_steps or max_hd is given")
+    if max_steps is not None and max_steps < 0:
+        raise ValueError(f"max_steps must not be negative, got {max_steps}")
+    if cents_range is not None and cents_range[0] > cents_range[1]:
+        raise ValueError(f"cents_range must be (low, high), got {cents_range}")
+    if ti is None:
+        ti = TuneableIntervalSet.shared()
+    elif not isinstance(ti, TuneableIntervalSet):
+        ti = TuneableIntervalSet.shared(ti)
+    root = root.ratio if isinstance(root, Pitch) else as_fraction(root)
+    if root <= 0:
+        raise ValueError("root must be positive")
+    steps = {x for interval in ti.intervals if interval != 1 for x in (interval, 1 / interval)}
+    step_factors = {x: _factors(x) for x in steps}
+    if prime_limit is not None:
+        step_factors = {x: f for x, f in step_factors.items() if all(p <= prime_limit for p in f)}
+    root_factors = _factors(root)
+    primes = sorted(set(root_factors).union(*step_factors.values()))
+    logs = [math.log2(p) for p in primes]
+    intervals = sorted(step_factors, key = lambda x: (math.log2(x.numerator * x.denominator), x))
+
+    # Exponents stay within the steps or the harmonic distance allowed, so
+    # fields this wide never overlap and packing is linear: the key of a sum
+    # of monzos is the sum of their keys.
+    largest = max((abs(e) for f in step_factors.values() for e in f.values()), default = 0)
+    bound = max((abs(e) for e in root_factors.values()), default = 0)
+    bound += largest * max_steps if max_steps is not None else int(max_hd) + 1 + largest
+    width = (2 * bound + 1).bit_length() + 1
+
+    def pack(monzo: tuple[int, ...]) -> int:
+        return sum(e << (width * k) for k, e in enumerate(monzo))
+
+    delta_monzos = [tuple(step_factors[x].get(p, 0) for p in primes) for x in intervals]
+    delta_keys = [pack(m) for m in delta_monzos]
+    monzo_by_delta = dict(zip(delta_keys, delta_monzos))
+    order_by_delta = {d: i for i, d in enumerate(delta_keys)}
+    log_by_delta = dict(zip(delta_keys, (math.log2(x) for x in intervals)))
+    low, high = cents_range if cents_range is not None else (-math.inf, math.inf)
+
+    def within(monzo: tuple[int, ...], log: float) -> bool:
+        if not low <= 1200 * log <= high:
+            return False
+        return max_hd is None or sum(map(operator.mul, map(abs, monzo), logs)) <= max_hd + 1e-9
+
+    # Position of each of primes in a monzo, which lists every prime in turn.
+    length = 1
+    while primes and monzo_primes(length)[-1] < primes[-1]:
+        length *= 2
+    positions = [monzo_primes(length).index(p) for p in primes]
+
+    def full_monzo(monzo: tuple[int, ...]) -> list[int]:
+        full = [0] * (max((i for i, e in zip(positions, monzo) if e), default = 0) + 1)
+        for i, e in zip(positions, monzo):
+            if e:
+                full[i] = e
+        return full
+
+    def ratio(monzo: tuple[int, ...]) -> fractions.Fraction:
+        numerator = denominator = 1
+        for p, e in zip(primes, monzo):
+            if e > 0:
+                numerator *= p ** e
+            elif e < 0:
+                denominator *= p ** -e
+        return fractions.Fraction(numerator, denominator)
+
+    output = full_monzo if as_monzos else ratio
+
+    monzo = tuple(root_factors.get(p, 0) for p in primes)
+    log = math.log2(root)
+    if not within(monzo, log):
+        return
+    key = pack(monzo)
+    seen = {key}
+    layer = [(key, monzo, log)]
+    yield output(monzo)
+    depth = 0
+    while layer and (max_steps is None or depth < max_steps):
+        depth += 1
+        next_layer = []
+        for key, monzo, log in layer:
+            for child in sorted(set(map(key.__add__, delta_keys)) - seen, key = lambda c: order_by_delta[c - key]):
+                seen.add(child)
+                delta = child - key
+                child_monzo = tuple(map(operator.add, monzo, monzo_by_delta[delta]))
+                child_log = log + log_by_delta[delta]
+                if within(child_monzo, child_log):
+                    next_layer.append((child, child_monzo, child_log))
+                    yield output(child_monzo)
+        layer = next_layer
@@ -0,0 +1,169 @@
+from __future__ import annotations
+import fractions
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from functools import lru_cache
+from . import constants
+from .utilities_music import as_fraction, octave_reduced
+
+_OCTAVE_CENTS = 1200.0
+
+
+def _cents(interval: tuple[int, int] | fractions.Fraction | float) -> float:
+    if isinstance(interval, tuple):
+        return _OCTAVE_CENTS * (math.log2(interval[0]) - math.log2(interval[1]))
+    if isinstance(interval, fractions.Fraction):
+        return _OCTAVE_CENTS * (math.log2(interval.numerator) - math.log2(interval.denominator))
+    return _OCTAVE_CENTS * math.log2(interval)
+
+
+class TuneableIntervalSet():
+    """An indexed, immutable set of tuneable intervals.
+
+    The intervals are held three ways so each kind of query is a single lookup:
+    a hash set of reduced (numerator, denominator) pairs for exact matches, a
+    hash set of octave-reduced pairs for matches up to octave equivalence, and
+    arrays of the intervals' sizes in cents, sorted, for matches within a
+    tolerance. TuneableIntervalSet.shared() returns one instance per interval
+    list, which every PitchCollection built with that list uses.
+    """
+
+    def __init__(self, intervals: Iterable[tuple[int, int] | fractions.Fraction] | None = None) -> None:
+        """
+        Args:
+            intervals: Tuneable intervals as (numerator, denominator) tuples or
+                Fractions. Defaults to the Sabat-Schweinitz tuneable interval list.
+        """
+        if intervals is None:
+            intervals = constants.SABAT_SCHWEINITZ_TUNEABLE_INTERVALS
+        self.intervals: tuple[fractions.Fraction, ...] = tuple(as_fraction(x) for x in intervals)
+        if any(x <= 0 for x in self.intervals):
+            raise ValueError("tuneable intervals must be positive")
+        self.keys: frozenset[tuple[int, int]] = frozenset(
+            (x.numerator, x.denominator) for x in self.intervals)
+        reduced = {octave_reduced(x) for x in self.intervals}
+        self._octave_reduced_keys = frozenset((x.numerator, x.denominator) for x in reduced)
+        by_cents = sorted((_cents(x), x) for x in set(self.intervals))
+        self._cents = array("d", (c for c, _ in by_cents))
+        self._by_cents = [x for _, x in by_cents]
+        reduced_by_cents = sorted((_cents(x), x) for x in reduced)
+        self._reduced_cents = array("d", (c for c, _ in reduced_by_cents))
+        self._reduced_by_cents = [x for _, x in reduced_by_cents]
+
+    @classmethod
+    def shared(cls, intervals: Iterable[tuple[int, int] | fractions.Fraction] | None = None) -> TuneableIntervalSet:
+        """Return the cached TuneableIntervalSet for intervals, building it on first use.
+
+        Args:
+            intervals: As for TuneableIntervalSet().
+        """
+        if intervals is None:
+            intervals = constants.SABAT_SCHWEINITZ_TUNEABLE_INTERVALS
+        return _shared(tuple(x if isinstance(x, fractions.Fraction) else (x[0], x[1]) for x in intervals))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self._by_cents)
+
+    def __contains__(self, interval: tuple[int, int] | fractions.Fraction) -> bool:
+        interval = as_fraction(interval)
+        return (interval.numerator, interval.denominator) in self.keys
+
+    def __repr__(self) -> str:
+        return f"TuneableIntervalSet({len(self)} intervals)"
+
+    def matches(
+            self,
+            interval: tuple[int, int] | fractions.Fraction | float,
+            octave_equivalent: bool = False,
+            tolerance: float = 0.0) -> list[fractions.Fraction]:
+        """Return the tuneable intervals that match interval, nearest first.
+
+        Args:
+            interval: The interval as a (numerator, denominator) tuple, a
+                Fraction, or a float frequency ratio, e.g. a tempered interval.
+            octave_equivalent: If True, intervals match when they differ by any
+                number of octaves; the octave-reduced tuneable intervals are
+                returned. Defaults to False.
+            tolerance: Largest difference in cents at which intervals still
+                match. Defaults to 0.0, an exact match.
+        """
+        if tolerance < 0:
+            raise ValueError(f"tolerance must not be negative, got {tolerance}")
+        if not isinstance(interval, float) and tolerance == 0:
+            ratio = as_fraction(interval)
+            if octave_equivalent:
+                ratio = octave_reduced(ratio)
+                return [ratio] if (ratio.numerator, ratio.denominator) in self._octave_reduced_keys else []
+            return [ratio] if (ratio.numerator, ratio.denominator) in self.keys else []
+        cents = _cents(interval)
+        if not octave_equivalent:
+            found = self._within(self._cents, self._by_cents, cents, tolerance)
+        else:
+            # Near the octave boundary the nearest matches lie on the other side of it.
+            cents %= _OCTAVE_CENTS
+            found = [match for shift in (0.0, -_OCTAVE_CENTS, _OCTAVE_CENTS)
+                     for match in self._within(self._reduced_cents, self._reduced_by_cents, cents + shift, tolerance)]
+        return list(dict.fromkeys(x for _, x in sorted(found)))
+
+    @staticmethod
+    def _within(
+            cents_index: array,
+            intervals: list[fractions.Fraction],
+            cents: float,
+            tolerance: float) -> list[tuple[float, fractions.Fraction]]:
+        """Return (distance in cents, interval) for the intervals within tolerance of cents."""
+        lo = bisect_left(cents_index, cents - tolerance)
+        hi = bisect_right(cents_index, cents + tolerance)
+        return [(abs(cents_index[i] - cents), intervals[i]) for i in range(lo, hi)]
+
+    def is_tuneable(
+            self,
+            interval: tuple[int, int] | fractions.Fraction | float,
+            octave_equivalent: bool = False,
+            tolerance: float = 0.0) -> bool:
+        """Return True if interval matches a tuneable interval; arguments as for matches()."""
+        return bool(self.matches(interval, octave_equivalent, tolerance))
+
+    def classify(
+            self,
+            intervals: Iterable[tuple[int, int] | fractions.Fraction | float],
+            octave_equivalent: bool = False,
+            tolerance: float = 0.0) -> list[bool]:
+        """Return whether each of intervals is tuneable, in order.
+
+        Args:
+            intervals: Intervals as accepted by matches().
+            octave_equivalent, tolerance: As for matches().
+        """
+        if tolerance < 0:
+            raise ValueError(f"tolerance must not be negative, got {tolerance}")
+        if tolerance == 0:
+            keys = self._octave_reduced_keys if octave_equivalent else self.keys
+            normalize = octave_reduced if octave_equivalent else (lambda x: x)
+            classes = []
+            for interval in intervals:
+                if isinstance(interval, float):
+                    classes.append(self.is_tuneable(interval, octave_equivalent))
+                else:
+                    ratio = normalize(as_fraction(interval))
+                    classes.append((ratio.numerator, ratio.denominator) in keys)
+            return classes
+        if octave_equivalent:
+            return [self.is_tuneable(x, True, tolerance) for x in intervals]
+        cents_index = self._cents
+        classes = []
+        for interval in intervals:
+            cents = _cents(interval)
+            i = bisect_left(cents_index, cents - tolerance)
+            classes.append(i < len(cents_index) and cents_index[i] <= cents + tolerance)
+        return classes
+
+
+@lru_cache(maxsize = 32)
+def _shared(intervals: tuple) -> TuneableIntervalSet:
+    return TuneableIntervalSet(intervals)
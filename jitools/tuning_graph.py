@@ -0,0 +1,230 @@
+from __future__ import annotations
+import fractions
+import math
+from collections.abc import Iterable, Iterator
+
+
+def _bits(x: int) -> Iterator[int]:
+    """Yield the positions of the set bits of x, lowest first."""
+    while x:
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
+
+
+class TuningGraph():
+    """The pitches of a collection, joined wherever two form an allowed tuneable interval.
+
+    A performer can tune a pitch by ear from any pitch it is joined to, so a
+    chain of edges from the reference is a way of tuning the whole chain in
+    turn. Each edge is weighted by the harmonic distance of its interval. The
+    neighbours of each pitch are held as an int bitset, so a breadth-first
+    search visits a whole layer of pitches with a few integer operations.
+
+    The reference pitch 1/1 is always a node, even when it is not one of the
+    collection's pitches, in which case reference_is_pitch is False.
+    """
+
+    def __init__(
+            self,
+            ratios: Iterable[fractions.Fraction],
+            edges: Iterable[tuple[int, int, tuple[int, int]]],
+            reference_is_pitch: bool = True) -> None:
+        """
+        Args:
+            ratios: The distinct pitches, ascending, including 1/1.
+            edges: (i, j, (n, d)) for each tuneable pair of pitches, where
+                n/d is the interval between ratios[i] and ratios[j].
+            reference_is_pitch: Whether 1/1 is a pitch of the collection
+                rather than only the reference. Defaults to True.
+        """
+        self.ratios: tuple[fractions.Fraction, ...] = tuple(ratios)
+        self._node = {x: i for i, x in enumerate(self.ratios)}
+        if fractions.Fraction(1) not in self._node:
+            raise ValueError("ratios must include the reference, 1/1")
+        self.reference: int = self._node[fractions.Fraction(1)]
+        self.reference_is_pitch = reference_is_pitch
+        self.adjacency: list[int] = [0] * len(self.ratios)
+        self._hd: dict[tuple[int, int], float] = {}
+        for i, j, (n, d) in edges:
+            self.adjacency[i] |= 1 << j
+            self.adjacency[j] |= 1 << i
+            self._hd[(min(i, j), max(i, j))] = math.log2(n) + math.log2(d)
+
+    def __len__(self) -> int:
+        return len(self.ratios)
+
+    def __repr__(self) -> str:
+        return f"TuningGraph({len(self)} pitches, {len(self._hd)} tuneable pairs)"
+
+    def _index(self, pitch: tuple[int, int] | fractions.Fraction) -> int:
+        pitch = fractions.Fraction(*pitch) if isinstance(pitch, tuple) else fractions.Fraction(pitch)
+        if pitch not in self._node:
+            raise ValueError(f"{pitch} is not a pitch of the graph")
+        return self._node[pitch]
+
+    def _edge_hd(self, i: int, j: int) -> float:
+        return self._hd[(i, j) if i < j else (j, i)]
+
+    def neighbours(self, pitch: tuple[int, int] | fractions.Fraction) -> list[fractions.Fraction]:
+        """Return the pitches that form a tuneable interval with pitch, ascending."""
+        return [self.ratios[j] for j in _bits(self.adjacency[self._index(pitch)])]
+
+    def _reachable(self, i: int) -> int:
+        """Return the bitset of the nodes connected to node i, itself included."""
+        seen = frontier = 1 << i
+        adjacency = self.adjacency
+        while frontier:
+            reached = 0
+            for j in _bits(frontier):
+                reached |= adjacency[j]
+            frontier = reached & ~seen
+            seen |= frontier
+        return seen
+
+    def components(self) -> list[list[fractions.Fraction]]:
+        """Return the sets of pitches joined by chains of tuneable intervals, ordered by lowest pitch."""
+        components = []
+        remaining = (1 << len(self.ratios)) - 1
+        while remaining:
+            component = self._reachable((remaining & -remaining).bit_length() - 1)
+            components.append([self.ratios[j] for j in _bits(component)])
+            remaining &= ~component
+        return components
+
+    def is_connected(self) -> bool:
+        """Return True if every pitch can be tuned from the reference through a chain of tuneable intervals."""
+        return self._reachable(self.reference) == (1 << len(self.ratios)) - 1
+
+    def _shortest_path_tree(self, source: int) -> tuple[list[int | None], list[int]]:
+        """Return each node's parent on its chain from source, and the reachable nodes in breadth-first order.
+
+        Chains have the fewest intervals; among those, the least total
+        harmonic distance. Unreachable nodes, and source, have parent None.
+        """
+        parents = [None] * len(self.ratios)
+        cost = [math.inf] * len(self.ratios)
+        cost[source] = 0.0
+        order = [source]
+        seen = layer = 1 << source
+        adjacency = self.adjacency
+        while layer:
+            reached = 0
+            for i in _bits(layer):
+                reached |= adjacency[i]
+            reached &= ~seen
+            for j in _bits(reached):
+                for i in _bits(adjacency[j] & layer):
+                    c = cost[i] + self._edge_hd(i, j)
+                    if c < cost[j]:
+                        cost[j], parents[j] = c, i
+                order.append(j)
+            seen |= reached
+            layer = reached
+        return parents, order
+
+    def chain(
+            self,
+            target: tuple[int, int] | fractions.Fraction,
+            source: tuple[int, int] | fractions.Fraction | None = None) -> list[fractions.Fraction] | None:
+        """Return the shortest chain of tuneable intervals from source to target, or None if there is none.
+
+        Args:
+            target: The pitch to tune.
+            source: The pitch to start from. Defaults to the reference, 1/1.
+
+        Returns:
+            The pitches along the chain, from source to target. Of the chains
+            with the fewest intervals, the one of least total harmonic
+            distance is returned.
+        """
+        source = self.reference if source is None else self._index(source)
+        target = self._index(target)
+        parents, _ = self._shortest_path_tree(source)
+        if target != source and parents[target] is None:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        return [self.ratios[i] for i in reversed(path)]
+
+    def chains(
+            self,
+            source: tuple[int, int] | fractions.Fraction | None = None) -> dict[fractions.Fraction, list[fractions.Fraction]]:
+        """Return {pitch: chain()} for every pitch reachable from source, which defaults to the reference."""
+        source = self.reference if source is None else self._index(source)
+        parents, order = self._shortest_path_tree(source)
+        paths = {source: [self.ratios[source]]}
+        for i in order[1:]:
+            paths[i] = paths[parents[i]] + [self.ratios[i]]
+        return {self.ratios[i]: paths[i] for i in sorted(paths)}
+
+    def spanning_tree(self) -> list[tuple[fractions.Fraction, fractions.Fraction]]:
+        """Return the tuneable pairs of a spanning forest of least total harmonic distance.
+
+        The forest joins the pitches of each component with the fewest and
+        simplest intervals that still let every pitch be tuned from every
+        other. Pairs are (upper, lower) tuples, in the order Kruskal's
+        algorithm takes them: by harmonic distance, then pitch.
+        """
+        parent = list(range(len(self.ratios)))
+
+        def root(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        tree = []
+        for (i, j), _ in sorted(self._hd.items(), key = lambda x: (x[1], x[0])):
+            ri, rj = root(i), root(j)
+            if ri != rj:
+                parent[ri] = rj
+                tree.append((self.ratios[j], self.ratios[i]))
+        return tree
+
+    def spanning_tree_hd(self) -> float:
+        """Return the total harmonic distance of spanning_tree()."""
+        return sum(self._edge_hd(self._node[a], self._node[b]) for a, b in self.spanning_tree())
+
+    def articulation_pitches(self) -> list[fractions.Fraction]:
+        """Return the pitches whose removal would split their component, ascending.
+
+        These are the pitches every chain between some two others must pass
+        through, found by an iterative depth-first search for the lowest
+        node reachable from each subtree.
+        """
+        n = len(self.ratios)
+        order = [0] * n
+        low = [0] * n
+        articulation = set()
+        counter = 1
+        for start in range(n):
+            if order[start]:
+                continue
+            order[start] = low[start] = counter
+            counter += 1
+            root_children = 0
+            stack = [(start, -1, _bits(self.adjacency[start]))]
+            while stack:
+                node, parent, neighbours = stack[-1]
+                for j in neighbours:
+                    if not order[j]:
+                        order[j] = low[j] = counter
+                        counter += 1
+                        stack.append((j, node, _bits(self.adjacency[j])))
+                        break
+                    if j != parent:
+                        low[node] = min(low[node], order[j])
+                else:
+                    stack.pop()
+                    if parent == -1:
+                        continue
+                    low[parent] = min(low[parent], low[node])
+                    if parent == start:
+                        root_children += 1
+                    elif low[node] >= order[parent]:
+                        articulation.add(parent)
+            if root_children > 1:
+                articulation.add(start)
+        return [self.ratios[i] for i in sorted(articulation)]
@@ -0,0 +1,200 @@
+from __future__ import annotations
+import fractions
+import heapq
+import math
+import operator
+from collections import namedtuple
+from functools import lru_cache
+from .pitch import LONG_LIST_OF_PRIMES, Pitch
+from .tuneable_interval_set import TuneableIntervalSet
+from .utilities_music import as_fraction
+
+TuningRoute = namedtuple("TuningRoute", ["steps", "pitches", "hd"])
+TuningRoute.__doc__ = """A route found by tuning_routes().
+
+steps are the intervals tuned in turn, each a Fraction above 1 when tuned
+upwards and below 1 when tuned downwards, simplest first. pitches are the
+pitches passed through, from the start to the target, and hd is the summed
+harmonic distance of the steps.
+"""
+
+DEFAULT_MAX_STEPS = 8
+DEFAULT_MAX_FRONTIER = 100000
+
+
+class _StepSet():
+    """The tuneable intervals in both directions as monzo deltas, with lookup tables for the heuristic.
+
+    one_step and two_step map every lattice vector reachable in one or two
+    steps to the least harmonic distance of doing so, so the heuristic is
+    exact for the last two steps of a route.
+    """
+
+    def __init__(self, intervals: tuple[fractions.Fraction, ...]) -> None:
+        steps = {x for interval in intervals if interval != 1 for x in (interval, 1 / interval)}
+        self.primes = sorted({p for x in steps for n in (x.numerator, x.denominator)
+                              for p, _ in LONG_LIST_OF_PRIMES.factors(n)})
+        self.logs = [math.log2(p) for p in self.primes]
+        self.steps = sorted(steps, key = lambda x: (math.log2(x.numerator * x.denominator), x))
+        self.deltas = [self.monzo(x) for x in self.steps]
+        self.hds = [math.log2(x.numerator * x.denominator) for x in self.steps]
+        position = {x: i for i, x in enumerate(self.steps)}
+        self.inverses = [position[1 / x] for x in self.steps]
+        self.max_hd = max(self.hds, default = 0.0)
+        self.max_exponents = [max((abs(d[k]) for d in self.deltas), default = 0) for k in range(len(self.primes))]
+        # The most of two primes' exponents, each scaled by its maximum, that one step covers.
+        self.pair_reach = {}
+        for k in range(len(self.primes)):
+            for m in range(k + 1, len(self.primes)):
+                self.pair_reach[(k, m)] = max(abs(d[k]) * self.max_exponents[m] + abs(d[m]) * self.max_exponents[k]
+                                              for d in self.deltas)
+        self.one_step = {}
+        for delta, hd in zip(self.deltas, self.hds):
+            self.one_step[delta] = min(hd, self.one_step.get(delta, math.inf))
+        self.two_step = {}
+        for i, (a, hd_a) in enumerate(zip(self.deltas, self.hds)):
+            for b, hd_b in zip(self.deltas[i:], self.hds[i:]):
+                delta = tuple(map(operator.add, a, b))
+                if delta not in self.one_step and any(delta):
+                    self.two_step[delta] = min(hd_a + hd_b, self.two_step.get(delta, math.inf))
+
+    def monzo(self, x: fractions.Fraction) -> tuple[int, ...] | None:
+        """Return x as exponents of self.primes, or None if another prime divides it."""
+        exponents = dict.fromkeys(self.primes, 0)
+        for n, sign in ((x.numerator, 1), (x.denominator, -1)):
+            for p, e in LONG_LIST_OF_PRIMES.factors(n):
+                if p not in exponents:
+                    return None
+                exponents[p] += sign * e
+        return tuple(exponents.values())
+
+    def heuristic(self, remaining: tuple[int, ...]) -> tuple[int, float]:
+        """Return lower bounds on the steps and the harmonic distance still needed to cover remaining.
+
+        Beyond two steps, harmonic distance is a norm on the lattice, so a
+        route covers at least the remaining vector's harmonic distance, in
+        at least that divided by the largest step's; and each prime needs at
+        least its remaining exponent over the largest exponent any step has.
+        The same holds for each pair of primes, which is what bounds routes
+        between two primes that no single step joins.
+        """
+        if remaining in self.one_step:
+            return 1, self.one_step[remaining]
+        if remaining in self.two_step:
+            return 2, self.two_step[remaining]
+        if not any(remaining):
+            return 0, 0.0
+        hd = sum(abs(e) * log for e, log in zip(remaining, self.logs))
+        steps = max(3, math.ceil(hd / self.max_hd - 1e-9))
+        present = [k for k, e in enumerate(remaining) if e]
+        maxima = self.max_exponents
+        for a, k in enumerate(present):
+            steps = max(steps, -(-abs(remaining[k]) // maxima[k]))
+            for m in present[a + 1:]:
+                covered = abs(remaining[k]) * maxima[m] + abs(remaining[m]) * maxima[k]
+                steps = max(steps, -(-covered // self.pair_reach[(k, m)]))
+        return steps, hd
+
+
+@lru_cache(maxsize = 8)
+def _step_set(intervals: tuple[fractions.Fraction, ...]) -> _StepSet:
+    return _StepSet(intervals)
+
+
+def _as_ratio(x: Pitch | tuple[int, int] | fractions.Fraction) -> fractions.Fraction:
+    return x.ratio if isinstance(x, Pitch) else as_fraction(x)
+
+
+def tuning_routes(
+        start: Pitch | tuple[int, int] | fractions.Fraction,
+        target: Pitch | tuple[int, int] | fractions.Fraction,
+        ti: list[tuple[int, int]] | TuneableIntervalSet | None = None,
+        n: int = 3,
+        max_steps: int = DEFAULT_MAX_STEPS,
+        max_frontier: int = DEFAULT_MAX_FRONTIER) -> list[TuningRoute]:
+    """Return the n best routes of tuneable intervals from start to target.
+
+    Routes are found by A* search on the just intonation lattice, in monzo
+    space, ranked by number of steps, then total harmonic distance. Tuning
+    the same intervals in another order only changes the pitches passed
+    through, so each set of intervals is searched and returned once, in
+    ascending order of harmonic distance; an interval and its inverse are
+    never both used. The heuristic is exact for routes of up to two steps,
+    from tables of every one- and two-step move cached per interval set,
+    and falls back on Tenney harmonic distance bounds beyond.
+
+    Args:
+        start, target: Pitches, (numerator, denominator) tuples or Fractions.
+        ti: The tuneable intervals, as a list or a TuneableIntervalSet.
+            Defaults to the Sabat-Schweinitz tuneable interval list.
+        n: Number of routes returned. Defaults to 3.
+        max_steps: Longest route searched. Defaults to DEFAULT_MAX_STEPS.
+        max_frontier: Most partial routes held at once. When there are more,
+            the worse half is dropped, so later routes may not be the best.
+            Defaults to DEFAULT_MAX_FRONTIER.
+
+    Returns:
+        Up to n TuningRoute(steps, pitches, hd), best first. Fewer are
+        returned if fewer routes of at most max_steps steps exist, none if
+        target contains a prime no tuneable interval does.
+    """
+    if n < 1:
+        raise ValueError(f"n must be at least 1, got {n}")
+    if max_steps < 0:
+        raise ValueError(f"max_steps must not be negative, got {max_steps}")
+    if max_frontier < 2:
+        raise ValueError(f"max_frontier must be at least 2, got {max_frontier}")
+    if ti is None:
+        ti = TuneableIntervalSet.shared()
+    elif not isinstance(ti, TuneableIntervalSet):
+        ti = TuneableIntervalSet.shared(ti)
+    step_set = _step_set(ti.intervals)
+    start, target = _as_ratio(start), _as_ratio(target)
+    if start <= 0 or target <= 0:
+        raise ValueError("pitches must be positive")
+    goal = step_set.monzo(target / start)
+    if goal is None:
+        return []
+    deltas, hds, inverses = step_set.deltas, step_set.hds, step_set.inverses
+    origin = (0,) * len(goal)
+    steps_needed, hd_needed = step_set.heuristic(goal)
+    # (f steps, f hd, g steps, g hd, tiebreak, node, last step, blocked steps bitset, path as (step, parent))
+    frontier = [(steps_needed, hd_needed, 0, 0.0, 0, origin, 0, 0, None)]
+    expansions = {}
+    counter = 1
+    routes = []
+    while frontier and len(routes) < n:
+        f_steps, _, g_steps, g_hd, _, node, last, blocked, path = heapq.heappop(frontier)
+        if f_steps > max_steps:
+            break
+        if node == goal:
+            indices = []
+            while path is not None:
+                indices.append(path[0])
+                path = path[1]
+            pitches = [start]
+            for i in reversed(indices):
+                pitches.append(pitches[-1] * step_set.steps[i])
+            routes.append(TuningRoute([step_set.steps[i] for i in reversed(indices)], pitches, g_hd))
+            continue
+        # Steps are taken in index order and a step's inverse is blocked once it is
+        # used, so the node, the last step and the blocked steps from it on fix
+        # every continuation: the first n routes popped there have the n best
+        # prefixes, and any route through a later one is beaten by n others.
+        key = (node, last, blocked >> last)
+        if expansions.get(key, 0) >= n:
+            continue
+        expansions[key] = expansions.get(key, 0) + 1
+        for i in range(last, len(deltas)):
+            if blocked >> i & 1:
+                continue
+            child = tuple(map(operator.add, node, deltas[i]))
+            h_steps, h_hd = step_set.heuristic(tuple(map(operator.sub, goal, child)))
+            if g_steps + 1 + h_steps > max_steps:
+                continue
+            heapq.heappush(frontier, (g_steps + 1 + h_steps, g_hd + hds[i] + h_hd, g_steps + 1, g_hd + hds[i],
+                                      counter, child, i, blocked | 1 << inverses[i], (i, path)))
+            counter += 1
+        if len(frontier) > max_frontier:
+            frontier = heapq.nsmallest(max_frontier // 2, frontier)
+    return routes
@@ -1,6 +1,8 @@
 from __future__ import annotations
 import math
+from collections.abc import Iterable, Iterator
 from fractions import Fraction
+from itertools import islice
 
 def tuple_to_fraction(t: tuple[int, int]) -> Fraction:
     f = Fraction(t[0], t[1])
@@ -24,6 +26,12 @@ def flop(lists: list[list]) -> list[list]:
         final.append(col)
     return final
 
+def chunks(items: Iterable, chunk_size: int) -> Iterator[list]:
+    """Yield lists of up to chunk_size consecutive items, reading items lazily."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
 def convert_data_to_readable_string(d: int | float | Fraction, precision: int = 5, prefix: str | None = None, suffix: str | None = None) -> str:
     """Format d as a string, rounding floats to precision decimal places."""
     if isinstance(d, float):
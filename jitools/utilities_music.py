@@ -1,5 +1,9 @@
 from __future__ import annotations
-from math import log2
+import operator
+from fractions import Fraction
+from functools import lru_cache, reduce
+from math import lcm, log2, prod
+from . import prime_list
 
 def cpsmidi(freq: float, ref_freq: float = 440, ref_keynum: float = 69) -> float:
     keynum = ref_keynum + 12 * log2(freq / ref_freq)
@@ -8,3 +12,179 @@ def cpsmidi(freq: float, ref_freq: float = 440, ref_keynum: float = 69) -> float
 def midicps(keynum: float, ref_keynum: float = 69, ref_freq: float = 440) -> float:
     freq = 2**((keynum - ref_keynum) / 12) * ref_freq
     return(freq)
+
+def add_monzos(a: list[int], b: list[int]) -> list[int]:
+    """Return the monzo of the product of two ratios, without trailing zero exponents."""
+    if len(a) < len(b):
+        a, b = b, a
+    monzo = list(a)
+    for i, x in enumerate(b):
+        monzo[i] += x
+    while len(monzo) > 1 and monzo[-1] == 0:
+        monzo.pop()
+    return monzo
+
+@lru_cache(maxsize=None)
+def monzo_primes(length: int) -> tuple[int, ...]:
+    """Return the first length primes, whose exponents a monzo of that length lists."""
+    max_val = 48
+    primes = prime_list.PrimeList(max_val).primes
+    while len(primes) < length:
+        max_val *= 2
+        primes = prime_list.PrimeList(max_val).primes
+    return tuple(primes[:length])
+
+def monzo_bounds(monzos: list[list[int]]) -> tuple[list[int], list[int]]:
+    """Return the element-wise minimum and maximum of monzos, with missing exponents counted as 0.
+
+    For the monzos of several ratios these are the monzos of their greatest
+    common divisor and least common multiple.
+    """
+    length = max(len(m) for m in monzos)
+    columns = list(zip(*(list(m) + [0] * (length - len(m)) for m in monzos)))
+    return [min(c) for c in columns], [max(c) for c in columns]
+
+def monzo_to_integer(monzo: list[int]) -> int:
+    """Return the integer whose prime exponents, all non-negative, are monzo."""
+    return prod(p ** e for p, e in zip(monzo_primes(len(monzo)), monzo) if e)
+
+def monzo_to_ratio(monzo: list[int]) -> Fraction:
+    """Return the ratio whose prime exponents are monzo."""
+    return Fraction(monzo_to_integer([max(e, 0) for e in monzo]),
+                    monzo_to_integer([max(-e, 0) for e in monzo]))
+
+def odd_part(n: int) -> int:
+    """Return n with every factor of 2 removed, the octave-reduced harmonic number of a positive n."""
+    return n >> ((n & -n).bit_length() - 1)
+
+def as_fraction(interval: tuple[int, int] | Fraction | int) -> Fraction:
+    """Return an interval given as a (numerator, denominator) tuple, a Fraction or an integer as a Fraction."""
+    if isinstance(interval, tuple):
+        return Fraction(interval[0], interval[1])
+    return Fraction(interval)
+
+def octave_reduced(ratio: Fraction) -> Fraction:
+    """Return ratio shifted by octaves to lie in [1, 2)."""
+    octaves = ratio.numerator.bit_length() - ratio.denominator.bit_length()
+    if octaves >= 0:
+        ratio = Fraction(ratio.numerator, ratio.denominator << octaves)
+    else:
+        ratio = Fraction(ratio.numerator << -octaves, ratio.denominator)
+    # bit lengths only estimate log2 to within one octave.
+    if ratio < 1:
+        return ratio * 2
+    if ratio >= 2:
+        return ratio / 2
+    return ratio
+
+def common_unit(monzos: list[list[int]]) -> Fraction:
+    """Return the largest ratio of which every pitch with the given monzos is an integer multiple.
+
+    Its monzo is the element-wise minimum of theirs, so no big-integer gcd is needed.
+    """
+    return monzo_to_ratio(monzo_bounds(monzos)[0])
+
+def multiples_of_common_unit(ratios: list[Fraction], monzos: list[list[int]]) -> list[int]:
+    """Return each pitch as an integer multiple of the pitches' common unit."""
+    unit = common_unit(monzos)
+    return [(x.numerator * (unit.denominator // x.denominator)) // unit.numerator for x in ratios]
+
+# Components whose harmonics repeat within this many integers are counted
+# directly over one period instead of being split further.
+_MAX_SIEVE_PERIOD = 1 << 20
+
+def _antichain(harmonics) -> frozenset[int]:
+    """Drop every harmonic that is a multiple of another; its multiples are already covered."""
+    harmonics = set(harmonics)
+    return frozenset(h for h in harmonics if not any(h % other == 0 and h != other for other in harmonics))
+
+def uncovered_density(harmonics: list[int], primes: list[int]) -> Fraction:
+    """Return the exact density of positive integers divisible by none of the harmonics.
+
+    The harmonics are first split into groups with no prime factor in common,
+    whose densities multiply because divisibility by coprime moduli is
+    independent. A group is then either counted directly over one period,
+    lcm(group), when that is at most _MAX_SIEVE_PERIOD, or split further by
+    conditioning on the exponent k of its most widely shared prime p: an integer
+    with exactly p^k is divisible by h only if h has at most k factors of p, and
+    then only through h with its p part removed. The result equals the
+    2^n-term inclusion-exclusion sum but stays cheap for large spectral chords,
+    where the recursion quickly reaches groups of coprime harmonics.
+
+    Args:
+        harmonics: Positive integers.
+        primes: Every prime that divides any of the harmonics.
+    """
+    factorizations = {}
+
+    def factorize(h: int) -> dict[int, int]:
+        if h not in factorizations:
+            exponents, rest = {}, h
+            for p in primes:
+                while rest % p == 0:
+                    exponents[p] = exponents.get(p, 0) + 1
+                    rest //= p
+            if rest > 1:
+                exponents[rest] = 1
+            factorizations[h] = exponents
+        return factorizations[h]
+
+    memo = {}
+
+    def density(group: frozenset[int]) -> Fraction:
+        if 1 in group:
+            return Fraction(0)
+        if not group:
+            return Fraction(1)
+        if group in memo:
+            return memo[group]
+        components = _coprime_components(group, factorize)
+        if len(components) > 1:
+            result = reduce(operator.mul, (density(c) for c in components))
+        elif len(group) == 1:
+            result = 1 - Fraction(1, next(iter(group)))
+        elif (period := lcm(*group)) <= _MAX_SIEVE_PERIOD:
+            covered = bytearray(period)
+            for h in group:
+                covered[::h] = b"\x01" * (period // h)
+            result = Fraction(period - covered.count(1), period)
+        else:
+            shared = {}
+            for h in group:
+                for p in factorize(h):
+                    shared[p] = shared.get(p, 0) + 1
+            p = min(shared, key=lambda q: (-shared[q], q))
+            max_exponent = max(factorize(h).get(p, 0) for h in group)
+            result = Fraction(0)
+            for k in range(max_exponent + 1):
+                weight = (Fraction(1, p ** k) if k == max_exponent
+                          else Fraction(p - 1, p ** (k + 1)))
+                reduced = _antichain(h // p ** factorize(h).get(p, 0)
+                                     for h in group if factorize(h).get(p, 0) <= k)
+                result += weight * density(reduced)
+        memo[group] = result
+        return result
+
+    return density(_antichain(harmonics))
+
+def _coprime_components(harmonics: frozenset[int], factorize) -> list[frozenset[int]]:
+    """Group harmonics into connected components of the shares-a-prime-factor relation."""
+    parent = {h: h for h in harmonics}
+
+    def find(h: int) -> int:
+        while parent[h] != h:
+            parent[h] = parent[parent[h]]
+            h = parent[h]
+        return h
+
+    owner = {}
+    for h in harmonics:
+        for p in factorize(h):
+            if p in owner:
+                parent[find(h)] = find(owner[p])
+            else:
+                owner[p] = h
+    components = {}
+    for h in harmonics:
+        components.setdefault(find(h), set()).add(h)
+    return [frozenset(c) for c in components.values()]
@@ -7,29 +7,94 @@ accidental characters, sorted by pitch class height in cents.
 
 Run from the project root:
     python3 scripts/generate_lookup_table.py
+
+Large builds can be spread over several machines. Each invocation with
+--shard i/N (0 <= i < N) processes a deterministic slice of the templates and
+writes a partial table; the merge subcommand then combines the partial tables
+into the final table:
+    python3 scripts/generate_lookup_table.py --shard 0/2 --output part0.csv
+    python3 scripts/generate_lookup_table.py --shard 1/2 --output part1.csv
+    python3 scripts/generate_lookup_table.py merge part0.csv part1.csv
 """
 from __future__ import annotations
+import argparse
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from jitools import generate_enharmonic_lookup_table
+from jitools import generate_enharmonic_lookup_table, merge_lookup_tables
 from jitools.constants import RESOURCES_DIRECTORY
 
 MAX_SYMBOLS = 3
 MAX_PRIME_3 = 70
 MAX_PRIME_5 = 4
+DEFAULT_OUTPUT_PATH = os.path.join(RESOURCES_DIRECTORY, "enharmonic_lookup_table.csv")
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    try:
+        index, count = (int(x) for x in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must satisfy 0 <= i < N, got {value!r}")
+    return index, count
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate the enharmonic lookup table.")
+    parser.add_argument("--shard", type=parse_shard, default=None,
+                        help="process only shard i of N (0-based), e.g. 0/4")
+    parser.add_argument("--output", default=None,
+                        help="output CSV path (default: the bundled table, or "
+                             "enharmonic_lookup_table.shard-i-of-N.csv when sharding)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: cpu_count - 1)")
+    parser.add_argument("--work-dir", default=None,
+                        help="checkpoint directory for resumable generation")
+    parser.add_argument("--audit", default=None,
+                        help="write a collision audit report to this CSV path")
+    parser.add_argument("--max-symbols", type=int, default=MAX_SYMBOLS)
+    parser.add_argument("--max-prime-3", type=int, default=MAX_PRIME_3)
+    parser.add_argument("--max-prime-5", type=int, default=MAX_PRIME_5)
+    subparsers = parser.add_subparsers(dest="command")
+    merge_parser = subparsers.add_parser("merge", help="merge partial tables from sharded runs")
+    merge_parser.add_argument("partials", nargs="+", help="partial table CSVs")
+    merge_parser.add_argument("--output", dest="merge_output", default=DEFAULT_OUTPUT_PATH,
+                              help="merged output CSV path (default: the bundled table)")
+    merge_parser.add_argument("--audit", dest="merge_audit", default=None,
+                              help="write a collision audit report to this CSV path")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    output_path = os.path.join(RESOURCES_DIRECTORY, "enharmonic_lookup_table.csv")
+    args = parse_args()
+    if args.command == "merge":
+        print(f"Merging {len(args.partials)} partial tables...")
+        results = merge_lookup_tables(
+            args.partials, output_path=args.merge_output, verbose=True, audit_path=args.merge_audit)
+        print(f"Done: {len(results):,} entries.")
+        print(f"Written to {args.merge_output}")
+        sys.exit(0)
+
+    output_path = args.output
+    if output_path is None:
+        if args.shard is None:
+            output_path = DEFAULT_OUTPUT_PATH
+        else:
+            output_path = f"enharmonic_lookup_table.shard-{args.shard[0]}-of-{args.shard[1]}.csv"
     print(f"Generating lookup table "
-          f"(MAX_SYMBOLS={MAX_SYMBOLS}, "
-          f"prime-3 range ±{MAX_PRIME_3}, prime-5 range ±{MAX_PRIME_5})...")
+          f"(MAX_SYMBOLS={args.max_symbols}, "
+          f"prime-3 range ±{args.max_prime_3}, prime-5 range ±{args.max_prime_5})...")
     results = generate_enharmonic_lookup_table(
-        max_symbols=MAX_SYMBOLS,
-        max_prime_3=MAX_PRIME_3,
-        max_prime_5=MAX_PRIME_5,
+        max_symbols=args.max_symbols,
+        max_prime_3=args.max_prime_3,
+        max_prime_5=args.max_prime_5,
         output_path=output_path,
-        verbose=True)
+        workers=args.workers,
+        verbose=True,
+        work_dir=args.work_dir,
+        shard=args.shard,
+        audit_path=args.audit)
     print(f"Done: {len(results):,} entries.")
     print(f"Written to {output_path}")
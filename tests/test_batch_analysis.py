@@ -0,0 +1,65 @@
+import fractions
+from itertools import count, islice
+import pytest
+from jitools import PitchCollection
+from jitools.batch_analysis import DEFAULT_FIELDS, analyze_collections, available_fields
+
+CHORDS = [[(1, 1), (5, 4), (3, 2)], [(4, 3), (5, 3), (2, 1)], [(1, 1), (7, 6), (7, 4)],
+          [(8, 7), (10, 7), (12, 7), (2, 1)], [(1, 1), (11, 8)]]
+
+
+def expected_records(chords, fields=DEFAULT_FIELDS, **kwargs):
+    records = []
+    for pc in chords:
+        collection = PitchCollection(pc=pc, **kwargs)
+        records.append(tuple(getattr(collection, name) for name in fields))
+    return records
+
+
+# ── results ───────────────────────────────────────────────────────────────────
+
+class TestAnalyzeCollections:
+    def test_serial_matches_pitch_collection(self):
+        assert list(analyze_collections(CHORDS, workers=1)) == expected_records(CHORDS)
+
+    def test_parallel_preserves_input_order(self):
+        records = list(analyze_collections(CHORDS * 3, workers=2, chunk_size=2))
+        assert records == expected_records(CHORDS * 3)
+
+    def test_only_requested_fields_in_given_order(self):
+        fields = ["hd_sum", "difference_tones"]
+        records = list(analyze_collections(CHORDS, workers=1, fields=fields))
+        assert records == expected_records(CHORDS, fields)
+        assert all(len(record) == 2 for record in records)
+
+    def test_collection_options_are_passed_on(self):
+        records = list(analyze_collections(CHORDS, workers=1, fields=["tuneable_intervals"], ti=[(3, 2)]))
+        assert records[0] == ([fractions.Fraction(3, 2)],)
+
+    def test_input_is_read_lazily(self):
+        chords = ([(1, 1), (n, n - 1)] for n in count(3))
+        records = list(islice(analyze_collections(chords, workers=1, fields=["ratios"], chunk_size=4), 5))
+        assert records[-1] == ([fractions.Fraction(1), fractions.Fraction(7, 6)],)
+
+
+# ── validation ────────────────────────────────────────────────────────────────
+
+class TestValidation:
+    def test_unknown_field_raises_immediately(self):
+        with pytest.raises(ValueError):
+            analyze_collections(CHORDS, workers=1, fields=["ratios", "no_such_field"])
+
+    def test_methods_are_not_fields(self):
+        assert "ratios" in available_fields()
+        assert "print_info" not in available_fields()
+
+    @pytest.mark.parametrize("kwargs", [{"workers": 0}, {"chunk_size": 0}])
+    def test_invalid_sizes(self, kwargs):
+        with pytest.raises(ValueError):
+            analyze_collections(CHORDS, **kwargs)
+
+    def test_invalid_chord_raises_when_reached(self):
+        records = analyze_collections([[(1, 1), (3, 2)], [(1, 1)]], workers=1, chunk_size=1)
+        assert next(records)
+        with pytest.raises(ValueError):
+            next(records)
@@ -0,0 +1,114 @@
+import fractions
+import random
+import pytest
+from jitools import ChordIndex, PitchCollection, chord_index
+from jitools.chord_index import fingerprint
+
+F = fractions.Fraction
+SCALE = sorted({F(h, 16) for h in range(16, 32)} | {F(32, h) for h in range(17, 32)})
+
+
+def random_chords(count, seed=0):
+    rng = random.Random(seed)
+    return [[x * 2 ** rng.randint(0, 1) for x in rng.sample(SCALE, rng.randint(2, 6))] for _ in range(count)]
+
+
+# ── fingerprints and dedupe ───────────────────────────────────────────────────
+
+class TestFingerprint:
+    def test_major_triad_in_any_voicing_and_transposition(self):
+        assert fingerprint([(4, 4), (5, 4), (6, 4)]) == (1, 3, 5)
+        assert fingerprint([F(3, 2), F(15, 4), F(9, 16)]) == (1, 3, 5)
+        assert fingerprint(PitchCollection([(1, 1), (6, 5), (3, 2)])) == (3, 5, 15)
+
+    def test_transpositions_share_an_id(self):
+        index = ChordIndex()
+        a = index.add([F(1), F(5, 4), F(3, 2)])
+        b = index.add([F(7, 4), F(35, 16), F(21, 8)])
+        assert a == b and len(index) == 1
+        assert index.chords[a] == (F(1), F(5, 4), F(3, 2))
+        assert [F(4), F(5), F(6)] in index and [F(1), F(6, 5)] not in index
+        assert index.find([F(1), F(6, 5)]) is None
+
+    def test_empty_chord_raises(self):
+        with pytest.raises(ValueError):
+            fingerprint([])
+
+
+# ── similarity search ─────────────────────────────────────────────────────────
+
+class TestNearest:
+    def test_default_search_is_exact(self):
+        index = ChordIndex(random_chords(300))
+        query = random_chords(1, seed=1)[0]
+        query_id = index.add(query)
+        matches = index.nearest(query, n=20)
+        assert matches[0].id == query_id and matches[0].similarity == pytest.approx(1.0)
+        expected = sorted((index.similarity(query_id, i) for i in range(len(index))), reverse=True)[:20]
+        assert [m.similarity for m in matches] == pytest.approx(expected)
+
+    @pytest.mark.parametrize("weights", [None, {"primes": 2.0, "hd_profile": 0}, {"harmonics": 3.0}])
+    @pytest.mark.parametrize("seed_postings", [100, 5000])
+    def test_matches_exhaustive_scoring(self, weights, seed_postings, monkeypatch):
+        monkeypatch.setattr(chord_index, "_SEED_POSTINGS", seed_postings)
+        index = ChordIndex(random_chords(2000) + [[F(1)], [F(1), F(2)], [F(1), F(3, 2)]], weights=weights)
+        for query in random_chords(10, seed=5) + [[F(1)], [F(1), F(9, 8)]]:
+            query_id = index.add(query)
+            similarities = [index.similarity(query_id, i) for i in range(len(index))]
+            ranked = sorted((i for i in range(len(index)) if similarities[i] > 0), key=lambda i: (-similarities[i], i))
+            for n in (1, 10, 50):
+                assert [m.id for m in index.nearest(query, n=n)] == ranked[:n]
+
+    def test_common_features_are_left_unread(self, monkeypatch):
+        monkeypatch.setattr(chord_index, "_SEED_POSTINGS", 500)
+        index = ChordIndex(random_chords(2000))
+        read = []
+        accumulate = index._accumulate
+        monkeypatch.setattr(index, "_accumulate", lambda partial, t, w: (read.append(t), accumulate(partial, t, w)))
+        query = random_chords(1, seed=6)[0]
+        index.nearest(query)
+        features = [index._token_ids[t] for t in chord_index._features(fingerprint(query), index.weights)
+                    if t in index._token_ids]
+        assert sum(len(index._postings[t]) for t in read) < sum(len(index._postings[t]) for t in features) / 2
+
+    def test_similarity_is_symmetric(self):
+        index = ChordIndex(random_chords(20))
+        for a in range(5):
+            for b in range(5):
+                assert index.similarity(a, b) == pytest.approx(index.similarity(b, a))
+                assert 0.0 <= index.similarity(a, b) <= 1.0 + 1e-12
+
+    def test_feature_weights(self):
+        chords = [[F(1), F(3, 2)], [F(1), F(9, 8)], [F(1), F(5, 4)]]
+        index = ChordIndex(chords, weights={"interval_classes": 0, "harmonics": 0, "hd_profile": 0})
+        assert index.similarity(0, 1) == pytest.approx(1.0)
+        assert index.similarity(0, 2) == 0.0
+        with pytest.raises(ValueError):
+            ChordIndex(weights={"roughness": 1.0})
+        with pytest.raises(ValueError):
+            ChordIndex(weights={name: 0 for name in ("interval_classes", "harmonics", "primes", "hd_profile")})
+
+
+# ── bulk build and persistence ────────────────────────────────────────────────
+
+class TestBuild:
+    def test_bulk_build_matches_incremental_adds(self):
+        chords = random_chords(200)
+        bulk = ChordIndex(chords, workers=2)
+        incremental = ChordIndex()
+        ids = [incremental.add(chord) for chord in chords]
+        assert ids == ChordIndex().add_many(chords, chunk_size=7)
+        assert bulk.chords == incremental.chords
+        assert bulk.nearest(chords[0]) == incremental.nearest(chords[0])
+
+    def test_save_and_load(self, tmp_path):
+        index = ChordIndex(random_chords(100), weights={"primes": 2.0})
+        path = str(tmp_path / "chords.idx")
+        index.save(path)
+        loaded = ChordIndex.load(path)
+        assert loaded.weights == index.weights and loaded.chords == index.chords
+        query = random_chords(1, seed=3)[0]
+        assert loaded.nearest(query) == index.nearest(query)
+        new = random_chords(10, seed=4)
+        assert loaded.add_many(new) == index.add_many(new)
+        assert loaded.nearest(new[0]) == index.nearest(new[0])
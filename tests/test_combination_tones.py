@@ -0,0 +1,103 @@
+import fractions
+import math
+import random
+from itertools import combinations
+import pytest
+from jitools import CombinationTone, PitchCollection
+from jitools.combination_tones import combination_tones, tuneable_partners
+
+F = fractions.Fraction
+
+
+def brute_force(harmonics, max_order, max_coefficient, low, high):
+    orders = {}
+    for a, b in combinations(harmonics, 2):
+        for m in range(1, max_coefficient + 1):
+            for n in range(1, max_coefficient + 1):
+                if m + n > max_order:
+                    continue
+                for tone in (m * a + n * b, abs(m * a - n * b)):
+                    if tone > 0 and low <= tone <= high:
+                        orders[tone] = min(orders.get(tone, max_order), m + n)
+    return orders
+
+
+# ── integer engine ────────────────────────────────────────────────────────────
+
+class TestEngine:
+    def test_first_generation_matches_brute_force(self):
+        rng = random.Random(0)
+        for _ in range(25):
+            harmonics = rng.sample(range(1, 60), rng.randint(2, 7))
+            max_order = rng.randint(2, 5)
+            max_coefficient = rng.randint(1, max_order - 1)
+            low, high = rng.choice([(1, math.inf), (10, 100)])
+            tones = combination_tones(harmonics, max_order, max_coefficient, low=low, high=high)
+            assert {t: order for t, (order, _) in tones.items()} == brute_force(
+                harmonics, max_order, max_coefficient, low, high)
+
+    def test_terms_produce_the_tone_at_its_order(self):
+        tones = combination_tones([8, 11, 13], max_order=5, generations=None, high=200)
+        for tone, (order, ((m, a), (n, b))) in tones.items():
+            assert m * a + n * b == tone
+            assert m > 0 and n != 0
+
+    def test_later_generations_combine_tones(self):
+        first = combination_tones([5, 8], max_order=4)
+        second = combination_tones([5, 8], max_order=4, generations=2)
+        assert set(first) < set(second)
+        for tone in set(second) - set(first):
+            order, ((m, a), (n, b)) = second[tone]
+            assert {a, b} - {5, 8}
+            assert order == abs(m) * (first[a][0] if a in first else 1) + abs(n) * (first[b][0] if b in first else 1)
+
+    def test_pruned_tones_do_not_seed_later_generations(self):
+        tones = combination_tones([10, 13], max_order=4, generations=None, low=5)
+        assert 3 not in tones and 3 in combination_tones([10, 13], max_order=4)
+        assert all(b != 3 for _, ((_, _), (_, b)) in tones.values())
+
+    def test_invalid_arguments_raise(self):
+        with pytest.raises(ValueError):
+            combination_tones([1, 2], max_order=1)
+        with pytest.raises(ValueError):
+            combination_tones([1, 2], max_coefficient=0)
+        with pytest.raises(ValueError):
+            combination_tones([1, 2], generations=0)
+
+    def test_tuneable_partners(self):
+        assert tuneable_partners([4, 6], frozenset({(3, 2), (2, 1)})) == {2: [4], 3: [6], 4: [6]}
+
+
+# ── PitchCollection.combination_tones ─────────────────────────────────────────
+
+class TestPitchCollection:
+    PITCHES = [(1, 1), (5, 4), (3, 2), (7, 4)]
+
+    def test_second_order_tones_are_difference_and_summation_tones(self):
+        col = PitchCollection(self.PITCHES)
+        tones = col.combination_tones(max_order=2, floor=None, ceiling=None)
+        assert [t.ratio for t in tones] == sorted(set(col.difference_tones) | set(col.summation_tones))
+        tuneable = {t.ratio for t in tones if t.tuneable_with}
+        assert set(col.tuneable_difference_tones) | set(col.tuneable_summation_tones) == tuneable
+
+    def test_cubic_difference_tone(self):
+        col = PitchCollection(self.PITCHES)
+        by_ratio = {t.ratio: t for t in col.combination_tones()}
+        tone = by_ratio[2 * F(5, 4) - F(3, 2)]
+        assert tone.order == 3
+        assert tone.freq == pytest.approx(440.0)
+        assert sum(c * r for c, r in tone.terms) == tone.ratio
+        assert isinstance(tone, CombinationTone)
+
+    def test_frequency_floor_and_ceiling(self):
+        col = PitchCollection(self.PITCHES)
+        tones = col.combination_tones(max_order=4, floor=200.0, ceiling=1000.0)
+        assert tones and all(200.0 <= t.freq <= 1000.0 for t in tones)
+        everything = col.combination_tones(max_order=4, floor=None, ceiling=None)
+        assert [t for t in everything if 200.0 <= t.freq <= 1000.0] == tones
+
+    def test_thirty_six_pitch_chord(self):
+        chord = [F(h, 16) for h in range(16, 80, 2)] + [F(7, 5), F(11, 7), F(13, 11), F(17, 9)]
+        tones = PitchCollection(chord).combination_tones(max_order=5)
+        assert len({t.ratio for t in tones}) == len(tones)
+        assert all(t.order <= 5 for t in tones)
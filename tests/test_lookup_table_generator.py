@@ -0,0 +1,252 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from jitools.lookup_table_generator import (
+    MANIFEST_FILENAME,
+    _max_num_symbols,
+    _merge_rows,
+    build_templates,
+    find_collisions,
+    generate_enharmonic_lookup_table,
+    merge_lookup_tables,
+    shard_bounds,
+)
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "scripts", "generate_lookup_table.py")
+
+
+def generate(tmp_path, name, **kwargs):
+    params = dict(max_symbols=2, max_prime_3=6, max_prime_5=1, workers=1, verbose=False)
+    params.update(kwargs)
+    output_path = tmp_path / name
+    results = generate_enharmonic_lookup_table(output_path=str(output_path), **params)
+    return results, output_path.read_bytes()
+
+
+# ── basic generation ──────────────────────────────────────────────────────────
+
+class TestGenerate:
+    def test_sorted_by_pitch_class(self, tmp_path):
+        results, _ = generate(tmp_path, "table.csv")
+        pcs = [pc for _, pc in results]
+        assert pcs == sorted(pcs)
+
+    def test_unison_is_first_entry(self, tmp_path):
+        results, _ = generate(tmp_path, "table.csv")
+        assert results[0] == ([0], 0.0)
+
+    def test_templates_grow_with_symbols(self):
+        assert len(build_templates(1)) < len(build_templates(2))
+
+
+# ── checkpointing ─────────────────────────────────────────────────────────────
+
+class TestCheckpoint:
+    def test_checkpointed_run_matches_plain_run(self, tmp_path):
+        plain, plain_bytes = generate(tmp_path, "plain.csv")
+        checkpointed, checkpointed_bytes = generate(
+            tmp_path, "checkpointed.csv", work_dir=str(tmp_path / "work"))
+        assert checkpointed == plain
+        assert checkpointed_bytes == plain_bytes
+
+    def test_manifest_records_every_chunk(self, tmp_path):
+        work_dir = tmp_path / "work"
+        generate(tmp_path, "table.csv", work_dir=str(work_dir))
+        manifest = json.loads((work_dir / MANIFEST_FILENAME).read_text())
+        assert manifest["parameters"]["max_prime_3"] == 6
+        assert len(manifest["chunks"]) == len(list(work_dir.glob("chunk_*.csv")))
+
+    def test_resume_after_interruption_is_byte_identical(self, tmp_path):
+        work_dir = tmp_path / "work"
+        _, expected = generate(tmp_path, "full.csv", work_dir=str(work_dir))
+        # Simulate a run killed part-way: drop half the recorded chunks.
+        manifest_path = work_dir / MANIFEST_FILENAME
+        manifest = json.loads(manifest_path.read_text())
+        for index in list(manifest["chunks"])[::2]:
+            del manifest["chunks"][index]
+            (work_dir / f"chunk_{int(index):05d}.csv").unlink()
+        manifest_path.write_text(json.dumps(manifest))
+        _, resumed = generate(tmp_path, "resumed.csv", work_dir=str(work_dir))
+        assert resumed == expected
+
+    def test_corrupted_chunk_is_recomputed(self, tmp_path):
+        work_dir = tmp_path / "work"
+        _, expected = generate(tmp_path, "full.csv", work_dir=str(work_dir))
+        chunk_path = sorted(work_dir.glob("chunk_*.csv"))[0]
+        chunk_path.write_text('"[0]",123.0\n')
+        _, resumed = generate(tmp_path, "resumed.csv", work_dir=str(work_dir))
+        assert resumed == expected
+
+    def test_resume_reports_progress(self, tmp_path, capsys):
+        work_dir = tmp_path / "work"
+        generate(tmp_path, "first.csv", work_dir=str(work_dir))
+        generate(tmp_path, "second.csv", work_dir=str(work_dir), verbose=True)
+        assert "resuming" in capsys.readouterr().out
+
+    def test_mismatched_parameters_raise(self, tmp_path):
+        work_dir = tmp_path / "work"
+        generate(tmp_path, "table.csv", work_dir=str(work_dir))
+        with pytest.raises(ValueError):
+            generate(tmp_path, "other.csv", work_dir=str(work_dir), max_prime_3=7)
+
+
+# ── sharding and merging ──────────────────────────────────────────────────────
+
+class TestSharding:
+    def test_shard_bounds_cover_items_in_order(self):
+        bounds = [shard_bounds(27, (i, 4)) for i in range(4)]
+        assert bounds[0][0] == 0 and bounds[-1][1] == 27
+        assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+
+    @pytest.mark.parametrize("shard", [(4, 4), (-1, 4), (0, 0)])
+    def test_invalid_shard_raises(self, shard):
+        with pytest.raises(ValueError):
+            shard_bounds(27, shard)
+
+    def test_merged_shards_match_unsharded_run(self, tmp_path):
+        full, full_bytes = generate(tmp_path, "full.csv")
+        partials = [generate(tmp_path, f"part{i}.csv", shard=(i, 3))[0] for i in range(3)]
+        merged = merge_lookup_tables(
+            partials, output_path=str(tmp_path / "merged.csv"), verbose=False)
+        assert merged == full
+        assert (tmp_path / "merged.csv").read_bytes() == full_bytes
+
+    def test_merge_accepts_paths(self, tmp_path):
+        full, _ = generate(tmp_path, "full.csv")
+        for i in range(2):
+            generate(tmp_path, f"part{i}.csv", shard=(i, 2))
+        merged = merge_lookup_tables(
+            [str(tmp_path / f"part{i}.csv") for i in range(2)],
+            output_path=str(tmp_path / "merged.csv"), verbose=False)
+        assert merged == full
+
+    def test_script_shards_as_separate_processes(self, tmp_path):
+        _, full_bytes = generate(tmp_path, "full.csv")
+        small = ["--max-symbols", "2", "--max-prime-3", "6", "--max-prime-5", "1", "--workers", "1"]
+        procs = [
+            subprocess.Popen(
+                [sys.executable, SCRIPT, "--shard", f"{i}/3",
+                 "--output", str(tmp_path / f"part{i}.csv")] + small,
+                stdout=subprocess.DEVNULL)
+            for i in range(3)
+        ]
+        assert all(p.wait() == 0 for p in procs)
+        subprocess.run(
+            [sys.executable, SCRIPT, "merge"]
+            + [str(tmp_path / f"part{i}.csv") for i in range(3)]
+            + ["--output", str(tmp_path / "merged.csv")],
+            check=True, stdout=subprocess.DEVNULL)
+        assert (tmp_path / "merged.csv").read_bytes() == full_bytes
+
+
+# ── incremental extension ─────────────────────────────────────────────────────
+
+class TestExtension:
+    @pytest.mark.parametrize("base,extended", [
+        (dict(max_symbols=2, max_prime_3=4, max_prime_5=1), dict(max_symbols=2, max_prime_3=6, max_prime_5=1)),
+        (dict(max_symbols=2, max_prime_3=6, max_prime_5=0), dict(max_symbols=2, max_prime_3=6, max_prime_5=1)),
+        (dict(max_symbols=1, max_prime_3=20, max_prime_5=1), dict(max_symbols=2, max_prime_3=20, max_prime_5=1)),
+        (dict(max_symbols=2, max_prime_3=2, max_prime_5=0), dict(max_symbols=3, max_prime_3=3, max_prime_5=1)),
+    ])
+    def test_extension_matches_full_regeneration(self, tmp_path, base, extended):
+        base_table, _ = generate(tmp_path, "base.csv", **base)
+        full, full_bytes = generate(tmp_path, "full.csv", **extended)
+        result, result_bytes = generate(
+            tmp_path, "extended.csv", base_table=base_table, base_params=base, **extended)
+        assert result == full
+        assert result_bytes == full_bytes
+
+    def test_extension_accepts_path(self, tmp_path):
+        base = dict(max_symbols=2, max_prime_3=4, max_prime_5=1)
+        generate(tmp_path, "base.csv", **base)
+        full, _ = generate(tmp_path, "full.csv")
+        result, _ = generate(
+            tmp_path, "extended.csv", base_table=str(tmp_path / "base.csv"), base_params=base)
+        assert result == full
+
+    def test_lowering_bounds_raises(self, tmp_path):
+        base = dict(max_symbols=2, max_prime_3=8, max_prime_5=1)
+        base_table, _ = generate(tmp_path, "base.csv", **base)
+        with pytest.raises(ValueError):
+            generate(tmp_path, "extended.csv", base_table=base_table, base_params=base)
+
+    def test_base_table_requires_params(self, tmp_path):
+        base_table, _ = generate(tmp_path, "base.csv")
+        with pytest.raises(ValueError):
+            generate(tmp_path, "extended.csv", base_table=base_table)
+
+    def test_symbol_bound_is_never_below_actual_count(self):
+        from jitools import Pitch
+        for exp7, hi in build_templates(2)[::7]:
+            for exp5 in (-4, 0, 3):
+                for exp3 in range(-40, 41, 3):
+                    monzo = [0] * 15
+                    monzo[1:4] = [exp3, exp5, exp7]
+                    for idx, exp in hi:
+                        monzo[4 + idx] = exp
+                    p = Pitch(p=monzo)
+                    if p.accidental_string != "undefined":
+                        assert p.num_symbols <= _max_num_symbols(exp7, hi, exp5, exp3)
+
+
+# ── dedupe, canonical ordering and auditing ───────────────────────────────────
+
+class TestDedupe:
+    def test_byte_identical_across_worker_counts(self, tmp_path):
+        _, serial = generate(tmp_path, "serial.csv", workers=1)
+        _, parallel = generate(tmp_path, "parallel.csv", workers=3)
+        assert parallel == serial
+
+    def test_overlapping_rows_are_kept_once(self):
+        fifth, third = ([0, 1], 701.9550008653874), ([0, 0, 1], 386.3137138648348)
+        duplicates = []
+        merged = _merge_rows([[fifth, third], [third], [fifth]], duplicates)
+        assert merged == [third, fifth]
+        assert duplicates == [(third, third), (fifth, fifth)]
+        assert _merge_rows([[third], [fifth], [fifth, third]]) == merged
+
+    def test_merge_is_order_independent(self, tmp_path):
+        full, _ = generate(tmp_path, "full.csv")
+        partials = [generate(tmp_path, f"part{i}.csv", shard=(i, 3))[0] for i in range(3)]
+        merged = merge_lookup_tables(
+            partials[::-1], output_path=str(tmp_path / "merged.csv"), verbose=False)
+        assert merged == full
+
+    def test_entries_are_unique_normalized_monzos(self, tmp_path):
+        results, _ = generate(tmp_path, "table.csv")
+        assert len({tuple(monzo) for monzo, _ in results}) == len(results)
+
+    def test_overlapping_partials_are_deduplicated(self, tmp_path):
+        full, _ = generate(tmp_path, "full.csv")
+        merged = merge_lookup_tables(
+            [full, full[::2]], output_path=str(tmp_path / "merged.csv"), verbose=False)
+        assert merged == full
+
+    def test_near_coincident_pitch_classes_are_kept(self, tmp_path):
+        a, b = ([0, 1], 701.9550008653874), ([-1, 0, 0, 1], 701.9550008653878)
+        merged = merge_lookup_tables([[b], [a]], output_path=str(tmp_path / "m.csv"), verbose=False)
+        assert merged == [a, b]
+        assert find_collisions(merged) == [(a, b)]
+
+    def test_near_collision_across_the_octave(self):
+        low, middle, high = ([3, -2], 1e-7), ([0, 1], 701.955), ([-3, 2], 1199.9999999)
+        assert find_collisions([low, middle, high]) == [(high, low)]
+        assert find_collisions([low, middle]) == []
+        assert find_collisions([low, high]) == [(high, low)]
+
+    def test_audit_report(self, tmp_path):
+        a, b = ([0, 1], 701.9550008653874), ([-1, 0, 0, 1], 701.9550008653878)
+        audit_path = tmp_path / "audit.csv"
+        merge_lookup_tables([[a, b], [a]], output_path=str(tmp_path / "m.csv"),
+                            verbose=False, audit_path=str(audit_path))
+        lines = audit_path.read_text().splitlines()
+        assert lines[0].startswith("kind,")
+        assert sum(line.startswith("near collision") for line in lines) == 1
+        assert sum(line.startswith("duplicate") for line in lines) == 1
+
+    def test_generate_writes_audit_report(self, tmp_path):
+        generate(tmp_path, "table.csv", audit_path=str(tmp_path / "audit.csv"))
+        assert (tmp_path / "audit.csv").read_text().startswith("kind,")
@@ -315,6 +315,34 @@ class TestUpdateAndTranspose:
         assert p.reference_pitch == "A4"
         assert p.reference_freq == 440.0
 
+    @pytest.mark.parametrize("start,interval", [
+        ((3, 2), (4, 3)),
+        ((7, 5), (5, 7)),
+        ((11, 9), (53, 32)),
+        ((59, 57), (57, 59)),
+    ])
+    def test_transpose_matches_fresh_pitch(self, start, interval):
+        p = Pitch(p=start, rp="C4", rf=261.6)
+        p.transpose(interval)
+        expected = Pitch(p=fractions.Fraction(*start) * fractions.Fraction(*interval), rp="C4", rf=261.6)
+        assert vars(p) == vars(expected)
+
+    def test_reference_update_matches_fresh_pitch(self):
+        p = Pitch(p=(13, 7))
+        p.update(rp="Bb3", rf=233.0, precision=2)
+        assert vars(p) == vars(Pitch(p=(13, 7), rp="Bb3", rf=233.0, precision=2))
+
+    def test_reference_update_rejects_invalid_reference(self):
+        p = Pitch(p=(3, 2))
+        with pytest.raises(ValueError):
+            p.update(rp="H4")
+        with pytest.raises(ValueError):
+            p.update(rf=-1.0)
+
+    def test_monzo_input_beyond_default_primes_normalizes(self):
+        # 53 lies beyond the default 47-limit monzo primes
+        assert Pitch(p=Pitch(p=(53, 1)).monzo).normalized_monzo == Pitch(p=(53, 1)).normalized_monzo
+
 
 # ── notation: accidental strings ─────────────────────────────────────────────
 # Expected values derived by tracing _notation() for each ratio with rp="A4"
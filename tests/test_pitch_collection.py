@@ -1,7 +1,10 @@
 import fractions
 import math
+import random
 import pytest
-from jitools.pitch_collection import PitchCollection
+from itertools import combinations
+from jitools import pitch_collection, utilities_music
+from jitools.pitch_collection import PitchCollection, _sorted_by_value
 
 
 def make_pc(ratios, **kwargs):
@@ -83,6 +86,35 @@ class TestResultantTones:
         for r in col.ratios:
             assert r in combined
 
+    def test_resultant_tones_match_fraction_arithmetic(self):
+        # mixed denominators exercise the common-denominator integer engine
+        ratios = [(1, 1), (9, 8), (6, 5), (11, 8), (3, 2), (13, 7), (7, 4), (15, 4)]
+        col = make_pc(ratios)
+        pitches = sorted(fractions.Fraction(*r) for r in ratios)
+        pairs = [(a, b) for i, a in enumerate(pitches) for b in pitches[:i]]
+        assert col.difference_tones == sorted({a - b for a, b in pairs})
+        assert col.summation_tones == sorted({a + b for a, b in pairs})
+        tuneable = set(col.allowed_tuneable_intervals)
+        for tones, split, split_pairs in [
+                (col.difference_tones, col.tuneable_difference_tones,
+                 col.tuneable_difference_tone_pitch_pairs),
+                (col.summation_tones, col.tuneable_summation_tones,
+                 col.tuneable_summation_tone_pitch_pairs)]:
+            expected = [t for t in tones if any(p / t in tuneable for p in pitches)]
+            assert split == expected
+            assert split_pairs == [[(p, t) for p in pitches if p / t in tuneable] for t in expected]
+
+    def test_pc_plus_resultant_tones_as_harmonics(self):
+        col = make_pc([(1, 1), (5, 4), (3, 2)])
+        # 1/4, 1/2, 9/4, 5/2, 11/4 join 1, 5/4, 3/2
+        assert col.pc_plus_resultant_tones_as_harmonics == [1, 2, 4, 5, 6, 9, 10, 11]
+
+    def test_value_sort_falls_back_to_exact_order(self):
+        # (2**53 + 2) / (2**53 + 1) and (2**53 + 1) / 2**53 round to the same float
+        big = 2 ** 53
+        ratios = [(big + 1, big), (big + 2, big + 1), (3, 2)]
+        assert _sorted_by_value(ratios) == [(big + 2, big + 1), (big + 1, big), (3, 2)]
+
 
 # ── harmonic analysis ─────────────────────────────────────────────────────────
 
@@ -201,6 +233,29 @@ class TestSortBy:
         with pytest.raises(ValueError):
             col.sort_by("not a valid key")
 
+    def test_sort_keeps_per_pitch_attributes_aligned(self):
+        col = make_pc([(1, 1), (7, 4), (3, 2), (11, 8), (5, 4)])
+        by_ratio = dict(zip(col.ratios, zip(col.freqs, col.notations, col.harmonic_distances)))
+        col.sort_by("harmonic distances")
+        assert [by_ratio[r] for r in col.ratios] == list(
+            zip(col.freqs, col.notations, col.harmonic_distances))
+        assert [row[1] for row in col.info_by_pitch] == col.ratios
+        assert [row[3] for row in col.info_by_pitch] == col.freqs
+
+    def test_sort_is_stable_for_ties(self):
+        # 1/1, 2/1 and 4/1 share a keynum class; ties keep the previous (ratio) order
+        col = make_pc([(4, 1), (3, 2), (1, 1), (2, 1)])
+        col.sort_by("keynum classes")
+        assert col.ratios == [fractions.Fraction(3, 2), fractions.Fraction(1), fractions.Fraction(2),
+                              fractions.Fraction(4)]
+
+    def test_sort_updates_sequential_intervals(self):
+        # by harmonic distance 3/2 comes before 9/8
+        col = make_pc([(1, 1), (9, 8), (3, 2)])
+        col.sort_by("harmonic distances")
+        assert col.ratios == [fractions.Fraction(1), fractions.Fraction(3, 2), fractions.Fraction(9, 8)]
+        assert col.intervals_sequential == [fractions.Fraction(3, 2), fractions.Fraction(3, 4)]
+        assert col.inversion == sorted(col.inversion)
 
 # ── transpose ─────────────────────────────────────────────────────────────────
 
@@ -218,6 +273,20 @@ class TestTranspose:
         col.transpose((5, 4))
         assert set(col.intervals) == original_intervals
 
+    def test_transpose_matches_full_rebuild(self):
+        ratios = [(1, 1), (9, 8), (6, 5), (11, 8), (3, 2), (13, 7)]
+        col = make_pc(ratios)
+        col.sort_by("harmonic distances")
+        order = col.ratios
+        col.transpose((7, 6))
+        assert_same_analysis(col, make_pc([x * fractions.Fraction(7, 6) for x in order]))
+
+    def test_transpose_then_add_pitch(self):
+        col = make_pc([(1, 1), (5, 4), (3, 2)])
+        col.transpose((4, 3))
+        col.add_pitch((7, 3))
+        assert_same_analysis(col, make_pc([(4, 3), (5, 3), (2, 1), (7, 3)]))
+
 
 # ── tuneable / non-tuneable classification ───────────────────────────────────
 
@@ -346,25 +415,43 @@ class TestValidation:
 
 # ── harmonic intersection cap and antichain ───────────────────────────────────
 
-class TestHarmonicIntersectionCapAndAntichain:
-    def test_large_collection_intersection_is_none(self):
-        # 25 distinct primes → 25 coprime harmonics > cap of 24 → None
-        primes = [2,3,5,7,11,13,17,19,23,29,31,37,41,43,47,53,59,61,67,71,73,79,83,89,97]
-        col = make_pc([(p, 1) for p in primes])
-        assert col.harmonic_intersection is None
-
-    def test_large_collection_disjunction_is_none(self):
-        primes = [2,3,5,7,11,13,17,19,23,29,31,37,41,43,47,53,59,61,67,71,73,79,83,89,97]
-        col = make_pc([(p, 1) for p in primes])
-        assert col.harmonic_disjunction is None
-
-    def test_print_info_handles_none(self, capsys):
-        # print_info("analytic") must not raise when intersection is None
-        primes = [2,3,5,7,11,13,17,19,23,29,31,37,41,43,47,53,59,61,67,71,73,79,83,89,97]
-        col = make_pc([(p, 1) for p in primes])
+class TestHarmonicIntersectionLargeAndAntichain:
+    PRIMES = [2,3,5,7,11,13,17,19,23,29,31,37,41,43,47,53,59,61,67,71,73,79,83,89,97]
+
+    def test_large_collection_intersection_is_exact(self):
+        # 25 coprime harmonics: a partial avoids all of them with probability prod(1 - 1/p)
+        col = make_pc([(p, 1) for p in self.PRIMES])
+        avoided = math.prod(1 - fractions.Fraction(1, p) for p in self.PRIMES)
+        assert col.harmonic_intersection == 1 - avoided
+
+    def test_large_collection_disjunction_is_exact(self):
+        col = make_pc([(p, 1) for p in self.PRIMES])
+        assert col.harmonic_disjunction == math.prod(1 - fractions.Fraction(1, p) for p in self.PRIMES)
+
+    def test_print_info_shows_large_intersection(self, capsys):
+        col = make_pc([(p, 1) for p in self.PRIMES])
         col.print_info("analytic")
         out = capsys.readouterr().out
-        assert "N/A" in out
+        assert "N/A" not in out
+        assert "harmonic intersection: " + str(col.harmonic_intersection) in out
+
+    def test_matches_inclusion_exclusion(self):
+        ratios = [(1, 1), (9, 8), (6, 5), (5, 4), (4, 3), (11, 8), (3, 2), (13, 8), (7, 4), (15, 8)]
+        col = make_pc(ratios)
+        hs = col.harmonics
+        expected = sum((-1) ** (k + 1) * fractions.Fraction(1, math.lcm(*c))
+                       for k in range(1, len(hs) + 1) for c in combinations(hs, k))
+        assert col.harmonic_intersection == expected
+
+    def test_harmonic_series_segment_of_sixty_pitches(self, monkeypatch):
+        # harmonics 60..119 over a fundamental; counting over one period and splitting
+        # by prime exponents must agree
+        col = make_pc([(h, 60) for h in range(60, 120)])
+        assert isinstance(col.harmonic_intersection, fractions.Fraction)
+        assert 0 < col.harmonic_intersection < 1
+        monkeypatch.setattr(utilities_music, "_MAX_SIEVE_PERIOD", 1)
+        expected = 1 - utilities_music.uncovered_density(col.harmonics, col.constituent_primes)
+        assert expected == col.harmonic_intersection
 
     def test_harmonic_series_antichain_reduces_to_one(self):
         # Harmonics [1,2,...,10]: every h divides all multiples, antichain = {1}
@@ -372,8 +459,7 @@ class TestHarmonicIntersectionCapAndAntichain:
         col = make_pc([(k, 1) for k in range(1, 11)])
         assert col.harmonic_intersection == fractions.Fraction(1, 1)
 
-    def test_intersection_below_cap_is_fraction(self):
-        # A collection that stays within the cap should still return a Fraction
+    def test_intersection_of_small_collection_is_fraction(self):
         col = make_pc([(1, 1), (5, 4), (3, 2), (7, 4)])
         assert isinstance(col.harmonic_intersection, fractions.Fraction)
 
@@ -391,3 +477,361 @@ class TestUpdate:
         col = make_pc([(1, 1), (3, 2)], rp="C4")
         col.update(pc=[(1, 1), (5, 4)])
         assert col.reference_pitch == "C4"
+
+    def test_reference_update_matches_full_rebuild(self):
+        ratios = [(1, 1), (9, 8), (6, 5), (11, 8), (3, 2), (13, 7)]
+        col = make_pc(ratios)
+        col.sort_by("keynum classes")
+        col.update(rp="Eb3", rf=155.0, precision=3)
+        expected = make_pc(ratios, rp="Eb3", rf=155.0, precision=3)
+        assert_same_analysis(col, expected)
+        for name in ["reference_keynum", "letter_names_and_octave_and_cents", "avg_keynum", "least_common_partial_freq"]:
+            assert getattr(col, name) == getattr(expected, name), name
+
+    def test_invalid_reference_update_leaves_collection_unchanged(self):
+        col = make_pc([(1, 1), (3, 2)])
+        with pytest.raises(ValueError):
+            col.update(rp="H4")
+        assert col.reference_pitch == "A4"
+        assert col.freqs == [440.0, 660.0]
+
+
+# ── incremental add / remove ──────────────────────────────────────────────────
+
+ANALYSIS_ATTRIBUTES = [
+    "ratios", "monzos", "freqs", "keynums", "notations", "normalized_ratios", "harmonic_distances",
+    "intervals", "tuneable_intervals", "tuneable_pitch_pairs", "non_tuneable_intervals",
+    "non_tuneable_pitch_pairs", "difference_tones", "tuneable_difference_tones",
+    "tuneable_difference_tone_pitch_pairs", "non_tuneable_difference_tones",
+    "non_tuneable_difference_tone_pitch_pairs", "summation_tones", "tuneable_summation_tones",
+    "tuneable_summation_tone_pitch_pairs", "non_tuneable_summation_tones",
+    "non_tuneable_summation_tone_pitch_pairs", "pc_plus_resultant_tones",
+    "pc_plus_resultant_tones_as_harmonics", "inversion", "inversion_harmonics",
+    "intervals_sequential", "avg_ratio", "avg_freq", "minimum_ratio", "maximum_ratio", "ratio_span",
+    "cents_span", "harmonics", "periodicity_pitch", "least_common_partial",
+    "least_common_partial_freq", "constituent_primes", "hd_sum", "hd_avg",
+    "harmonic_intersection", "harmonic_disjunction", "info_by_pitch",
+]
+
+
+def assert_same_analysis(col, expected):
+    for name in ANALYSIS_ATTRIBUTES:
+        assert getattr(col, name) == getattr(expected, name), name
+
+
+class TestAddRemovePitch:
+    def test_add_pitch_matches_fresh_construction(self):
+        col = make_pc([(1, 1), (5, 4), (3, 2)])
+        col.add_pitch((7, 4))
+        assert_same_analysis(col, make_pc([(1, 1), (5, 4), (3, 2), (7, 4)]))
+
+    def test_add_pitch_with_new_denominator(self):
+        # 9/7 changes the common denominator, so every harmonic number changes
+        col = make_pc([(1, 1), (5, 4), (3, 2)])
+        col.add_pitch(fractions.Fraction(9, 7))
+        assert_same_analysis(col, make_pc([(1, 1), (5, 4), (3, 2), (9, 7)]))
+
+    def test_remove_pitch_matches_fresh_construction(self):
+        col = make_pc([(1, 1), (5, 4), (3, 2), (7, 4), (9, 8)])
+        col.remove_pitch((5, 4))
+        assert_same_analysis(col, make_pc([(1, 1), (3, 2), (7, 4), (9, 8)]))
+
+    def test_sequence_of_changes(self):
+        col = make_pc([(1, 1), (3, 2)])
+        for p in [(5, 4), (7, 4), (11, 8), (9, 8)]:
+            col.add_pitch(p)
+        col.remove_pitch((3, 2))
+        col.remove_pitch(fractions.Fraction(7, 4))
+        col.add_pitch((13, 8))
+        assert_same_analysis(col, make_pc([(1, 1), (5, 4), (11, 8), (9, 8), (13, 8)]))
+
+    def test_tone_becomes_tuneable_through_new_pitch(self):
+        # 1/2 is the only difference tone of [1, 3/2]; 3/2 : 1/2 = 3/1 is tuneable,
+        # but adding 5/4 also adds 5/4 : 1/2 = 5/2 as a tuneable partner
+        col = make_pc([(1, 1), (3, 2)])
+        col.add_pitch((5, 4))
+        assert_same_analysis(col, make_pc([(1, 1), (3, 2), (5, 4)]))
+
+    @pytest.mark.parametrize("sort_by, pc, new", [
+        ("harmonic distances", [(1, 1), (7, 4), (3, 2)], (5, 4)),
+        # 10/1 and 5/2 tie on harmonic distance, 5/4 and 5/2 on keynum class
+        ("harmonic distances", [(1, 1), (10, 1)], (5, 2)),
+        ("keynum classes", [(1, 1), (5, 2)], (5, 4)),
+    ])
+    def test_add_keeps_current_sort_order(self, sort_by, pc, new):
+        col = make_pc(pc)
+        col.sort_by(sort_by)
+        col.add_pitch(new)
+        expected = make_pc(pc + [new])
+        expected.sort_by(sort_by)
+        for name in ["ratios", "info_by_pitch", "inversion", "intervals_sequential"]:
+            assert getattr(col, name) == getattr(expected, name), name
+        col.remove_pitch(new)
+        expected = make_pc(pc)
+        expected.sort_by(sort_by)
+        assert col.ratios == expected.ratios
+
+    @pytest.mark.parametrize("sort_by", ["harmonic distances", "keynum classes"])
+    def test_statistics_match_fresh_construction_in_any_sort_order(self, sort_by):
+        # Summed in harmonic distance order, hd_sum comes out one bit lower
+        pc = [(1, 2), (5, 2), (7, 12), (23, 7)]
+        col = make_pc(pc)
+        col.sort_by(sort_by)
+        col.add_pitch((12, 17))
+        col.remove_pitch((5, 2))
+        col.add_pitch((5, 2))
+        expected = make_pc(pc + [(12, 17)])
+        for name in ["hd_sum", "hd_avg", "avg_freq", "avg_keynum"]:
+            assert getattr(col, name) == getattr(expected, name), name
+
+    def test_add_existing_pitch_raises(self):
+        col = make_pc([(1, 1), (3, 2)])
+        with pytest.raises(ValueError):
+            col.add_pitch((6, 4))
+
+    def test_remove_missing_pitch_raises(self):
+        col = make_pc([(1, 1), (5, 4), (3, 2)])
+        with pytest.raises(ValueError):
+            col.remove_pitch((7, 4))
+
+    def test_remove_below_two_pitches_raises(self):
+        col = make_pc([(1, 1), (3, 2)])
+        with pytest.raises(ValueError):
+            col.remove_pitch((3, 2))
+
+
+# ── monzo-space harmonics ─────────────────────────────────────────────────────
+
+class TestWidePrimeCollections:
+    PITCHES = [fractions.Fraction(97**12, 89**5), fractions.Fraction(83**9, 2**40),
+               fractions.Fraction(3**20 * 79**4, 71**8), fractions.Fraction(1)]
+
+    def test_harmonics_and_least_common_partial_match_integer_arithmetic(self):
+        col = make_pc(self.PITCHES)
+        denominator = math.lcm(*(x.denominator for x in self.PITCHES))
+        harmonics = sorted(int(x * denominator) for x in self.PITCHES)
+        assert col.harmonics == harmonics
+        assert col.least_common_partial == math.lcm(*harmonics)
+        g = math.gcd(*harmonics)
+        assert col._shape_entry()["harmonics"] == [h // g for h in harmonics]
+
+    def test_periodicity_pitch_of_harmonics_beyond_float_range(self):
+        # both harmonics, 3**700 and 2 * 3**699, exceed the largest float
+        col = make_pc([fractions.Fraction(3**700, 2**1100), fractions.Fraction(3**699, 2**1099)])
+        assert col.periodicity_pitch == pytest.approx(math.ldexp(440.0, -1100))
+        expected = fractions.Fraction(440 * 2 * 3**700, 2**1100)
+        assert col.least_common_partial_freq == pytest.approx(float(expected))
+
+
+# ── pairwise matrices ─────────────────────────────────────────────────────────
+
+class TestPairwiseMatrices:
+    PITCHES = [(1, 1), (5, 4), (3, 2), (7, 4), (11, 8), (13, 9), (9, 5)]
+
+    def test_matrices_match_pairwise_ratios(self):
+        col = make_pc(self.PITCHES)
+        matrix = col.interval_matrix()
+        hd = col.hd_matrix()
+        assert matrix.primes == col.constituent_primes
+        n = len(col.ratios)
+        for i in range(n):
+            for j in range(n):
+                interval = col.ratios[j] / col.ratios[i]
+                monzo = [plane[i][j] for plane in matrix.monzos]
+                assert math.prod(fractions.Fraction(p) ** e for p, e in zip(matrix.primes, monzo)) == interval
+                assert matrix.cents[i][j] == pytest.approx(1200 * math.log2(interval))
+                assert hd[i][j] == pytest.approx(math.log2(interval.numerator * interval.denominator))
+
+    def test_hd_matrix_groups_many_sparse_primes(self, monkeypatch):
+        ratios = [fractions.Fraction(p, q) for p, q in zip([3, 5, 7, 11, 13, 17, 19, 23, 29, 31],
+                                                           [37, 41, 43, 47, 53, 59, 61, 67, 71, 73])]
+        col = make_pc(ratios)
+        expected = col.hd_matrix()
+        monkeypatch.setattr(pitch_collection, "_HD_GROUP_MAX_COMBINATIONS", 1)
+        assert col.hd_matrix() == expected
+
+    def test_matrices_follow_sort_order(self):
+        col = make_pc(self.PITCHES)
+        col.sort_by("harmonic distances")
+        hd = col.hd_matrix()
+        ratios = col.ratios
+        interval = ratios[1] / ratios[0]
+        assert hd[0][1] == pytest.approx(math.log2(interval.numerator * interval.denominator))
+        assert col.interval_matrix().cents[0][1] == pytest.approx(1200 * math.log2(interval))
+
+    def test_monzo_rows_use_smallest_integer_type(self):
+        col = make_pc([(1, 1), fractions.Fraction(3**100, 2**300)])
+        planes = col.interval_matrix().monzos
+        assert [plane[0].typecode for plane in planes] == ["h", "b"]
+        assert planes[0][0][1] == 300 and planes[1][0][1] == -100
+
+
+# ── streaming iterators ───────────────────────────────────────────────────────
+
+def grouped(records):
+    groups = {}
+    for value, pair, tuneable in records:
+        groups.setdefault((value, tuneable), []).append(pair)
+    return groups
+
+
+class TestIterators:
+    PITCHES = [(1, 1), (9, 8), (5, 4), (3, 2), (7, 4), (15, 8)]
+
+    def test_iter_intervals_rebuilds_interval_attributes(self):
+        col = make_pc(self.PITCHES)
+        groups = grouped(col.iter_intervals())
+        assert list(dict.fromkeys(value for value, _ in groups)) == col.intervals
+        assert [groups[(x, True)] for x in col.tuneable_intervals] == col.tuneable_pitch_pairs
+        assert [groups[(x, False)] for x in col.non_tuneable_intervals] == col.non_tuneable_pitch_pairs
+
+    @pytest.mark.parametrize("family", ["difference", "summation"])
+    def test_iter_tones_rebuild_tone_attributes(self, family):
+        col = make_pc(self.PITCHES)
+        groups = grouped(getattr(col, f"iter_{family}_tones")())
+        assert list(dict.fromkeys(value for value, _ in groups)) == getattr(col, f"{family}_tones")
+        assert ([groups[(x, True)] for x in getattr(col, f"tuneable_{family}_tones")]
+                == getattr(col, f"tuneable_{family}_tone_pitch_pairs"))
+        assert ([groups[(x, False)] for x in getattr(col, f"non_tuneable_{family}_tones")]
+                == getattr(col, f"non_tuneable_{family}_tone_pitch_pairs"))
+
+    def test_tuneable_filter(self):
+        col = make_pc(self.PITCHES)
+        assert {x for x, _, _ in col.iter_intervals(tuneable=True)} == set(col.tuneable_intervals)
+        assert all(not t for _, _, t in col.iter_difference_tones(tuneable=False))
+        assert {x for x, _, _ in col.iter_summation_tones(tuneable=True)} == set(col.tuneable_summation_tones)
+
+    def test_iterators_do_not_build_list_attributes(self):
+        col = make_pc(self.PITCHES)
+        next(col.iter_intervals())
+        next(col.iter_difference_tones())
+        assert "_interval_splits" not in col.__dict__
+        assert "_difference_tone_splits" not in col.__dict__
+
+    def test_iter_intervals_does_not_build_the_interval_index(self):
+        col = make_pc(self.PITCHES)
+        records = list(col.iter_intervals())
+        assert len(records) == len(self.PITCHES) * (len(self.PITCHES) - 1) // 2
+        assert col._index_unit is None
+
+    def test_iter_intervals_matches_index_on_random_collections(self):
+        rng = random.Random(3)
+        for _ in range(5):
+            pitches = list({(rng.randint(1, 400), rng.choice([1, 3, 5, 7, 9, 11, 64])) for _ in range(40)})
+            col = make_pc(pitches)
+            streamed = list(col.iter_intervals())
+            assert streamed == [(x, pair, t) for x, pairs, t in col._interval_groups() for pair in pairs]
+
+    @pytest.mark.parametrize("family", ["difference", "summation"])
+    def test_iter_tones_match_index_without_building_it(self, family):
+        rng = random.Random(4)
+        for _ in range(5):
+            pitches = list({fractions.Fraction(rng.randint(1, 400), rng.choice([1, 3, 5, 7, 9, 11, 64]))
+                            for _ in range(40)})
+            col = make_pc(pitches)
+            streamed = list(getattr(col, f"iter_{family}_tones")())
+            assert col._index_unit is None
+            assert streamed == [(x, pair, t) for x, pairs, t in col._tone_groups(family) for pair in pairs]
+
+    def test_iterators_follow_add_pitch(self):
+        col = make_pc(self.PITCHES)
+        col.add_pitch((11, 8))
+        assert grouped(col.iter_intervals()) == grouped(make_pc(self.PITCHES + [(11, 8)]).iter_intervals())
+
+
+# ── lazy attributes ───────────────────────────────────────────────────────────
+
+class TestLazyAttributes:
+    def test_construction_skips_expensive_analysis(self):
+        col = make_pc([(1, 1), (5, 4), (3, 2), (7, 4)])
+        assert col.hd_sum > 0
+        for name in ("intervals", "difference_tones", "harmonic_intersection", "least_common_partial",
+                     "inversion_harmonics", "periodicity_pitch"):
+            assert name not in vars(col), name
+        assert col._index_unit is None
+
+    def test_edits_before_first_access_match_fresh_construction(self):
+        col = make_pc([(1, 1), (5, 4), (3, 2)])
+        col.add_pitch((7, 4))
+        col.remove_pitch((5, 4))
+        col.transpose((3, 2))
+        assert_same_analysis(col, make_pc([(3, 2), (9, 4), (21, 8)]))
+
+    def test_update_reference_refreshes_periodicity_pitch(self):
+        col = make_pc([(1, 1), (5, 4), (3, 2)])
+        col.periodicity_pitch, col.least_common_partial_freq
+        col.update(rf=220.0)
+        assert col.periodicity_pitch == pytest.approx(55.0)
+        assert col.least_common_partial_freq == pytest.approx(55.0 * 60)
+
+
+# ── shared shape cache ────────────────────────────────────────────────────────
+
+@pytest.fixture
+def empty_shape_cache():
+    pitch_collection.clear_shape_cache()
+    yield
+    pitch_collection.clear_shape_cache()
+    pitch_collection.set_shape_cache_size(256)
+
+
+class TestShapeCache:
+    def test_transposed_shape_is_a_hit(self, empty_shape_cache):
+        make_pc([(1, 1), (5, 4), (3, 2)]).intervals
+        make_pc([(3, 2), (15, 8), (9, 4)]).intervals
+        info = pitch_collection.shape_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+        assert info.hit_rate == 0.5
+
+    def test_hit_matches_uncached_analysis(self, empty_shape_cache):
+        pitch_collection.set_shape_cache_size(0)
+        expected = make_pc([(7, 6), (35, 24), (7, 4), (49, 24)])
+        expected_values = [getattr(expected, name) for name in ANALYSIS_ATTRIBUTES]
+        pitch_collection.set_shape_cache_size(256)
+        first = make_pc([(1, 1), (5, 4), (3, 2), (7, 4)])
+        first.intervals, first.harmonic_intersection
+        col = make_pc([(7, 6), (35, 24), (7, 4), (49, 24)])
+        assert [getattr(col, name) for name in ANALYSIS_ATTRIBUTES] == expected_values
+        assert pitch_collection.shape_cache_info().hits == 1
+
+    def test_different_tuneable_intervals_are_separate_entries(self, empty_shape_cache):
+        make_pc([(1, 1), (5, 4), (3, 2)])
+        col = make_pc([(1, 1), (5, 4), (3, 2)], ti=[(3, 2)])
+        assert pitch_collection.shape_cache_info().hits == 0
+        assert col.tuneable_intervals == [fractions.Fraction(3, 2)]
+
+    def test_updating_one_collection_leaves_shared_entry_intact(self, empty_shape_cache):
+        first = make_pc([(1, 1), (5, 4), (3, 2)])
+        second = make_pc([(2, 1), (5, 2), (3, 1)])
+        first.intervals, second.intervals
+        second.add_pitch((7, 2))
+        first.remove_pitch((5, 4))
+        assert_same_analysis(first, make_pc([(1, 1), (3, 2)]))
+        assert_same_analysis(second, make_pc([(2, 1), (5, 2), (3, 1), (7, 2)]))
+        third = make_pc([(4, 3), (5, 3), (2, 1)])
+        assert third.intervals == [fractions.Fraction(6, 5), fractions.Fraction(5, 4), fractions.Fraction(3, 2)]
+        assert third.difference_tones == [fractions.Fraction(1, 3), fractions.Fraction(2, 3)]
+
+    def test_cache_is_bounded(self, empty_shape_cache):
+        pitch_collection.set_shape_cache_size(2)
+        for n in (5, 7, 11):
+            make_pc([(1, 1), (n, 4)]).harmonic_intersection
+        assert pitch_collection.shape_cache_info().currsize == 2
+        with pytest.raises(ValueError):
+            pitch_collection.set_shape_cache_size(-1)
+
+
+# ── interval index ────────────────────────────────────────────────────────────
+
+class TestIntervalIndex:
+    def test_index_pairs_covers_triangle_with_partners(self):
+        descending, tuneable = [12, 9, 8, 6, 4], [(3, 2), (4, 3), (2, 1)]
+        intervals, differences, _ = pitch_collection._index_pairs(descending, tuneable)
+        numerators, denominators, uppers, lowers = intervals
+        assert sorted(zip(uppers, lowers)) == sorted(combinations(descending, 2))
+        assert all(fractions.Fraction(n, d) == fractions.Fraction(a, b)
+                   for n, d, a, b in zip(numerators, denominators, uppers, lowers))
+        tones = {a - b for a, b in combinations(descending, 2)}
+        expected = {(t, h) for t in tones for h in descending
+                    if fractions.Fraction(h, t).as_integer_ratio() in tuneable}
+        assert set(zip(differences[2], differences[3])) == expected
@@ -55,3 +55,7 @@ class TestFactors:
         for prime, exp in factors:
             product *= prime ** exp
         assert product == n
+
+    def test_factors_beyond_float_precision(self):
+        p = pl.PrimeList(100)
+        assert p.factors(97**12 * 89**3) == [(89, 3), (97, 12)]
@@ -0,0 +1,72 @@
+import fractions
+from itertools import combinations
+import pytest
+from jitools import Pitch, PitchCollection, search_subsets
+
+F = fractions.Fraction
+SCALE = [F(1), F(16, 15), F(9, 8), F(6, 5), F(5, 4), F(4, 3), F(7, 5), F(3, 2), F(8, 5), F(5, 3), F(7, 4), F(15, 8)]
+
+
+def brute_force(ratios, k, objective):
+    """Return every k-note subset's score, computed from a PitchCollection of it."""
+    scores = {}
+    for subset in combinations(sorted(ratios), k):
+        col = PitchCollection(list(subset))
+        if objective == "tuneable_intervals":
+            scores[subset] = sum(len(pairs) for pairs in col.tuneable_pitch_pairs)
+        elif objective == "hd_sum":
+            scores[subset] = col.hd_sum
+        elif objective == "interval_hd_sum":
+            scores[subset] = sum(Pitch(p = b / a).harmonic_distance for a, b in combinations(subset, 2))
+        else:
+            scores[subset] = col.harmonic_intersection
+    return scores
+
+
+# ── exact search ──────────────────────────────────────────────────────────────
+
+class TestBranchAndBound:
+    @pytest.mark.parametrize("objective, maximize", [
+        ("tuneable_intervals", True), ("hd_sum", False), ("interval_hd_sum", False)])
+    def test_top_scores_match_brute_force(self, objective, maximize):
+        scores = brute_force(SCALE, 4, objective)
+        expected = sorted(scores.values(), reverse = maximize)[:5]
+        results = search_subsets(PitchCollection(SCALE), 4, objective, top=5)
+        assert [r.score for r in results] == pytest.approx(expected)
+        for r in results:
+            assert scores[tuple(r.ratios)] == pytest.approx(r.score)
+
+    def test_tuneable_scores_are_integers(self):
+        results = search_subsets(PitchCollection(SCALE), 3, top=3)
+        assert all(isinstance(r.score, int) for r in results)
+
+    def test_whole_scale(self):
+        (result,) = search_subsets(PitchCollection(SCALE), len(SCALE), "hd_sum", top=3)
+        assert result.ratios == SCALE
+        assert result.score == pytest.approx(PitchCollection(SCALE).hd_sum)
+
+
+# ── beam search ───────────────────────────────────────────────────────────────
+
+class TestBeamSearch:
+    def test_wide_beam_finds_the_best_subset(self):
+        col = PitchCollection(SCALE)
+        exact = search_subsets(col, 4, top=1)[0]
+        assert search_subsets(col, 4, top=1, beam_width=20)[0].score == exact.score
+
+    def test_harmonic_intersection_scores(self):
+        scores = brute_force(SCALE[:8], 3, "harmonic_intersection")
+        results = search_subsets(PitchCollection(SCALE[:8]), 3, "harmonic_intersection", top=3, beam_width=100)
+        assert [r.score for r in results] == sorted(scores.values(), reverse = True)[:3]
+        for r in results:
+            assert scores[tuple(r.ratios)] == r.score
+
+
+# ── argument checks ───────────────────────────────────────────────────────────
+
+class TestArguments:
+    @pytest.mark.parametrize("kwargs", [
+        {"k": 0}, {"k": 13}, {"k": 3, "objective": "roughness"}, {"k": 3, "top": 0}, {"k": 3, "beam_width": 0}])
+    def test_invalid_arguments_raise(self, kwargs):
+        with pytest.raises(ValueError):
+            search_subsets(PitchCollection(SCALE), **kwargs)
@@ -0,0 +1,76 @@
+import fractions
+import random
+import pytest
+from jitools import TranspositionIndex
+from jitools.utilities_music import octave_reduced
+
+F = fractions.Fraction
+SCALE = [F(1), F(9, 8), F(5, 4), F(4, 3), F(3, 2), F(5, 3), F(15, 8), F(2), F(9, 4), F(5, 2), F(3)]
+
+
+def naive_transpositions(scale, chord, octave_equivalent=False):
+    if octave_equivalent:
+        classes = {octave_reduced(x) for x in scale}
+        return sorted({octave_reduced(p / chord[0]) for p in classes
+                       if all(octave_reduced(p / chord[0] * x) in classes for x in chord)})
+    pitches = set(scale)
+    return sorted(p / chord[0] for p in pitches if all(p / chord[0] * x in pitches for x in chord))
+
+
+# ── exact transpositions ──────────────────────────────────────────────────────
+
+class TestTranspositions:
+    def test_major_triads(self):
+        index = TranspositionIndex(SCALE)
+        assert index.transpositions([(4, 4), (5, 4), (6, 4)]) == [F(1), F(4, 3), F(3, 2), F(2)]
+        assert index.occurrences([F(1), F(5, 4), F(3, 2)])[1] == (F(4, 3), F(5, 3), F(2))
+
+    def test_chord_not_starting_on_unison(self):
+        index = TranspositionIndex(SCALE)
+        assert index.occurrences([F(5, 4), F(3, 2)]) == [
+            (F(5, 4), F(3, 2)), (F(5, 3), F(2)), (F(15, 8), F(9, 4)), (F(5, 2), F(3))]
+
+    def test_single_pitch_matches_every_pitch(self):
+        index = TranspositionIndex(SCALE)
+        assert index.transpositions([F(1)]) == SCALE
+
+    def test_matches_naive_search(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            scale = {F(2) ** rng.randint(-2, 2) * F(3) ** rng.randint(-3, 3) * F(5) ** rng.randint(-2, 2)
+                     for _ in range(rng.randint(1, 40))}
+            index = TranspositionIndex(scale)
+            for _ in range(4):
+                chord = [F(2) ** rng.randint(-1, 1) * F(3) ** rng.randint(-2, 2) * F(5) ** rng.randint(-1, 1)
+                         for _ in range(rng.randint(1, 4))]
+                for octave_equivalent in (False, True):
+                    assert index.transpositions(chord, octave_equivalent) == naive_transpositions(
+                        scale, chord, octave_equivalent)
+
+
+# ── octave equivalence ────────────────────────────────────────────────────────
+
+class TestOctaveEquivalence:
+    def test_voicings_match_pitch_classes(self):
+        index = TranspositionIndex([F(1), F(3, 2), F(5, 2)])
+        assert index.transpositions([F(1), F(5, 4), F(3, 2)]) == []
+        assert index.transpositions([F(1), F(5, 4), F(3, 2)], octave_equivalent=True) == [F(1)]
+        assert index.occurrences([F(2), F(5, 4)], octave_equivalent=True) == [(F(1), F(5, 4))]
+
+
+# ── large scales and errors ───────────────────────────────────────────────────
+
+class TestLargeScale:
+    def test_five_limit_lattice(self):
+        lattice = [F(3) ** a * F(5) ** b for a in range(-50, 50) for b in range(-50, 50)]
+        index = TranspositionIndex(lattice)
+        assert len(index) == 10000
+        assert len(index.transpositions([F(1), F(5, 4), F(3, 2)], octave_equivalent=True)) == 99 * 99
+        assert len(index.transpositions([F(1), F(3), F(5)])) == 99 * 99
+        assert index.transpositions([F(1), F(7, 4)]) == []
+
+    def test_invalid_pitches_raise(self):
+        with pytest.raises(ValueError):
+            TranspositionIndex([F(1), F(0)])
+        with pytest.raises(ValueError):
+            TranspositionIndex(SCALE).transpositions([])
@@ -0,0 +1,103 @@
+import fractions
+import math
+import pytest
+from jitools import Pitch, PitchCollection, tuneable_closure
+from jitools.utilities_music import monzo_to_ratio
+
+F = fractions.Fraction
+TI = [(3, 2), (5, 4), (7, 4), (2, 1)]
+
+
+def hd(x):
+    return math.log2(x.numerator * x.denominator)
+
+
+def brute_force(root, ti, max_steps, max_hd = None, cents_range = None, without_seven = False):
+    """The closure by breadth-first search over Fractions."""
+    steps = [x for n, d in ti for x in (F(n, d), F(d, n))]
+    if without_seven:
+        steps = [x for x in steps if (x.numerator * x.denominator) % 7]
+
+    def within(x):
+        if max_hd is not None and hd(x) > max_hd + 1e-9:
+            return False
+        return cents_range is None or cents_range[0] <= 1200 * math.log2(x) <= cents_range[1]
+
+    if not within(root):
+        return set()
+    seen, layer = {root}, {root}
+    for _ in range(max_steps):
+        layer = {x * s for x in layer for s in steps if within(x * s)} - seen
+        seen |= layer
+    return seen
+
+
+# ── Closure ──
+
+class TestClosure:
+    def test_one_step(self):
+        assert set(tuneable_closure(ti = TI, max_steps = 1)) == {F(1)} | {x for n, d in TI for x in (F(n, d), F(d, n))}
+
+    @pytest.mark.parametrize("max_steps", [0, 1, 2, 3, 4])
+    def test_matches_brute_force(self, max_steps):
+        assert set(tuneable_closure(ti = TI, max_steps = max_steps)) == brute_force(F(1), TI, max_steps)
+
+    def test_each_pitch_once(self):
+        pitches = list(tuneable_closure(max_steps = 2))
+        assert len(pitches) == len(set(pitches))
+
+    def test_breadth_first_order(self):
+        pitches = list(tuneable_closure(ti = TI, max_steps = 3))
+        depths = [min(k for k in range(4) if x in brute_force(F(1), TI, k)) for x in pitches]
+        assert depths == sorted(depths)
+        assert pitches[:3] == [F(1), F(1, 2), F(2)]
+
+    def test_root(self):
+        assert set(tuneable_closure(root = (5, 3), ti = TI, max_steps = 2)) == brute_force(F(5, 3), TI, 2)
+
+    def test_streams(self):
+        closure = tuneable_closure(max_steps = 100)
+        assert [next(closure) for _ in range(3)] == [F(1), F(1, 2), F(2)]
+
+    def test_as_monzos(self):
+        pitches = list(tuneable_closure(root = (5, 3), max_steps = 2))
+        monzos = list(tuneable_closure(root = (5, 3), max_steps = 2, as_monzos = True))
+        assert [monzo_to_ratio(m) for m in monzos] == pitches
+        assert monzos[:50] == [Pitch(p = x).monzo for x in pitches[:50]]
+        assert list(tuneable_closure(ti = TI, max_steps = 0, as_monzos = True)) == [[0]]
+
+    def test_feeds_pitch_collection(self):
+        pitches = list(tuneable_closure(ti = TI, max_steps = 2, cents_range = (0, 1200)))
+        collection = PitchCollection(pitches, ti = TI)
+        assert set(collection.ratios) == set(pitches)
+
+
+# ── Bounds ──
+
+class TestBounds:
+    def test_max_hd(self):
+        expected = brute_force(F(1), TI, 4, max_hd = 8)
+        assert set(tuneable_closure(ti = TI, max_steps = 4, max_hd = 8)) == expected
+        assert all(hd(x) <= 8 for x in expected)
+
+    def test_max_hd_alone_is_finite(self):
+        pitches = set(tuneable_closure(ti = TI, max_hd = 8))
+        assert pitches == brute_force(F(1), TI, 20, max_hd = 8)
+
+    def test_cents_range(self):
+        pitches = set(tuneable_closure(ti = TI, max_steps = 4, cents_range = (-100, 1300)))
+        assert pitches == brute_force(F(1), TI, 4, cents_range = (-100, 1300))
+        assert all(-100 <= 1200 * math.log2(x) <= 1300 for x in pitches)
+
+    def test_prime_limit(self):
+        pitches = set(tuneable_closure(ti = TI, max_steps = 3, prime_limit = 5))
+        assert pitches == brute_force(F(1), TI, 3, without_seven = True)
+        assert not any(x.numerator % 7 == 0 or x.denominator % 7 == 0 for x in pitches)
+
+    def test_root_out_of_bounds(self):
+        assert list(tuneable_closure(root = (7, 1), ti = TI, max_steps = 2, cents_range = (0, 1200))) == []
+
+    @pytest.mark.parametrize("kwargs", [{}, {"max_steps": -1}, {"max_steps": 1, "cents_range": (100, 0)}])
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            list(tuneable_closure(ti = TI, **kwargs))
@@ -0,0 +1,92 @@
+import fractions
+import pytest
+from jitools import PitchCollection, TuneableIntervalSet, SABAT_SCHWEINITZ_TUNEABLE_INTERVALS
+
+F = fractions.Fraction
+TI = [(1, 1), (3, 2), (5, 4), (7, 4), (9, 4)]
+
+
+# ── exact and octave-reduced lookup ───────────────────────────────────────────
+
+class TestLookup:
+    def test_defaults_to_sabat_schweinitz(self):
+        s = TuneableIntervalSet()
+        assert s.keys == TuneableIntervalSet(SABAT_SCHWEINITZ_TUNEABLE_INTERVALS).keys
+
+    def test_exact_lookup_accepts_tuples_and_fractions(self):
+        s = TuneableIntervalSet(TI)
+        assert (3, 2) in s and (6, 4) in s and F(7, 4) in s
+        assert (3, 1) not in s
+
+    def test_octave_reduced_lookup(self):
+        s = TuneableIntervalSet(TI)
+        assert not s.is_tuneable((3, 1))
+        assert s.matches((3, 1), octave_equivalent=True) == [F(3, 2)]
+        assert s.matches((9, 16), octave_equivalent=True) == [F(9, 8)]
+        assert s.matches((7, 16), octave_equivalent=True) == [F(7, 4)]
+
+    def test_non_positive_interval_raises(self):
+        with pytest.raises(ValueError):
+            TuneableIntervalSet([(0, 1)])
+
+
+# ── cents tolerance ───────────────────────────────────────────────────────────
+
+class TestTolerance:
+    def test_tempered_fifth_matches_within_tolerance(self):
+        s = TuneableIntervalSet(TI)
+        fifth = 2 ** (7 / 12)
+        assert s.matches(fifth, tolerance=2) == [F(3, 2)]
+        assert s.matches(fifth, tolerance=1) == []
+
+    def test_matches_are_nearest_first(self):
+        s = TuneableIntervalSet([(5, 4), (81, 64), (9, 7)])
+        assert s.matches(2 ** (390 / 1200), tolerance=50) == [F(5, 4), F(81, 64), F(9, 7)]
+
+    def test_octave_equivalent_tolerance_wraps_at_the_octave(self):
+        s = TuneableIntervalSet([(1, 1), (3, 2)])
+        assert s.matches(2 ** (1199 / 1200), octave_equivalent=True, tolerance=2) == [F(1, 1)]
+        assert s.matches(3 * 2 ** (1 / 1200), octave_equivalent=True, tolerance=2) == [F(3, 2)]
+
+    def test_negative_tolerance_raises(self):
+        with pytest.raises(ValueError):
+            TuneableIntervalSet(TI).matches((3, 2), tolerance=-1)
+
+
+# ── batch classification ──────────────────────────────────────────────────────
+
+class TestClassify:
+    INTERVALS = [(3, 2), F(3, 1), 2 ** (7 / 12), (11, 8), F(9, 2)]
+
+    def test_classify_matches_is_tuneable(self):
+        s = TuneableIntervalSet(TI)
+        for octave_equivalent in (False, True):
+            for tolerance in (0.0, 2.5):
+                assert s.classify(self.INTERVALS, octave_equivalent, tolerance) == [
+                    s.is_tuneable(x, octave_equivalent, tolerance) for x in self.INTERVALS]
+
+    def test_classify_exact(self):
+        assert TuneableIntervalSet(TI).classify(self.INTERVALS) == [True, False, False, False, False]
+
+
+# ── sharing ───────────────────────────────────────────────────────────────────
+
+class TestSharing:
+    def test_shared_returns_one_instance_per_list(self):
+        assert TuneableIntervalSet.shared(TI) is TuneableIntervalSet.shared(list(TI))
+        assert TuneableIntervalSet.shared() is TuneableIntervalSet.shared(SABAT_SCHWEINITZ_TUNEABLE_INTERVALS)
+
+    def test_collections_share_the_set(self):
+        a = PitchCollection([(1, 1), (3, 2)])
+        b = PitchCollection([(1, 1), (5, 4)])
+        assert a.tuneable_interval_set is b.tuneable_interval_set
+
+    def test_collection_accepts_a_set(self):
+        s = TuneableIntervalSet([(3, 2)])
+        col = PitchCollection([(1, 1), (5, 4), (3, 2)], ti=s)
+        assert col.tuneable_interval_set is s
+        assert col.tuneable_intervals == [F(3, 2)]
+        assert col.allowed_tuneable_intervals_as_tuples == [(3, 2)]
+        col.update(rf=442.0)
+        col.update(pc=[(1, 1), (3, 2), (2, 1)])
+        assert col.tuneable_interval_set is s
@@ -0,0 +1,142 @@
+import fractions
+import math
+import random
+from collections import deque
+from itertools import combinations
+import pytest
+from jitools import PitchCollection, TuningGraph
+from jitools.batch_analysis import analyze_collections
+
+F = fractions.Fraction
+TI = [(3, 2), (4, 3), (5, 4), (6, 5), (7, 4)]
+
+
+def random_collection(seed, size=9):
+    rng = random.Random(seed)
+    return sorted({F(3) ** rng.randint(-2, 2) * F(5) ** rng.randint(-1, 1) * F(7) ** rng.randint(0, 1) * F(2) ** rng.randint(-2, 2)
+                   for _ in range(size)})
+
+
+def edges_of(graph):
+    return {(a, b) for a in graph.ratios for b in graph.neighbours(a) if a < b}
+
+
+def hd(a, b):
+    x = max(a, b) / min(a, b)
+    return math.log2(x.numerator * x.denominator)
+
+
+def count_components(nodes, edges):
+    nodes, seen, count = set(nodes), set(), 0
+    for start in nodes:
+        if start in seen:
+            continue
+        count += 1
+        queue = deque([start])
+        seen.add(start)
+        while queue:
+            a = queue.popleft()
+            for x, y in edges:
+                for b in ((y,) if x == a else (x,) if y == a else ()):
+                    if b in nodes and b not in seen:
+                        seen.add(b)
+                        queue.append(b)
+    return count
+
+
+# ── connectivity ──────────────────────────────────────────────────────────────
+
+class TestConnectivity:
+    def test_components(self):
+        graph = PitchCollection([(1, 1), (3, 2), (9, 8), (11, 8)], ti=TI).tuning_graph
+        assert graph.components() == [[F(1), F(9, 8), F(3, 2)], [F(11, 8)]]
+        assert not graph.is_connected()
+        assert graph.neighbours((3, 2)) == [F(1), F(9, 8)]
+
+    def test_reference_is_added_when_not_a_pitch(self):
+        graph = PitchCollection([(5, 4), (3, 2), (15, 8)], ti=TI).tuning_graph
+        assert not graph.reference_is_pitch
+        assert graph.ratios == (F(1), F(5, 4), F(3, 2), F(15, 8))
+        assert graph.is_connected()
+        assert PitchCollection([(1, 1), (3, 2)], ti=TI).tuning_graph.reference_is_pitch
+
+    def test_graph_follows_collection_changes(self):
+        collection = PitchCollection([(1, 1), (9, 8), (11, 8)], ti=TI)
+        assert len(collection.tuning_graph.components()) == 3
+        collection.add_pitch((3, 2))
+        assert len(collection.tuning_graph.components()) == 2
+        collection.update(ti=TI + [(11, 8)])
+        assert collection.tuning_graph.is_connected()
+
+    def test_batch_analysis(self):
+        chords = [[(1, 1), (3, 2)], [(1, 1), (11, 8)]]
+        graphs = [g for (g,) in analyze_collections(chords, workers=1, fields=["tuning_graph"], ti=TI)]
+        assert [g.is_connected() for g in graphs] == [True, False]
+
+
+# ── chains, spanning trees and articulation pitches ───────────────────────────
+
+class TestChains:
+    def test_shortest_chain(self):
+        graph = PitchCollection([(1, 1), (3, 2), (9, 8), (27, 16), (15, 8)], ti=TI).tuning_graph
+        assert graph.chain((27, 16)) == [F(1), F(3, 2), F(9, 8), F(27, 16)]
+        assert graph.chain((15, 8), source=(9, 8)) == [F(9, 8), F(3, 2), F(15, 8)]
+        assert graph.chain((1, 1)) == [F(1)]
+        assert PitchCollection([(1, 1), (11, 8)], ti=TI).tuning_graph.chain((11, 8)) is None
+        with pytest.raises(ValueError):
+            graph.chain((5, 3))
+
+    def test_chains_are_shortest_then_simplest(self):
+        for seed in range(20):
+            graph = PitchCollection(random_collection(seed), ti=TI).tuning_graph
+            edges = edges_of(graph)
+            chains = graph.chains()
+            for target in graph.ratios:
+                # Breadth-first search over (steps, total hd) for the best chain.
+                best = {F(1): (0, 0.0)}
+                queue = deque([F(1)])
+                while queue:
+                    a = queue.popleft()
+                    for b in graph.neighbours(a):
+                        candidate = (best[a][0] + 1, best[a][1] + hd(a, b))
+                        if b not in best:
+                            queue.append(b)
+                        if b not in best or candidate < best[b]:
+                            best[b] = candidate
+                if target not in best:
+                    assert target not in chains and graph.chain(target) is None
+                    continue
+                chain = chains[target]
+                assert chain == graph.chain(target)
+                assert all((min(a, b), max(a, b)) in edges for a, b in zip(chain, chain[1:]))
+                assert len(chain) - 1 == best[target][0]
+                assert sum(hd(a, b) for a, b in zip(chain, chain[1:])) == pytest.approx(best[target][1])
+
+
+class TestSpanningTree:
+    def test_minimum_total_harmonic_distance(self):
+        for seed in range(10):
+            graph = PitchCollection(random_collection(seed, size=6), ti=TI).tuning_graph
+            edges = sorted(edges_of(graph))
+            size = len(graph) - len(graph.components())
+            best = min(sum(hd(a, b) for a, b in subset) for subset in combinations(edges, size)
+                       if count_components(graph.ratios, subset) == len(graph.components()))
+            tree = graph.spanning_tree()
+            assert len(tree) == size and all(upper > lower for upper, lower in tree)
+            assert graph.spanning_tree_hd() == pytest.approx(best)
+
+
+class TestArticulationPitches:
+    def test_matches_removal(self):
+        for seed in range(20):
+            graph = PitchCollection(random_collection(seed, size=12), ti=TI).tuning_graph
+            edges = edges_of(graph)
+            before = len(graph.components())
+            expected = [x for x in graph.ratios
+                        if count_components(set(graph.ratios) - {x}, edges) > before - (not graph.neighbours(x))]
+            assert graph.articulation_pitches() == expected
+
+    def test_path(self):
+        graph = TuningGraph([F(1), F(3, 2), F(9, 4)], [(0, 1, (3, 2)), (1, 2, (3, 2))])
+        assert graph.articulation_pitches() == [F(3, 2)]
+        assert graph.spanning_tree() == [(F(3, 2), F(1)), (F(9, 4), F(3, 2))]
@@ -0,0 +1,103 @@
+import fractions
+import math
+from itertools import combinations_with_replacement
+import pytest
+from jitools import Pitch, TuneableIntervalSet, TuningRoute, tuning_routes
+
+F = fractions.Fraction
+TI = [(3, 2), (5, 4), (7, 4), (6, 5)]
+
+
+def hd(x):
+    return math.log2(x.numerator * x.denominator)
+
+
+def brute_force(start, target, ti, max_steps):
+    """Every set of steps from start to target, ranked as tuning_routes ranks them."""
+    steps = sorted({x for n, d in ti for x in (F(n, d), F(d, n))}, key = lambda x: (hd(x), x))
+    found = []
+    for length in range(max_steps + 1):
+        for combination in combinations_with_replacement(steps, length):
+            if any(1 / x in combination for x in combination):
+                continue
+            if start * math.prod(combination, start = F(1)) == target:
+                found.append((length, sum(hd(x) for x in combination)))
+    return sorted(found)
+
+
+# ── Routes ──
+
+class TestRoutes:
+    def test_single_tuneable_interval(self):
+        routes = tuning_routes(F(1), F(3, 2), ti = TI)
+        assert routes[0] == TuningRoute([F(3, 2)], [F(1), F(3, 2)], pytest.approx(math.log2(6)))
+
+    def test_pitches_follow_steps(self):
+        for route in tuning_routes(F(4, 3), F(35, 16), ti = TI, n = 5):
+            assert route.pitches[0] == F(4, 3)
+            assert route.pitches[-1] == F(35, 16)
+            for step, a, b in zip(route.steps, route.pitches, route.pitches[1:]):
+                assert b == a * step
+            assert route.hd == pytest.approx(sum(hd(x) for x in route.steps))
+
+    def test_matches_brute_force(self):
+        for target in [F(15, 8), F(21, 10), F(9, 5), F(49, 25), F(7, 5), F(225, 196)]:
+            routes = tuning_routes(F(1), target, ti = TI, n = 4, max_steps = 4)
+            expected = brute_force(F(1), target, TI, 4)[:4]
+            assert expected or target == F(225, 196)
+            assert [(len(r.steps), r.hd) for r in routes] == [(s, pytest.approx(h)) for s, h in expected]
+
+    def test_every_route_when_n_exceeds_them(self):
+        # Routes meeting at a node with different steps blocked must all survive the per-node cap
+        ti = TI + [(7, 6)]
+        for target in [F(15, 8), F(21, 10), F(9, 5), F(35, 24), F(7, 5), F(49, 36)]:
+            routes = tuning_routes(F(1), target, ti = ti, n = 10, max_steps = 4)
+            expected = brute_force(F(1), target, ti, 4)
+            assert [(len(r.steps), r.hd) for r in routes] == [(s, pytest.approx(h)) for s, h in expected]
+
+    def test_each_set_of_steps_once(self):
+        routes = tuning_routes(F(1), F(105, 32), ti = TI, n = 10)
+        assert len({tuple(sorted(r.steps)) for r in routes}) == len(routes)
+        for route in routes:
+            assert not any(1 / x in route.steps for x in route.steps)
+
+    def test_start_equals_target(self):
+        assert tuning_routes(F(5, 4), F(5, 4), ti = TI) == [TuningRoute([], [F(5, 4)], 0.0)]
+
+    def test_accepts_pitches_and_tuples(self):
+        assert tuning_routes(Pitch((1, 1)), (15, 8), ti = TI) == tuning_routes(F(1), F(15, 8), ti = TI)
+
+    def test_default_intervals(self):
+        routes = tuning_routes(F(1), F(13, 11))
+        assert len(routes) == 3
+        assert all(len(r.steps) == 2 for r in routes)
+        assert routes == tuning_routes(F(1), F(13, 11), ti = TuneableIntervalSet.shared())
+
+    def test_thirteen_limit_route_is_shortest(self):
+        routes = tuning_routes(F(1), F(169, 121), n = 1)
+        assert len(routes[0].steps) == 4
+        assert routes[0].pitches[-1] == F(169, 121)
+
+
+# ── Limits ──
+
+class TestLimits:
+    def test_unreachable_prime(self):
+        assert tuning_routes(F(1), F(11, 8), ti = TI) == []
+
+    def test_max_steps(self):
+        assert tuning_routes(F(1), F(225, 196), ti = TI, max_steps = 5) == []
+        assert len(tuning_routes(F(1), F(225, 196), ti = TI, max_steps = 6)[0].steps) == 6
+
+    def test_small_frontier_still_finds_a_route(self):
+        routes = tuning_routes(F(1), F(2197, 1331), n = 1, max_frontier = 100)
+        assert routes and routes[0].pitches[-1] == F(2197, 1331)
+
+    @pytest.mark.parametrize("kwargs", [{"n": 0}, {"max_steps": -1}, {"max_frontier": 1}])
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            tuning_routes(F(1), F(3, 2), ti = TI, **kwargs)
+
+    def test_non_positive_pitch(self):
+        with pytest.raises(ValueError):
+            tuning_routes(F(0), F(3, 2), ti = TI)
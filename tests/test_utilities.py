@@ -63,6 +63,15 @@ class TestFlop:
         assert utilities_general.flop([[1, 2], [3, 4, 5]]) == [[1, 3], [2, 4]]
 
 
+class TestChunks:
+    def test_last_chunk_is_short(self):
+        assert list(utilities_general.chunks(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_reads_lazily(self):
+        chunks = utilities_general.chunks(iter(int, 1), 2)
+        assert next(chunks) == [0, 0]
+
+
 class TestConvertDataToReadableString:
     def test_float_rounded_to_precision(self):
         s = utilities_general.convert_data_to_readable_string(1.23456789, precision=3)
@@ -116,3 +125,44 @@ class TestMidiCps:
         freq = 550.0
         keynum = utilities_music.cpsmidi(freq, 440.0, 69)
         assert utilities_music.midicps(keynum, 69, 440.0) == pytest.approx(freq)
+
+
+class TestMonzoArithmetic:
+    def test_monzo_primes(self):
+        assert utilities_music.monzo_primes(4) == (2, 3, 5, 7)
+        assert len(utilities_music.monzo_primes(40)) == 40
+
+    def test_bounds_are_gcd_and_lcm(self):
+        # 9/8, 5/3 and 7/4
+        lowest, highest = utilities_music.monzo_bounds([[-3, 2], [0, -1, 1], [-2, 0, 0, 1]])
+        assert utilities_music.monzo_to_ratio(lowest) == fractions.Fraction(1, 24)
+        assert utilities_music.monzo_to_ratio(highest) == fractions.Fraction(315)
+
+    def test_monzo_to_integer(self):
+        assert utilities_music.monzo_to_integer([2, 0, 1]) == 20
+        assert utilities_music.monzo_to_integer([0]) == 1
+
+    def test_monzo_to_ratio(self):
+        assert utilities_music.monzo_to_ratio([-1, 1]) == fractions.Fraction(3, 2)
+
+    def test_odd_part(self):
+        assert [utilities_music.odd_part(n) for n in (1, 2, 12, 40, 2 ** 70 * 3)] == [1, 1, 3, 5, 3]
+
+    def test_as_fraction(self):
+        assert utilities_music.as_fraction((6, 4)) == fractions.Fraction(3, 2)
+        assert utilities_music.as_fraction(3) == fractions.Fraction(3)
+
+    def test_octave_reduced(self):
+        reduced = [utilities_music.octave_reduced(fractions.Fraction(x)) for x in ("1/3", "2", "15/4", "255/256")]
+        assert reduced == [fractions.Fraction(4, 3), 1, fractions.Fraction(15, 8), fractions.Fraction(255, 128)]
+
+    def test_multiples_of_common_unit(self):
+        ratios = [fractions.Fraction(9, 8), fractions.Fraction(5, 3), fractions.Fraction(7, 4)]
+        monzos = [[-3, 2], [0, -1, 1], [-2, 0, 0, 1]]
+        assert utilities_music.common_unit(monzos) == fractions.Fraction(1, 24)
+        assert utilities_music.multiples_of_common_unit(ratios, monzos) == [27, 40, 42]
+
+    def test_uncovered_density(self):
+        # integers divisible by neither 4 nor 6: 1 - 1/4 - 1/6 + 1/12
+        assert utilities_music.uncovered_density([4, 6], [2, 3]) == fractions.Fraction(2, 3)
+        assert utilities_music.uncovered_density([1, 5], [5]) == 0